@@ -1,5 +1,23 @@
-from .agents import *
-from .path_finder import *
-from .pfs import *
-from .raw_utils import *
-from .seat import *
+from .centrality import *
+from .congestion import *
+from .contraction import *
+from .flow import *
+from .graph_search import *
+from .road_graph import *
+from .safety import *
+from .space_syntax import *
+from .spatial_index import *
+from .viewshed import *
+from .visibility import *
+
+try:
+    import Rhino
+except ImportError:
+    # Rhino 없이 CPython 단독으로 사용할 때는 배열 기반 그래프 모듈만 불러온다.
+    pass
+else:
+    from .agents import *
+    from .path_finder import *
+    from .pfs import *
+    from .raw_utils import *
+    from .seat import *
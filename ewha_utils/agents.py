@@ -1,13 +1,347 @@
 import Rhino.Geometry as geo
+import hashlib
 import math
 import random
+import numpy as np
+from collections import OrderedDict
 from typing import List, Optional
 
+from ewha_utils.raw_utils import get_vertex_array
+from ewha_utils.spatial_index import SpatialHash
+from ewha_utils.visibility import VisibilityGraph
+
+# 제관 회피 기준 (제관 2m 이내 접근 시 밀어냄)
+REPEL_RADIUS = 2000.0
+REPEL_STRENGTH = 800.0
+REPEL_FALLOFF = 400.0
+
+
+def _xyz(pt) -> tuple:
+    return (pt.X, pt.Y, pt.Z)
+
+
+def _arc_length_table(path):
+    """
+    경로 커브의 꼭짓점 [k, 3]과 시작점부터의 누적 길이 [k]
+    (길이 0인 구간, 즉 겹친 꼭짓점은 제거, 경로가 없으면 빈 배열)
+    """
+    coords = get_vertex_array(path) if path else np.empty((0, 3))
+    step = np.linalg.norm(np.diff(coords, axis=0), axis=1)
+    coords = coords[np.concatenate([[True], step > 0])[: len(coords)]]
+    along = np.concatenate([[0.0], np.cumsum(step[step > 0])])[: len(coords)]
+    return coords, along
+
+
+class CrowdEngine:
+    """
+    맹진하 작성
+    방문자(TouristAgent)와 제관(RitualAgent) 전체 상태를 numpy 배열(struct-of-arrays)로 보관하고
+    한 스텝에 같은 종류의 에이전트를 한꺼번에 갱신하는 시뮬레이션 엔진.
+    TouristAgent / RitualAgent는 이 배열의 한 행을 읽고 쓰는 얇은 뷰이다.
+
+    방문자 : tourist_pos [t, 3], tourist_speed [t], tourist_moved [t] (경로 진행 거리),
+             tourist_length [t] (경로 길이, 추가할 때 한 번만 계산), tourist_finished [t]
+    방문자 경로 : 모든 경로의 꼭짓점을 path_coords [v, 3]에 이어 붙이고 (path_offsets [t + 1]로 구분)
+                  path_along [v]에 누적 길이 표를 둔다. 경로마다 tourist_base만큼 띄워 두어
+                  path_along 전체가 증가 배열이므로 모든 방문자의 위치를 searchsorted 한 번으로 찾는다.
+    제관 : ritual_pos [r, 3], ritual_vel [r, 3], ritual_speed [r], ritual_goal [r] (목표 번호),
+           ritual_finished [r], 목표 좌표는 goal_coords에 이어 붙이고 ritual_goal_offsets로 구분
+           이동 기록은 제관별 좌표 리스트 ritual_trails에 스텝마다 이어 붙인다.
+    배열은 용량을 두 배씩 늘리는 버퍼의 앞부분 뷰라서 에이전트를 하나씩 추가해도 전체 O(N)이다.
+    """
+
+    def __init__(self, dt: float = 0.1):
+        self.dt = dt
+        self.tourist_paths = []
+        self.tourist_pos = np.empty((0, 3))
+        self.tourist_speed = np.empty(0)
+        self.tourist_moved = np.empty(0)
+        self.tourist_length = np.empty(0)
+        self.tourist_finished = np.empty(0, dtype=bool)
+        self.tourist_base = np.empty(0)
+        self.path_coords = np.empty((0, 3))
+        self.path_along = np.empty(0)
+        self.path_offsets = np.zeros(1, dtype=np.int64)
+        self.ritual_pos = np.empty((0, 3))
+        self.ritual_vel = np.empty((0, 3))
+        self.ritual_speed = np.empty(0)
+        self.ritual_goal = np.empty(0, dtype=np.int64)
+        self.ritual_finished = np.empty(0, dtype=bool)
+        self.ritual_goal_offsets = np.zeros(1, dtype=np.int64)
+        self.goal_coords = np.empty((0, 3))
+        self.ritual_hash = None  # step()마다 다시 만드는 제관 위치 격자 해시
+        self.ritual_trails = []  # 제관별 이동 기록 [(x, y, z)] (시작점 포함)
+        self._buffers = {}  # _append()가 쓰는 배열 이름별 버퍼
+
+    @property
+    def tourist_count(self) -> int:
+        return len(self.tourist_paths)
+
+    @property
+    def ritual_count(self) -> int:
+        return len(self.ritual_speed)
+
+    def _append(self, name: str, values) -> None:
+        """
+        배열 속성 name 뒤에 values를 이어 붙임
+        버퍼가 차면 두 배 크기로 옮기고, 속성은 버퍼 앞부분의 뷰로 다시 연결한다.
+        (set_tourist_path 등으로 속성을 새 배열로 바꿨으면 그 배열로 버퍼를 다시 만든다.)
+        """
+        current = getattr(self, name)
+        values = np.asarray(values, dtype=current.dtype)
+        values = values.reshape((-1,) + current.shape[1:])
+        n, k = len(current), len(values)
+        buffer = self._buffers.get(name)
+        if buffer is None or current.base is not buffer or n + k > len(buffer):
+            buffer = np.empty(
+                (max(2 * (n + k), 16),) + current.shape[1:], current.dtype
+            )
+            buffer[:n] = current
+            self._buffers[name] = buffer
+        buffer[n : n + k] = values
+        setattr(self, name, buffer[: n + k])
+
+    def add_tourist(self, path, velocity: float, start_point) -> int:
+        """
+        경로 커브 path를 따라 velocity로 걷는 방문자 추가 (path가 없으면 움직이지 않음)
+        반환 : 방문자 번호
+        """
+        self.tourist_paths.append(path)
+        start = _xyz(start_point) if path else (np.nan,) * 3
+        self._append("tourist_pos", start)
+        self._append("tourist_speed", velocity)
+        self._append("tourist_moved", 0.0)
+        coords, along = _arc_length_table(path)
+        length = along[-1] if len(along) else 0.0
+        base = self.path_along[-1] + 1.0 if len(self.path_along) else 0.0
+        self._append("path_coords", coords)
+        self._append("path_along", base + along)
+        self._append("path_offsets", len(self.path_coords))
+        self._append("tourist_base", base)
+        self._append("tourist_length", length)
+        self._append("tourist_finished", False)
+        return self.tourist_count - 1
+
+    def set_tourist_path(self, index: int, path) -> None:
+        """
+        방문자 index의 경로 커브를 바꾸고 그 구간의 누적 길이 표만 다시 만듦
+        (진행 거리, 완료 여부, 현재 위치는 그대로 두므로 다음 스텝부터 새 경로 위 같은 거리에서 이어감)
+        """
+        coords, along = _arc_length_table(path)
+        lo, hi = self.path_offsets[index : index + 2].tolist()
+        base = self.tourist_base[index]
+        self.tourist_paths[index] = path
+        self.path_coords = np.vstack(
+            [self.path_coords[:lo], coords, self.path_coords[hi:]]
+        )
+        later = self.path_along[hi:]
+        # 뒤쪽 방문자 표가 이 경로 표보다 앞서지 않도록 필요한 만큼 통째로 밀어 둠
+        end = base + (along[-1] if len(along) else 0.0)
+        if index + 1 < self.tourist_count:
+            shift = max(0.0, end + 1.0 - self.tourist_base[index + 1])
+            self.tourist_base[index + 1 :] += shift
+        else:
+            shift = 0.0
+        self.path_along = np.concatenate(
+            [self.path_along[:lo], base + along, later + shift]
+        )
+        self.path_offsets[index + 1 :] += len(coords) - (hi - lo)
+        self.tourist_length[index] = along[-1] if len(along) else 0.0
+
+    def add_ritual(self, start, goals, speed: float = 2000.0) -> int:
+        """
+        goals를 순서대로 방문하는 제관 추가
+        반환 : 제관 번호
+        """
+        coords = np.array([_xyz(g) for g in goals], dtype=float).reshape(-1, 3)
+        self._append("goal_coords", coords)
+        self._append("ritual_goal_offsets", self.ritual_goal_offsets[-1] + len(coords))
+        self.ritual_trails.append([_xyz(start)])
+        self._append("ritual_pos", _xyz(start))
+        self._append("ritual_vel", (0.0, 0.0, 0.0))
+        self._append("ritual_speed", speed)
+        self._append("ritual_goal", 0)
+        self._append("ritual_finished", False)
+        return self.ritual_count - 1
+
+    def set_ritual_goals(self, index: int, goals) -> None:
+        """
+        제관 index의 목표 지점 목록을 바꿈 (현재 목표 번호 ritual_goal은 그대로)
+        """
+        coords = np.array([_xyz(g) for g in goals], dtype=float).reshape(-1, 3)
+        lo, hi = self.ritual_goal_offsets[index : index + 2].tolist()
+        self.goal_coords = np.vstack(
+            [self.goal_coords[:lo], coords, self.goal_coords[hi:]]
+        )
+        self.ritual_goal_offsets[index + 1 :] += len(coords) - (hi - lo)
+
+    def set_ritual_trail(self, index: int, points) -> None:
+        """
+        제관 index의 이동 기록을 points로 바꿈 (이후 스텝의 위치는 그 뒤에 이어 붙음)
+        """
+        self.ritual_trails[index] = [_xyz(pt) for pt in points]
+
+    def _select(self, indices, count: int) -> np.ndarray:
+        if indices is None:
+            return np.ones(count, dtype=bool)
+        mask = np.zeros(count, dtype=bool)
+        mask[np.asarray(indices, dtype=np.int64)] = True
+        return mask
+
+    def update_rituals(self, indices=None) -> None:
+        """
+        제관을 현재 목표 지점으로 한 스텝 이동 (indices가 None이면 전체)
+        """
+        dt = self.dt
+        mask = self._select(indices, self.ritual_count) & ~self.ritual_finished
+        goal_count = np.diff(self.ritual_goal_offsets)
+        no_goal = mask & (self.ritual_goal >= goal_count)
+        self.ritual_finished |= no_goal
+        active = np.flatnonzero(mask & ~no_goal)
+        if not len(active):
+            return
+        goal = self.goal_coords[
+            self.ritual_goal_offsets[active] + self.ritual_goal[active]
+        ]
+        direction = goal - self.ritual_pos[active]
+        distance = np.linalg.norm(direction, axis=1)
+        speed = self.ritual_speed[active]
+
+        arrive = distance < speed * dt
+        arrived = active[arrive]
+        self.ritual_pos[arrived] = goal[arrive]
+        self.ritual_goal[arrived] += 1
+        self.ritual_vel[arrived] = 0.0
+
+        walk = active[~arrive]
+        unit = direction[~arrive] / distance[~arrive, None]
+        desired = unit * speed[~arrive, None]
+        vel = self.ritual_vel[walk]
+        vel += (desired - vel) * 0.5 * dt
+        vel_length = np.linalg.norm(vel, axis=1)
+        too_fast = vel_length > speed[~arrive]
+        vel[too_fast] *= (speed[~arrive][too_fast] / vel_length[too_fast])[:, None]
+        self.ritual_vel[walk] = vel
+        self.ritual_pos[walk] += vel * dt
+        trails = self.ritual_trails
+        for i, pos in zip(active.tolist(), self.ritual_pos[active].tolist()):
+            trails[i].append(tuple(pos))
+
+    def points_at_length(self, indices, distances) -> np.ndarray:
+        """
+        방문자 indices 경로 위에서 시작점으로부터 distances만큼 간 점 [k, 3]
+        (누적 길이 표 이진 탐색 + 선형 보간, 커브 평가 없음)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        key = self.tourist_base[indices] + np.asarray(distances, dtype=float)
+        lo = self.path_offsets[indices]
+        last = self.path_offsets[indices + 1] - 1
+        k = np.searchsorted(self.path_along, key, side="right") - 1
+        k = np.minimum(np.maximum(k, lo), np.maximum(last - 1, lo))
+        nxt = np.minimum(k + 1, last)
+        span = self.path_along[nxt] - self.path_along[k]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(span > 0, (key - self.path_along[k]) / span, 0.0)
+        t = np.clip(t, 0.0, 1.0)[:, None]
+        return self.path_coords[k] * (1 - t) + self.path_coords[nxt] * t
+
+    def update_tourists(
+        self, ritual_positions=None, indices=None, ritual_hash=None
+    ) -> None:
+        """
+        방문자를 경로 따라 한 스텝 이동 (indices가 None이면 전체)
+        ritual_positions : 회피할 제관 좌표 [k, 3] 배열 또는 Point3d 리스트 (None 항목은 무시)
+        ritual_hash : 제관 좌표로 이미 만든 SpatialHash (주어지면 ritual_positions 대신 사용)
+        """
+        mask = self._select(indices, self.tourist_count) & ~self.tourist_finished
+        mask &= np.diff(self.path_offsets) > 0  # 경로가 없는 방문자
+        active = np.flatnonzero(mask)
+        if not len(active):
+            return
+        moved = self.tourist_moved[active] + self.tourist_speed[active] * self.dt
+        length = self.tourist_length[active]
+        done = moved >= length
+        moved[done] = length[done]
+        self.tourist_moved[active] = moved
+        self.tourist_finished[active[done]] = True
+        next_pos = self.points_at_length(active, moved)
+
+        if ritual_hash is None and ritual_positions is not None:
+            if not isinstance(ritual_positions, np.ndarray):
+                ritual_positions = [_xyz(p) for p in ritual_positions if p is not None]
+            ritual_hash = SpatialHash(ritual_positions, REPEL_RADIUS)
+        if ritual_hash is not None and len(ritual_hash):
+            next_pos += self._repulsion(next_pos, ritual_hash)
+        self.tourist_pos[active] = next_pos
+
+    @staticmethod
+    def _repulsion(positions, ritual_hash) -> np.ndarray:
+        """
+        제관 REPEL_RADIUS 이내 방문자를 밀어내는 이동량 [k, 3]
+        격자 해시로 가까운 (방문자, 제관) 쌍만 계산하고, 여러 제관의 영향은 같은 위치 기준으로 합한다.
+        """
+        rows, cols, dist = ritual_hash.query_pairs(positions, REPEL_RADIUS)
+        near = (dist < REPEL_RADIUS) & (dist > 0)
+        rows, cols, dist = rows[near], cols[near], dist[near]
+        push = REPEL_STRENGTH * np.exp(-dist / REPEL_FALLOFF) / dist
+        offset = np.zeros_like(positions)
+        np.add.at(
+            offset,
+            rows,
+            (positions[rows] - ritual_hash.coords[cols]) * push[:, None],
+        )
+        return offset
+
+    def step(self) -> None:
+        """
+        전체 시뮬레이션 한 스텝: 제관을 먼저 움직이고 방문자는 제관의 새 위치를 회피
+        제관 격자 해시(self.ritual_hash)는 스텝마다 한 번만 새로 만들어 에이전트 간 상호작용에 공유한다.
+        """
+        self.update_rituals()
+        self.ritual_hash = SpatialHash(self.ritual_pos, REPEL_RADIUS)
+        self.update_tourists(ritual_hash=self.ritual_hash)
+
+    def tourist_positions(self) -> list:
+        """
+        방문자 현재 위치 Point3d 리스트 (경로가 없는 방문자는 None)
+        """
+        return [
+            None if math.isnan(x) else geo.Point3d(x, y, z)
+            for x, y, z in self.tourist_pos.tolist()
+        ]
+
+    def ritual_positions(self) -> list:
+        """
+        제관 현재 위치 Point3d 리스트
+        """
+        return [geo.Point3d(x, y, z) for x, y, z in self.ritual_pos.tolist()]
+
+    def ritual_trail(self, index: int) -> list:
+        """
+        제관 index의 이동 기록 (시작점 + 스텝마다의 위치) Point3d 리스트
+        """
+        return [geo.Point3d(x, y, z) for x, y, z in self.ritual_trails[index]]
+
+    def tourists(self) -> list:
+        """
+        엔진의 방문자 전체를 TouristAgent 뷰 리스트로 반환
+        """
+        return [TouristAgent.view(self, i) for i in range(self.tourist_count)]
+
+    def rituals(self) -> list:
+        """
+        엔진의 제관 전체를 RitualAgent 뷰 리스트로 반환
+        """
+        return [RitualAgent.view(self, i) for i in range(self.ritual_count)]
+
 
 class TouristAgent:
     """
     맹진하 작성
     방문자 에이전트: 관광객 경로를 따라 이동 (장애물, 제관 근처 회피)
+    상태는 CrowdEngine 배열에 있고, 이 객체는 engine의 index번째 방문자를 가리키는 뷰이다.
+    current_position은 읽을 때마다 새로 만든 Point3d이므로 바꾸려면 다시 대입해야 하고,
+    path 커브를 제자리에서 변형해도 엔진의 누적 길이 표는 그대로이므로 agent.path = 새 커브로 바꾼다.
     """
 
     def __init__(
@@ -17,62 +351,178 @@ class TouristAgent:
         walls: List[geo.Curve],
         touristing_points: List[geo.Point3d],
         ritual_paths: Optional[List[geo.Curve]] = None,
+        engine: Optional[CrowdEngine] = None,
     ):
-        self.path = get_tourist_path(
+        """
+        engine : 여러 방문자를 한꺼번에 갱신할 CrowdEngine (없으면 이 방문자 전용 엔진 생성)
+        """
+        path = get_tourist_path(
             tourist_start_point, walls, touristing_points, ritual_paths
         )
-        self.velocity = velocity
-        self.dt = 0.1
-        self.distance_moved = 0.0
-        self.finished = False
-        self.current_position = tourist_start_point if self.path else None
+        self.engine = engine if engine is not None else CrowdEngine()
+        self.index = self.engine.add_tourist(path, velocity, tourist_start_point)
+
+    @classmethod
+    def view(cls, engine: CrowdEngine, index: int) -> "TouristAgent":
+        """
+        이미 엔진에 있는 방문자 index에 대한 뷰 (경로를 새로 만들지 않음)
+        """
+        agent = cls.__new__(cls)
+        agent.engine = engine
+        agent.index = index
+        return agent
+
+    @property
+    def path(self):
+        return self.engine.tourist_paths[self.index]
+
+    @path.setter
+    def path(self, value) -> None:
+        self.engine.set_tourist_path(self.index, value)
+
+    @property
+    def velocity(self) -> float:
+        return float(self.engine.tourist_speed[self.index])
+
+    @velocity.setter
+    def velocity(self, value: float) -> None:
+        self.engine.tourist_speed[self.index] = value
+
+    @property
+    def dt(self) -> float:
+        return self.engine.dt
+
+    @dt.setter
+    def dt(self, value: float) -> None:
+        # 시간 간격은 엔진 단위라서 같은 엔진의 모든 에이전트에 적용된다.
+        self.engine.dt = value
+
+    @property
+    def distance_moved(self) -> float:
+        return float(self.engine.tourist_moved[self.index])
+
+    @distance_moved.setter
+    def distance_moved(self, value: float) -> None:
+        self.engine.tourist_moved[self.index] = value
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.engine.tourist_finished[self.index])
+
+    @finished.setter
+    def finished(self, value: bool) -> None:
+        self.engine.tourist_finished[self.index] = value
+
+    @property
+    def current_position(self) -> Optional[geo.Point3d]:
+        x, y, z = self.engine.tourist_pos[self.index].tolist()
+        return None if math.isnan(x) else geo.Point3d(x, y, z)
+
+    @current_position.setter
+    def current_position(self, value: Optional[geo.Point3d]) -> None:
+        self.engine.tourist_pos[self.index] = (
+            (np.nan,) * 3 if value is None else _xyz(value)
+        )
 
     def update(self, ritual_positions: Optional[List[geo.Point3d]] = None) -> None:
         """
         경로 따라 한 스텝 이동 (제관 근처 회피 포함)
+        여러 방문자를 움직일 때는 engine.update_tourists()로 한 번에 갱신하는 것이 빠르다.
         """
-        if not self.path or self.finished:
-            return
-        curve_length = self.path.GetLength()
-        step_distance = self.velocity * self.dt
-        self.distance_moved += step_distance
-        if self.distance_moved >= curve_length:
-            self.distance_moved = curve_length
-            self.finished = True
-        next_pos = self.path.PointAtLength(self.distance_moved)
-
-        # 제관 회피 (2m 이내 접근 시)
-        if ritual_positions:
-            for rp in ritual_positions:
-                if rp is None:
-                    continue
-                vec = geo.Vector3d(next_pos - rp)
-                dist = vec.Length
-                if dist < 2000.0:
-                    vec.Unitize()
-                    repel = vec * 800.0 * math.exp(-dist / 400.0)
-                    next_pos += repel
-
-        self.current_position = next_pos
+        self.engine.update_tourists(ritual_positions, [self.index])
 
 
 class RitualAgent:
     """
     맹진하 작성
     제관 에이전트: 고정된 목표 지점을 순서대로 이동
+    상태는 CrowdEngine 배열에 있고, 이 객체는 engine의 index번째 제관을 가리키는 뷰이다.
+    goals, path, position, velocity는 읽을 때마다 엔진에서 새로 만든 복사본이라
+    agent.goals.append(pt), agent.velocity.Unitize()처럼 제자리에서 바꾸면 반영되지 않는다.
+    agent.goals = agent.goals + [pt]처럼 다시 대입해야 엔진에 기록된다.
     """
 
     def __init__(
-        self, start: geo.Point3d, goals: List[geo.Point3d], speed: float = 2000.0
+        self,
+        start: geo.Point3d,
+        goals: List[geo.Point3d],
+        speed: float = 2000.0,
+        engine: Optional[CrowdEngine] = None,
     ):
-        self.position = start
-        self.goals = goals
-        self.goal_index = 0
-        self.speed = speed
-        self.velocity = geo.Vector3d(0, 0, 0)
-        self.path = [start]
-        self.finished = False
-        self.current_position = start
+        """
+        engine : 여러 제관을 한꺼번에 갱신할 CrowdEngine (없으면 이 제관 전용 엔진 생성)
+        """
+        self.engine = engine if engine is not None else CrowdEngine()
+        self.index = self.engine.add_ritual(start, goals, speed)
+
+    @classmethod
+    def view(cls, engine: CrowdEngine, index: int) -> "RitualAgent":
+        """
+        이미 엔진에 있는 제관 index에 대한 뷰
+        """
+        agent = cls.__new__(cls)
+        agent.engine = engine
+        agent.index = index
+        return agent
+
+    @property
+    def goals(self) -> List[geo.Point3d]:
+        lo, hi = self.engine.ritual_goal_offsets[self.index : self.index + 2].tolist()
+        return [geo.Point3d(*p) for p in self.engine.goal_coords[lo:hi].tolist()]
+
+    @goals.setter
+    def goals(self, value: List[geo.Point3d]) -> None:
+        self.engine.set_ritual_goals(self.index, value)
+
+    @property
+    def position(self) -> geo.Point3d:
+        return geo.Point3d(*self.engine.ritual_pos[self.index].tolist())
+
+    @position.setter
+    def position(self, value: geo.Point3d) -> None:
+        self.engine.ritual_pos[self.index] = _xyz(value)
+
+    current_position = position
+
+    @property
+    def goal_index(self) -> int:
+        return int(self.engine.ritual_goal[self.index])
+
+    @goal_index.setter
+    def goal_index(self, value: int) -> None:
+        self.engine.ritual_goal[self.index] = value
+
+    @property
+    def speed(self) -> float:
+        return float(self.engine.ritual_speed[self.index])
+
+    @speed.setter
+    def speed(self, value: float) -> None:
+        self.engine.ritual_speed[self.index] = value
+
+    @property
+    def velocity(self) -> geo.Vector3d:
+        return geo.Vector3d(*self.engine.ritual_vel[self.index].tolist())
+
+    @velocity.setter
+    def velocity(self, value: geo.Vector3d) -> None:
+        self.engine.ritual_vel[self.index] = _xyz(value)
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.engine.ritual_finished[self.index])
+
+    @finished.setter
+    def finished(self, value: bool) -> None:
+        self.engine.ritual_finished[self.index] = value
+
+    @property
+    def path(self) -> List[geo.Point3d]:
+        return self.engine.ritual_trail(self.index)
+
+    @path.setter
+    def path(self, value: List[geo.Point3d]) -> None:
+        self.engine.set_ritual_trail(self.index, value)
 
     def current_goal(self) -> Optional[geo.Point3d]:
         return (
@@ -82,35 +532,46 @@ class RitualAgent:
     def update(self) -> None:
         """
         현재 목표 지점으로 한 스텝 이동
+        여러 제관을 움직일 때는 engine.update_rituals()로 한 번에 갱신하는 것이 빠르다.
         """
-        if self.finished:
-            return
-        goal = self.current_goal()
-        if not goal:
-            self.finished = True
-            return
-        direction = geo.Vector3d(goal - self.position)
-        distance = direction.Length
-        if distance < self.speed * 0.1:
-            self.position = goal
-            self.path.append(goal)
-            self.goal_index += 1
-            self.velocity = geo.Vector3d(0, 0, 0)
-            self.current_position = goal
-            return
+        self.engine.update_rituals([self.index])
+
 
-        direction.Unitize()
-        desired_velocity = direction * self.speed
-        force = (desired_velocity - self.velocity) * 0.5
-        dt = 0.1
-        self.velocity += force * dt
-        if self.velocity.Length > self.speed:
-            self.velocity.Unitize()
-            self.velocity *= self.speed
-        move = self.velocity * dt
-        self.position += move
-        self.path.append(self.position)
-        self.current_position = self.position
+_PLANNER_CACHE = OrderedDict()
+_PLANNER_CACHE_SIZE = 8
+
+
+def site_planner(
+    walls: List[geo.Curve],
+    ritual_paths: Optional[List[geo.Curve]] = None,
+    clearance: float = 100.0,
+    index=None,
+) -> VisibilityGraph:
+    """
+    맹진하 작성
+    벽과 제관 경로를 장애물로 하는 가시 그래프 (같은 장애물 배치는 캐시에서 재사용)
+    clearance : 경로가 벽 꼭짓점에서 떨어지는 거리
+    index : 같은 장애물로 만든 raw_utils.obstacle_index() (CCTV 가시성 검사와 공유)
+    곡선 벽은 clearance / 4 허용오차로 폴리라인 근사해서 경로 노드가 너무 많아지지 않게 한다.
+    """
+    tol = clearance / 4
+    obstacles = [get_vertex_array(crv, tol) for crv in walls if crv and crv.IsValid]
+    obstacles += [
+        get_vertex_array(crv, tol) for crv in ritual_paths or [] if crv and crv.IsValid
+    ]
+    key = (
+        hashlib.sha1(b"".join(pts.tobytes() + b"|" for pts in obstacles)).hexdigest(),
+        float(clearance),
+    )
+    planner = _PLANNER_CACHE.get(key)
+    if planner is None:
+        planner = VisibilityGraph(obstacles, clearance, index)
+        _PLANNER_CACHE[key] = planner
+        while len(_PLANNER_CACHE) > _PLANNER_CACHE_SIZE:
+            _PLANNER_CACHE.popitem(last=False)
+    else:
+        _PLANNER_CACHE.move_to_end(key)
+    return planner
 
 
 def get_tourist_path(
@@ -118,76 +579,27 @@ def get_tourist_path(
     walls: List[geo.Curve],
     touristing_points: List[geo.Point3d],
     ritual_paths: Optional[List[geo.Curve]] = None,
+    planner: Optional[VisibilityGraph] = None,
 ) -> Optional[geo.NurbsCurve]:
     """
     맹진하 작성
     시작점에서 관광 포인트들을 무작위로 방문하며, 벽과 제관 경로를 장애물로 회피하는 경로를 생성
+    포인트 사이는 가시 그래프(site_planner) A*로 장애물을 피하는 최단 경로로 잇고,
+    갈 수 없는 포인트는 건너뛴다.
+    planner : 미리 만든 VisibilityGraph (없으면 walls, ritual_paths로 만들거나 캐시에서 가져옴)
     """
-    if ritual_paths is None:
-        ritual_paths = []
-    all_walls = [crv.ToNurbsCurve() for crv in walls if crv and crv.IsValid]
-    for ritual_path in ritual_paths:
-        if ritual_path and ritual_path.IsValid:
-            all_walls.append(ritual_path)
+    if planner is None:
+        planner = site_planner(walls, ritual_paths)
 
     waypoints = random.sample(touristing_points, len(touristing_points))
     path = [tourist_start_point]
-    position = tourist_start_point
-
-    def is_visible(p1: geo.Point3d, p2: geo.Point3d) -> bool:
-        # 두 점 사이 장애물 여부 확인
-        line = geo.Line(p1, p2).ToNurbsCurve()
-        for wall in all_walls:
-            result = geo.Intersect.Intersection.CurveCurve(wall, line, 1.0, 1.0)
-            if result and result.Count > 0:
-                return False
-        return True
-
-    def get_random_point(
-        wp: geo.Point3d, position: geo.Point3d
-    ) -> Optional[geo.Point3d]:
-        # 장애물 회피용 임시 포인트 선택
-        direction = geo.Vector3d(wp - position)
-        if direction.IsZero:
-            return None
-        direction.Unitize()
-        bounds = geo.BoundingBox([position] + touristing_points)
-        candidates = [
-            geo.Point3d(
-                random.uniform(bounds.Min.X, bounds.Max.X),
-                random.uniform(bounds.Min.Y, bounds.Max.Y),
-                0,
-            )
-            for _ in range(100)
-        ]
-        filtered = [
-            pt
-            for pt in candidates
-            if geo.Vector3d.VectorAngle(direction, geo.Vector3d(pt - position))
-            < math.radians(120)
-            and is_visible(position, pt)
-        ]
-        if filtered:
-            return min(
-                filtered,
-                key=lambda pt: pt.DistanceTo(wp) + 0.5 * pt.DistanceTo(position),
-            )
-        return None
-
+    position = _xyz(tourist_start_point)
     for wp in waypoints:
-        if is_visible(position, wp):
-            path.append(wp)
-            position = wp
-        else:
-            for _ in range(3):
-                pt = get_random_point(wp, position)
-                if pt:
-                    path.append(pt)
-                    position = pt
-                    if is_visible(position, wp):
-                        path.append(wp)
-                        position = wp
-                        break
+        route = planner.shortest_path(position, _xyz(wp))
+        if route is None:
+            continue
+        path += [geo.Point3d(x, y, z) for x, y, z in route[1:-1].tolist()] + [wp]
+        position = _xyz(wp)
 
     return geo.Polyline(path).ToNurbsCurve() if len(path) > 1 else None
 
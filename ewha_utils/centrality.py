@@ -0,0 +1,173 @@
+import heapq
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+def integration_from_depth(mean_depth, count):
+    """
+    이정현 작성
+    Hillier & Hanson 통합도(integration) = D_k / RA
+    RA (relative asymmetry) = 2 (MD - 1) / (k - 2), D_k는 같은 노드 수 k의 다이아몬드 그래프 RA
+    mean_depth : 평균 깊이 배열, count : 각 노드가 도달한 노드 수 k (자기 자신 포함) 배열
+    k가 3보다 작거나 평균 깊이가 1 이하(모든 노드가 한 단계)인 경우 nan
+    """
+    md = np.asarray(mean_depth, dtype=float)
+    k = np.asarray(count, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ra = 2 * (md - 1) / (k - 2)
+        d_k = 2 * (k * (np.log2((k + 2) / 3) - 1) + 1) / ((k - 1) * (k - 2))
+        result = d_k / ra
+    return np.where((k >= 3) & (ra > 0), result, np.nan)
+
+
+def _single_source(offsets, tgts, weights, edge_ids, s, radius, acc) -> None:
+    """
+    출발 노드 s에 대한 Brandes 누적 (가중치 Dijkstra 버전), radius 이하 거리의 경로만 센다.
+    acc : (노드 매개 중심성, 엣지 매개 중심성, 노드별 도달 수, 노드별 거리 합) 리스트
+          무방향 그래프라 s → v 거리는 v의 근접 중심성에도 그대로 쓴다.
+    """
+    node_bc, edge_bc, count, total = acc
+    dist = {s: 0.0}
+    sigma = {s: 1.0}
+    preds = {s: []}
+    order = []
+    done = set()
+    queue = [(0.0, s)]
+    while queue:
+        d, u = heapq.heappop(queue)
+        if u in done:
+            continue
+        done.add(u)
+        order.append(u)
+        for k in range(offsets[u], offsets[u + 1]):
+            v = tgts[k]
+            alt = d + weights[k]
+            if alt > radius or alt == math.inf:  # radius 밖이거나 차단된 엣지
+                continue
+            old = dist.get(v, math.inf)
+            if alt < old:
+                dist[v] = alt
+                sigma[v] = sigma[u]
+                preds[v] = [(u, edge_ids[k])]
+                heapq.heappush(queue, (alt, v))
+            elif alt == old and v not in done:  # 비용 0 엣지로 되돌아가는 경우 제외
+                sigma[v] += sigma[u]
+                preds[v].append((u, edge_ids[k]))
+
+    # 먼 노드부터 의존도(dependency)를 거꾸로 누적
+    delta = dict.fromkeys(order, 0.0)
+    for w in reversed(order):
+        coeff = (1.0 + delta[w]) / sigma[w]
+        for v, e in preds[w]:
+            c = sigma[v] * coeff
+            delta[v] += c
+            edge_bc[e] += c
+        if w != s:
+            node_bc[w] += delta[w]
+            count[w] += 1
+            total[w] += dist[w]
+
+
+_pool_graph = None
+
+
+def _init_pool(graph) -> None:
+    global _pool_graph
+    _pool_graph = graph
+
+
+def _source_chunk(args):
+    """
+    프로세스 풀 작업 단위: 출발 노드 묶음에 대한 부분 결과
+    반환 : (노드 매개 중심성, 엣지 매개 중심성, 노드별 도달 수, 노드별 거리 합)
+    """
+    sources, radius, steps = args
+    graph = _pool_graph
+    offsets, tgts, weights = graph.as_lists()
+    if steps:
+        weights = [1.0 if w < math.inf else w for w in weights]
+    edge_ids = graph.edge_id_list()
+    n = graph.node_count
+    acc = ([0.0] * n, [0.0] * graph.edge_count, [0] * n, [0.0] * n)
+    for s in sources.tolist():
+        _single_source(offsets, tgts, weights, edge_ids, s, radius, acc)
+    return tuple(np.array(a, dtype=float) for a in acc)
+
+
+def network_centrality(
+    graph,
+    radius: float = None,
+    samples: int = None,
+    seed: int = None,
+    processes: int = None,
+    steps: bool = False,
+    normalized: bool = False,
+) -> dict:
+    """
+    이정현 작성
+    graph(RoadGraph)의 매개 중심성(Brandes betweenness)과 근접 중심성(closeness)
+    radius : 이 거리(비용) 이내의 경로만 고려하는 지역(local) 중심성, None이면 전체
+    samples : 출발 노드를 이 개수만큼 무작위로 뽑아 근사 (결과는 n / samples 배로 보정)
+    seed : samples 추출 난수 시드
+    processes : 2 이상이면 출발 노드를 나누어 프로세스 풀에서 병렬 계산
+    steps : True이면 엣지 비용 대신 단계 수(모든 엣지 1)로 계산하고 통합도(integration)도 반환
+    normalized : 매개 중심성을 노드 쌍 수 (n - 1)(n - 2) / 2로 나눔
+    반환 : {"betweenness" [n], "edge_betweenness" [m], "closeness" [n],
+            "mean_depth" [n], "count" [n], ("integration" [n])}
+    """
+    n = graph.node_count
+    radius = math.inf if radius is None else float(radius)
+    sources = np.arange(n)
+    if samples is not None and samples < n:
+        rng = np.random.default_rng(seed)
+        sources = np.sort(rng.choice(n, samples, replace=False))
+    if processes and processes > 1 and len(sources) > 1:
+        chunks = np.array_split(sources, min(processes * 4, len(sources)))
+        with ProcessPoolExecutor(
+            processes, initializer=_init_pool, initargs=(graph,)
+        ) as pool:
+            parts = list(pool.map(_source_chunk, [(c, radius, steps) for c in chunks]))
+    else:
+        _init_pool(graph)
+        parts = [_source_chunk((sources, radius, steps))]
+    node_bc, edge_bc, count, total = (sum(p[i] for p in parts) for i in range(4))
+
+    # 표본 출발 노드만 계산했다면 n / samples 배로 보정하고,
+    # 무방향 그래프라 모든 쌍을 양쪽에서 한 번씩 세므로 매개 중심성은 2로 나눈다.
+    scale = n / len(sources) if len(sources) else 0.0
+    node_bc *= scale / 2
+    edge_bc *= scale / 2
+    count *= scale
+    total *= scale
+    if normalized and n > 2:
+        node_bc /= (n - 1) * (n - 2) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_depth = np.where(count > 0, total / count, np.nan)
+        closeness = np.where(total > 0, count / total, 0.0)
+    result = {
+        "betweenness": node_bc,
+        "edge_betweenness": edge_bc,
+        "closeness": closeness,
+        "mean_depth": mean_depth,
+        "count": count,
+    }
+    if steps:
+        result["integration"] = integration_from_depth(mean_depth, count + 1)
+    return result
+
+
+def betweenness(graph, radius: float = None, samples: int = None, **kwargs):
+    """
+    이정현 작성
+    노드 매개 중심성 배열 (network_centrality()의 "betweenness")
+    """
+    return network_centrality(graph, radius, samples, **kwargs)["betweenness"]
+
+
+def closeness(graph, radius: float = None, samples: int = None, **kwargs):
+    """
+    이정현 작성
+    근접 중심성 배열 = 도달 가능한(radius 이내) 노드까지 평균 거리의 역수
+    """
+    return network_centrality(graph, radius, samples, **kwargs)["closeness"]
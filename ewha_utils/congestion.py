@@ -0,0 +1,150 @@
+import json
+import math
+import os
+import numpy as np
+
+HOURS = 24
+
+# GRS80 타원체 (EPSG:5186 Korea 2000 / Central Belt 2010)
+_GRS80_A = 6378137.0
+_GRS80_F = 1 / 298.257222101
+
+
+def lonlat_to_tm(
+    lon,
+    lat,
+    lon0: float = 127.0,
+    lat0: float = 38.0,
+    false_easting: float = 200000.0,
+    false_northing: float = 600000.0,
+    k0: float = 1.0,
+) -> np.ndarray:
+    """
+    오정서 작성
+    경위도(도)를 횡메르카토르(TM) 평면 좌표(m)로 변환 (Snyder 급수식)
+    기본값은 국토정보 GeoJSON이 쓰는 EPSG:5186 (중부원점, GRS80)
+    반환 : [k, 3] 좌표 배열 (z = 0)
+    """
+    lon = np.radians(np.asarray(lon, dtype=float).reshape(-1))
+    lat = np.radians(np.asarray(lat, dtype=float).reshape(-1))
+    e2 = _GRS80_F * (2 - _GRS80_F)
+    ep2 = e2 / (1 - e2)
+
+    def meridian(phi):
+        return _GRS80_A * (
+            (1 - e2 / 4 - 3 * e2**2 / 64 - 5 * e2**3 / 256) * phi
+            - (3 * e2 / 8 + 3 * e2**2 / 32 + 45 * e2**3 / 1024) * np.sin(2 * phi)
+            + (15 * e2**2 / 256 + 45 * e2**3 / 1024) * np.sin(4 * phi)
+            - (35 * e2**3 / 3072) * np.sin(6 * phi)
+        )
+
+    n = _GRS80_A / np.sqrt(1 - e2 * np.sin(lat) ** 2)
+    t = np.tan(lat) ** 2
+    c = ep2 * np.cos(lat) ** 2
+    a = (lon - math.radians(lon0)) * np.cos(lat)
+    x = (
+        k0
+        * n
+        * (
+            a
+            + (1 - t + c) * a**3 / 6
+            + (5 - 18 * t + t**2 + 72 * c - 58 * ep2) * a**5 / 120
+        )
+    )
+    y = k0 * (
+        meridian(lat)
+        - meridian(math.radians(lat0))
+        + n
+        * np.tan(lat)
+        * (
+            a**2 / 2
+            + (5 - t + 9 * c + 4 * c**2) * a**4 / 24
+            + (61 - 58 * t + t**2 + 600 * c - 330 * ep2) * a**6 / 720
+        )
+    )
+    return np.column_stack([x + false_easting, y + false_northing, np.zeros(len(x))])
+
+
+class CongestionProfile:
+    """
+    오정서 작성
+    역별 시간대 혼잡도를 하나의 배열로 보관하는 저장소.
+
+    station_ids [k] : 역 ID 문자열
+    coords [k, 3] : 역 좌표 (도로 그래프와 같은 좌표계)
+    values [k, 24] : 0 ~ 23시 혼잡도 (float32)
+    lines [k] : 역별 호선 목록
+    """
+
+    def __init__(self, station_ids, coords, values, lines=None):
+        self.station_ids = np.asarray(station_ids, dtype=str)
+        self.coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+        self.values = np.asarray(values, dtype=np.float32).reshape(-1, HOURS)
+        self.lines = lines if lines is not None else [[] for _ in self.station_ids]
+
+    def __len__(self) -> int:
+        return len(self.station_ids)
+
+    @classmethod
+    def from_json(
+        cls, data, projection: str = "tm", scale: float = 100000
+    ) -> "CongestionProfile":
+        """
+        오정서 작성
+        {역 ID: {latitude, longitude, line_numbers, congestion_by_hour: {"00h": ...}}}
+        형식의 JSON(dict 또는 파일 경로)에서 생성
+        projection : "tm"이면 EPSG:5186 좌표(m, 국토정보 도로 GeoJSON과 같은 좌표계),
+                     "scale"이면 raw_utils.geo_to_xy와 같은 (경도, 위도) × scale 좌표
+        """
+        if isinstance(data, str):
+            if not os.path.exists(data):
+                raise FileNotFoundError(f"파일을 찾을 수 없습니다: {data}")
+            with open(data, encoding="utf-8") as f:
+                data = json.load(f)
+        ids = list(data)
+        lat = np.array([data[i]["latitude"] for i in ids], dtype=float)
+        lon = np.array([data[i]["longitude"] for i in ids], dtype=float)
+        values = np.zeros((len(ids), HOURS), dtype=np.float32)
+        for row, i in enumerate(ids):
+            for key, value in data[i]["congestion_by_hour"].items():
+                values[row, int(key.rstrip("h")) % HOURS] = value or 0
+        if projection == "tm":
+            coords = lonlat_to_tm(lon, lat)
+        elif projection == "scale":
+            coords = np.column_stack([lon * scale, lat * scale, np.zeros(len(ids))])
+        else:
+            raise ValueError(f"지원하지 않는 좌표 변환 방식입니다: {projection}")
+        lines = [list(data[i].get("line_numbers", [])) for i in ids]
+        return cls(ids, coords, values, lines)
+
+    def at(self, hour: float) -> np.ndarray:
+        """
+        오정서 작성
+        hour(소수 가능, 24시간 주기) 시점의 역별 혼잡도 (앞뒤 정시 값 선형 보간)
+        """
+        hour = float(hour) % HOURS
+        lo = int(hour)
+        frac = hour - lo
+        return self.values[:, lo] * (1 - frac) + self.values[:, (lo + 1) % HOURS] * frac
+
+    def edge_factors(
+        self, graph, radius: float = 300.0, alpha: float = 1.0, block_size: int = 4096
+    ) -> np.ndarray:
+        """
+        오정서 작성
+        graph(RoadGraph) 엣지별 시간대 비용 배율 [24, m] (float32)
+        배율 = 1 + alpha × Σ (역 혼잡도 / 전체 최대 혼잡도) × (1 - 엣지 중점과 역의 거리 / radius)
+        radius 밖의 역은 영향이 없고, 엣지-역 가중치를 엣지 블록마다 한 번만 계산해서
+        24시간 전체에 행렬 곱으로 적용한다.
+        """
+        mids = (graph.coords[graph.edges[:, 0]] + graph.coords[graph.edges[:, 1]]) / 2
+        peak = float(self.values.max()) if self.values.size else 0.0
+        scaled = self.values / peak if peak > 0 else self.values
+        factors = np.ones((HOURS, graph.edge_count), dtype=np.float32)
+        for lo in range(0, graph.edge_count, block_size):
+            block = mids[lo : lo + block_size, :2]
+            dist = np.linalg.norm(block[:, None, :] - self.coords[None, :, :2], axis=2)
+            weight = np.clip(1 - dist / radius, 0, None)
+            if weight.any():
+                factors[:, lo : lo + len(block)] += alpha * (weight @ scaled).T
+        return factors
@@ -0,0 +1,265 @@
+import heapq
+import math
+import os
+import time
+import numpy as np
+
+import ewha_utils.graph_search as graph_search
+
+
+class ContractionHierarchy:
+    """
+    이정현 작성
+    RoadGraph 위의 Contraction Hierarchy (CH).
+    노드를 중요도 순서대로 축약하면서 필요한 지름길(shortcut) 엣지를 추가해 두고,
+    질의 시에는 순위가 높아지는 방향(upward)으로만 양방향 탐색하여
+    같은 도로망에 대한 반복 질의를 빠르게 처리한다.
+
+    rank [n] : 노드 축약 순서 (클수록 중요한 노드)
+    up_offsets [n + 1] / up_targets / up_weights : 순위가 높은 이웃으로 가는 CSR 엣지
+    up_middle : 지름길이면 축약된 가운데 노드, 원래 엣지면 -(엣지 인덱스 + 1)
+    """
+
+    ARRAY_NAMES = ("rank", "up_offsets", "up_targets", "up_weights", "up_middle")
+
+    def __init__(self, rank, up_offsets, up_targets, up_weights, up_middle):
+        self.rank = np.asarray(rank, dtype=np.int64)
+        self.up_offsets = np.asarray(up_offsets, dtype=np.int64)
+        self.up_targets = np.asarray(up_targets, dtype=np.int64)
+        self.up_weights = np.asarray(up_weights, dtype=float)
+        self.up_middle = np.asarray(up_middle, dtype=np.int64)
+        self._lists = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.rank)
+
+    @property
+    def shortcut_count(self) -> int:
+        return int((self.up_middle >= 0).sum())
+
+    @classmethod
+    def build(cls, graph, settle_limit: int = 200) -> "ContractionHierarchy":
+        """
+        이정현 작성
+        graph(RoadGraph)의 현재 비용(weights)으로 CH 생성
+        settle_limit : 지름길 필요 여부를 판단하는 witness 탐색의 최대 방문 노드 수
+                       (작을수록 빨리 만들어지지만 지름길이 조금 늘어남)
+        """
+        n = graph.node_count
+        adj = [dict() for _ in range(n)]
+        for e, ((u, v), w) in enumerate(
+            zip(graph.edges.tolist(), graph.edge_costs().tolist())
+        ):
+            if u == v or not math.isfinite(w):
+                continue
+            if w < adj[u].get(v, (math.inf,))[0]:
+                adj[u][v] = (w, -(e + 1))
+                adj[v][u] = (w, -(e + 1))
+
+        contracted_neighbors = [0] * n
+        queue = [
+            (_priority(adj, v, contracted_neighbors, settle_limit), v) for v in range(n)
+        ]
+        heapq.heapify(queue)
+        rank = np.empty(n, dtype=np.int64)
+        up = [None] * n
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            # 우선순위는 이웃 축약에 따라 바뀌므로 꺼낼 때 다시 계산 (lazy update)
+            priority = _priority(adj, v, contracted_neighbors, settle_limit)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, v))
+                continue
+            for u, x, w in _shortcuts(adj, v, settle_limit):
+                if w < adj[u].get(x, (math.inf,))[0]:
+                    adj[u][x] = (w, v)
+                    adj[x][u] = (w, v)
+            for u in adj[v]:
+                del adj[u][v]
+                contracted_neighbors[u] += 1
+            up[v] = sorted(adj[v].items())
+            adj[v] = {}
+            rank[v] = order
+            order += 1
+
+        counts = [len(arcs) for arcs in up]
+        up_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=up_offsets[1:])
+        flat = [(x, w, mid) for arcs in up for x, (w, mid) in arcs]
+        up_targets = np.array([a[0] for a in flat], dtype=np.int64)
+        up_weights = np.array([a[1] for a in flat], dtype=float)
+        up_middle = np.array([a[2] for a in flat], dtype=np.int64)
+        return cls(rank, up_offsets, up_targets, up_weights, up_middle)
+
+    def _as_lists(self):
+        if self._lists is None:
+            self._lists = (
+                self.up_offsets.tolist(),
+                self.up_targets.tolist(),
+                self.up_weights.tolist(),
+                self.up_middle.tolist(),
+            )
+        return self._lists
+
+    def query(self, sources, targets, stats=None):
+        """
+        이정현 작성
+        CH 양방향 upward 탐색으로 최단 경로 계산.
+        sources, targets : 노드 인덱스 또는 {노드: 추가 비용} dict
+        반환 : (비용, 노드 인덱스 리스트, 엣지 인덱스 리스트), 경로가 없으면 (inf, None, None)
+        """
+        if stats is None:
+            stats = graph_search.SearchStats("ch")
+        start_time = time.perf_counter()
+        offsets, tgts, weights, middles = self._as_lists()
+        dists = ({}, {})
+        prevs = ({}, {})
+        queues = ([], [])
+        for side, terminals in enumerate(
+            (graph_search._as_terminals(sources), graph_search._as_terminals(targets))
+        ):
+            for node, off in terminals.items():
+                if off < dists[side].get(node, math.inf):
+                    dists[side][node] = off
+                    heapq.heappush(queues[side], (off, node))
+                    stats.pushes += 1
+        best, meet = math.inf, None
+        for node, d in dists[0].items():
+            if node in dists[1] and d + dists[1][node] < best:
+                best, meet = d + dists[1][node], node
+        side = 0
+        while queues[0] or queues[1]:
+            if not queues[side]:
+                side = 1 - side
+            dist, other = dists[side], dists[1 - side]
+            d, u = heapq.heappop(queues[side])
+            if d >= best:
+                queues[side].clear()  # 이쪽 탐색은 더 이상 개선 불가
+                continue
+            if d > dist[u]:
+                continue
+            stats.settled += 1
+            if u in other and d + other[u] < best:
+                best, meet = d + other[u], u
+            for k in range(offsets[u], offsets[u + 1]):
+                v = tgts[k]
+                alt = d + weights[k]
+                if alt < dist.get(v, math.inf):
+                    dist[v] = alt
+                    prevs[side][v] = (u, middles[k])
+                    heapq.heappush(queues[side], (alt, v))
+                    stats.pushes += 1
+            side = 1 - side
+        stats.wall_time = time.perf_counter() - start_time
+        if meet is None:
+            return math.inf, None, None
+
+        # upward 경로 (출발 → meet, meet → 도착)를 원래 엣지 단위로 풀어서 반환
+        arcs = []
+        node = meet
+        while node in prevs[0]:
+            u, mid = prevs[0][node]
+            arcs.append((u, node, mid))
+            node = u
+        arcs.reverse()
+        node = meet
+        while node in prevs[1]:
+            u, mid = prevs[1][node]
+            arcs.append((node, u, mid))
+            node = u
+        nodes = [arcs[0][0]] if arcs else [meet]
+        edges = []
+        for a, b, mid in arcs:
+            self._unpack(a, b, mid, nodes, edges)
+        return best, nodes, edges
+
+    def _unpack(self, a: int, b: int, mid: int, nodes: list, edges: list) -> None:
+        """
+        a → b 엣지(지름길이면 재귀적으로 펼침)를 nodes, edges에 추가
+        """
+        stack = [(a, b, mid)]
+        while stack:
+            a, b, mid = stack.pop()
+            if mid < 0:
+                edges.append(-mid - 1)
+                nodes.append(b)
+                continue
+            # 가운데 노드는 a, b보다 먼저 축약되었으므로 upward 엣지가 가운데 노드 쪽에 있다.
+            stack.append((mid, b, self._middle_of(mid, b)))
+            stack.append((a, mid, self._middle_of(mid, a)))
+
+    def _middle_of(self, low: int, high: int) -> int:
+        offsets, tgts, _, middles = self._as_lists()
+        for k in range(offsets[low], offsets[low + 1]):
+            if tgts[k] == high:
+                return middles[k]
+        raise KeyError(f"CH 엣지를 찾을 수 없습니다: {low} → {high}")
+
+    def save(self, path: str) -> None:
+        """
+        이정현 작성
+        CH를 npz 파일로 저장
+        """
+        np.savez(path, **{name: getattr(self, name) for name in self.ARRAY_NAMES})
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        """
+        이정현 작성
+        save()로 저장한 CH 불러오기
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {path}")
+        with np.load(path) as data:
+            return cls(*(data[name] for name in cls.ARRAY_NAMES))
+
+
+def _witness_search(adj, source: int, avoid: int, max_cost: float, settle_limit):
+    """
+    avoid 노드를 거치지 않는 source 기준 제한 Dijkstra (witness 경로 탐색)
+    """
+    dist = {source: 0.0}
+    queue = [(0.0, source)]
+    settled = 0
+    while queue:
+        d, u = heapq.heappop(queue)
+        if d > max_cost or settled >= settle_limit:
+            break
+        if d > dist[u]:
+            continue
+        settled += 1
+        for v, (w, _) in adj[u].items():
+            if v == avoid:
+                continue
+            alt = d + w
+            if alt < dist.get(v, math.inf):
+                dist[v] = alt
+                heapq.heappush(queue, (alt, v))
+    return dist
+
+
+def _shortcuts(adj, v: int, settle_limit: int) -> list:
+    """
+    노드 v를 축약할 때 필요한 지름길 목록 [(u, x, 비용)]
+    """
+    neighbors = list(adj[v].items())
+    result = []
+    for i, (u, (wu, _)) in enumerate(neighbors):
+        others = neighbors[i + 1 :]
+        if not others:
+            continue
+        max_cost = wu + max(w for _, (w, _) in others)
+        dist = _witness_search(adj, u, v, max_cost, settle_limit)
+        for x, (wx, _) in others:
+            if dist.get(x, math.inf) > wu + wx:
+                result.append((u, x, wu + wx))
+    return result
+
+
+def _priority(adj, v: int, contracted_neighbors: list, settle_limit: int) -> int:
+    """
+    축약 우선순위 = 엣지 차이(추가될 지름길 수 - 제거될 엣지 수) + 이미 축약된 이웃 수
+    """
+    return len(_shortcuts(adj, v, settle_limit)) - len(adj[v]) + contracted_neighbors[v]
@@ -0,0 +1,237 @@
+import heapq
+import math
+import time
+import numpy as np
+
+from ewha_utils.graph_search import SearchStats
+
+FLOW_EPS = 1e-9
+
+
+class _ResidualNetwork:
+    """
+    최소 비용 유량용 잔여(residual) 네트워크.
+    arc a와 역방향 잔여 arc a ^ 1을 쌍으로 저장하고, 도로 엣지 하나는 u → v, v → u 두 쌍이 된다.
+    노드 n은 가상 출발점(super source), n + 1은 가상 도착점(super sink).
+    """
+
+    def __init__(self, node_count: int):
+        self.node_count = node_count + 2
+        self.source = node_count
+        self.sink = node_count + 1
+        self.out = [[] for _ in range(self.node_count)]
+        self.head = []
+        self.cap = []
+        self.cost = []
+        self.flow = []
+
+    def add_arc(self, u: int, v: int, cap: float, cost: float) -> int:
+        a = len(self.head)
+        self.out[u].append(a)
+        self.out[v].append(a + 1)
+        self.head += [v, u]
+        self.cap += [cap, 0.0]
+        self.cost += [cost, -cost]
+        self.flow += [0.0, 0.0]
+        return a
+
+    def residual(self, a: int) -> float:
+        return self.cap[a] - self.flow[a]
+
+    def push(self, a: int, amount: float) -> None:
+        self.flow[a] += amount
+        self.flow[a ^ 1] -= amount
+
+
+def _reduced_dijkstra(net, potential, stats):
+    """
+    잔여 네트워크에서 축소 비용(cost + π(u) - π(v) ≥ 0) 기준 source → sink Dijkstra
+    sink를 확정하면 바로 멈춘다.
+    반환 : (dist 리스트, 각 노드로 들어온 arc 리스트)
+    """
+    dist = [math.inf] * net.node_count
+    prev_arc = [-1] * net.node_count
+    head, cap, cost, flow, out = net.head, net.cap, net.cost, net.flow, net.out
+    dist[net.source] = 0.0
+    queue = [(0.0, net.source)]
+    stats.pushes += 1
+    while queue:
+        d, u = heapq.heappop(queue)
+        if d > dist[u]:
+            continue
+        stats.settled += 1
+        if u == net.sink:
+            break
+        pu = potential[u]
+        for a in out[u]:
+            if cap[a] - flow[a] <= FLOW_EPS:
+                continue
+            v = head[a]
+            # 부동소수 오차로 생기는 아주 작은 음수 축소 비용은 0으로 본다.
+            alt = d + max(cost[a] + pu - potential[v], 0.0)
+            if alt < dist[v]:
+                dist[v] = alt
+                prev_arc[v] = a
+                heapq.heappush(queue, (alt, v))
+                stats.pushes += 1
+    return dist, prev_arc
+
+
+def min_cost_flow(
+    graph, sources, supply, sinks, demand, capacities=None, stats=None
+) -> dict:
+    """
+    이정현 작성
+    graph(RoadGraph) 위에서 여러 공급지 → 여러 수요지 최소 비용 유량
+    (successive shortest path, 포텐셜로 축소 비용을 음수 없이 유지해서 매 증강을 Dijkstra로 계산)
+    sources [p] / sinks [q] : 공급지 / 수요지 노드 인덱스 (같은 노드가 여러 번 있어도 됨)
+    supply [p] / demand [q] : 공급량 / 수요량
+    capacities : 엣지 용량 (스칼라 또는 [m] 배열, None이면 무제한)
+                 도로 엣지는 양방향 모두 이 용량까지 흐를 수 있다.
+    stats : SearchStats를 넘기면 전체 Dijkstra 통계를 누적
+    보낼 수 있는 최대 유량 min(총 공급, 총 수요, 절단 용량)을 최소 비용으로 보낸다.
+    반환 : {"cost" 총 비용, "flow" 총 유량,
+            "edge_flow" [m] 엣지별 순 유량 (+ 는 edges[e, 0] → edges[e, 1] 방향),
+            "sent" [p] 공급지별 보낸 양, "received" [q] 수요지별 받은 양,
+            "routes" [(공급지 번호, 수요지 번호, 유량, 노드 리스트, 엣지 리스트)],
+            "augmentations" 증강 횟수}
+    """
+    if stats is None:
+        stats = SearchStats("flow")
+    start_time = time.perf_counter()
+    sources = np.asarray(sources, dtype=np.int64).reshape(-1)
+    sinks = np.asarray(sinks, dtype=np.int64).reshape(-1)
+    supply = np.broadcast_to(np.asarray(supply, dtype=float), sources.shape)
+    demand = np.broadcast_to(np.asarray(demand, dtype=float), sinks.shape)
+    m = graph.edge_count
+    if capacities is None:
+        capacities = np.full(m, math.inf)
+    capacities = np.broadcast_to(np.asarray(capacities, dtype=float), (m,))
+
+    net = _ResidualNetwork(graph.node_count)
+    road_arcs = []
+    costs = graph.edge_costs().tolist()
+    for e, ((u, v), cost, cap) in enumerate(
+        zip(graph.edges.tolist(), costs, capacities.tolist())
+    ):
+        if u == v or not math.isfinite(cost) or cap <= 0:
+            continue  # 차단된 엣지, 용량 0인 엣지
+        road_arcs.append(
+            (e, net.add_arc(u, v, cap, cost), net.add_arc(v, u, cap, cost))
+        )
+    source_arcs = [
+        net.add_arc(net.source, s, amount, 0.0)
+        for s, amount in zip(sources.tolist(), supply.tolist())
+    ]
+    sink_arcs = [
+        net.add_arc(t, net.sink, amount, 0.0)
+        for t, amount in zip(sinks.tolist(), demand.tolist())
+    ]
+
+    # 초기 비용이 모두 0 이상이라 포텐셜 0에서 시작할 수 있다.
+    potential = [0.0] * net.node_count
+    total_flow, total_cost, augmentations = 0.0, 0.0, 0
+    while True:
+        dist, prev_arc = _reduced_dijkstra(net, potential, stats)
+        reach = dist[net.sink]
+        if reach == math.inf:
+            break
+        # sink보다 먼 노드(확정 전)는 sink 거리만큼만 올려도 축소 비용이 음수가 되지 않는다.
+        for v in range(net.node_count):
+            potential[v] += min(dist[v], reach)
+        amount, v = math.inf, net.sink
+        while v != net.source:
+            a = prev_arc[v]
+            amount = min(amount, net.residual(a))
+            v = net.head[a ^ 1]
+        v = net.sink
+        while v != net.source:
+            a = prev_arc[v]
+            net.push(a, amount)
+            total_cost += amount * net.cost[a]
+            v = net.head[a ^ 1]
+        total_flow += amount
+        augmentations += 1
+
+    edge_flow = np.zeros(m)
+    for e, forward, backward in road_arcs:
+        edge_flow[e] = net.flow[forward] - net.flow[backward]
+    sent = np.array([net.flow[a] for a in source_arcs])
+    received = np.array([net.flow[a] for a in sink_arcs])
+    stats.wall_time = time.perf_counter() - start_time
+    return {
+        "cost": total_cost,
+        "flow": total_flow,
+        "edge_flow": edge_flow,
+        "sent": sent,
+        "received": received,
+        "routes": decompose_flow(graph, edge_flow, sources, sent, sinks, received),
+        "augmentations": augmentations,
+    }
+
+
+def decompose_flow(graph, edge_flow, sources, sent, sinks, received) -> list:
+    """
+    이정현 작성
+    엣지별 순 유량을 공급지 → 수요지 경로별 유량으로 분해
+    (같은 방향으로 흐르는 유량을 따라가다 되돌아오는 순환이 생기면 그 순환은 지움)
+    반환 : [(공급지 번호, 수요지 번호, 유량, 노드 리스트, 엣지 리스트)]
+    """
+    out = {}  # {노드: {(다음 노드, 엣지): 남은 유량}}
+    for e, ((u, v), f) in enumerate(zip(graph.edges.tolist(), edge_flow.tolist())):
+        if f > FLOW_EPS:
+            out.setdefault(u, {})[(v, e)] = f
+        elif f < -FLOW_EPS:
+            out.setdefault(v, {})[(u, e)] = -f
+    remaining_in = {}  # {노드: [[수요지 번호, 남은 유량]]}
+    for j, (t, f) in enumerate(zip(sinks.tolist(), received.tolist())):
+        if f > FLOW_EPS:
+            remaining_in.setdefault(t, []).append([j, f])
+
+    routes = []
+    for i, (s, f) in enumerate(zip(sources.tolist(), sent.tolist())):
+        while f > FLOW_EPS:
+            nodes, edges, position = [s], [], {s: 0}
+            while not remaining_in.get(nodes[-1]):
+                arcs = out.get(nodes[-1])
+                if not arcs:
+                    break  # 부동소수 오차로 남은 양
+                (v, e), _ = next(iter(arcs.items()))
+                if v in position:  # 순환은 최소 유량만큼 지우고 되돌아간다.
+                    cut = position[v]
+                    cycle = list(
+                        zip(nodes[cut:], nodes[cut + 1 :] + [v], edges[cut:] + [e])
+                    )
+                    amount = min(out[a][(b, k)] for a, b, k in cycle)
+                    for a, b, k in cycle:
+                        _consume(out, a, b, k, amount)
+                    for node in nodes[cut + 1 :]:
+                        del position[node]
+                    del nodes[cut + 1 :], edges[cut:]
+                    continue
+                position[v] = len(nodes)
+                nodes.append(v)
+                edges.append(e)
+            sinks_here = remaining_in.get(nodes[-1])
+            if not sinks_here:
+                break
+            amount = min(
+                [f, sinks_here[0][1]]
+                + [out[a][(b, k)] for a, b, k in zip(nodes, nodes[1:], edges)]
+            )
+            for a, b, k in zip(nodes, nodes[1:], edges):
+                _consume(out, a, b, k, amount)
+            j = sinks_here[0][0]
+            sinks_here[0][1] -= amount
+            if sinks_here[0][1] <= FLOW_EPS:
+                sinks_here.pop(0)
+            f -= amount
+            routes.append((i, j, amount, nodes, edges))
+    return routes
+
+
+def _consume(out: dict, u: int, v: int, e: int, amount: float) -> None:
+    arcs = out[u]
+    arcs[(v, e)] -= amount
+    if arcs[(v, e)] <= FLOW_EPS:
+        del arcs[(v, e)]
@@ -0,0 +1,713 @@
+import heapq
+import math
+import time
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+SEARCH_MODES = ("dijkstra", "astar", "bidirectional")
+
+
+class SearchStats:
+    """
+    이정현 작성
+    최단 경로 탐색 1회에 대한 통계
+    settled : 확정(방문 완료)된 노드 수
+    pushes : 우선순위 큐에 넣은 횟수
+    wall_time : 탐색 소요 시간 (초)
+    """
+
+    def __init__(self, mode: str = "dijkstra"):
+        self.mode = mode
+        self.settled = 0
+        self.pushes = 0
+        self.wall_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchStats(mode={self.mode!r}, settled={self.settled}, "
+            f"pushes={self.pushes}, wall_time={self.wall_time * 1000:.2f}ms)"
+        )
+
+
+def _as_terminals(nodes) -> dict:
+    """
+    노드 인덱스 하나 또는 {노드: 추가 비용} dict를 dict로 통일
+    """
+    if isinstance(nodes, dict):
+        return {int(k): float(v) for k, v in nodes.items()}
+    return {int(nodes): 0.0}
+
+
+def _trace(prev: dict, node: int, nodes: list, edges: list) -> None:
+    """
+    prev {노드: (이전 노드, 엣지 인덱스)}를 따라가며 nodes, edges에 추가
+    """
+    while node in prev:
+        u, k = prev[node]
+        edges.append(k)
+        node = u
+        nodes.append(node)
+
+
+def shortest_path(graph, sources, targets, mode: str = "dijkstra", stats=None):
+    """
+    이정현 작성
+    graph(RoadGraph)에서 sources → targets 최단 경로 탐색.
+    sources, targets : 노드 인덱스 또는 {노드: 출발/도착 추가 비용} dict
+    mode : "dijkstra" | "astar" (유클리드 거리 휴리스틱) | "bidirectional"
+    stats : SearchStats를 넘기면 탐색 통계를 기록
+    반환 : (비용, 노드 인덱스 리스트, 엣지 인덱스 리스트), 경로가 없으면 (inf, None, None)
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"지원하지 않는 탐색 방식입니다: {mode} {SEARCH_MODES}")
+    if stats is None:
+        stats = SearchStats(mode)
+    sources = _as_terminals(sources)
+    targets = _as_terminals(targets)
+    start_time = time.perf_counter()
+    if mode == "bidirectional":
+        result = _bidirectional(graph, sources, targets, stats)
+    else:
+        heuristic = _euclidean_heuristic(graph, targets) if mode == "astar" else None
+        result = _unidirectional(graph, sources, targets, heuristic, stats)
+    stats.wall_time = time.perf_counter() - start_time
+    return result
+
+
+def _euclidean_heuristic(graph, targets: dict):
+    """
+    A*용 휴리스틱: 가장 가까운 도착 노드까지의 직선거리 × 비용 배율 + 도착 추가 비용.
+    비용 배율(graph.heuristic_scale())은 모든 엣지에서 비용/직선거리의 최솟값이므로
+    휴리스틱이 실제 비용을 넘지 않는다.
+    """
+    coords = graph.coord_list()
+    scale = graph.heuristic_scale()
+    goals = [(coords[t], off) for t, off in targets.items()]
+
+    def heuristic(u: int) -> float:
+        x, y, z = coords[u]
+        return min(
+            scale * math.sqrt((x - g[0]) ** 2 + (y - g[1]) ** 2 + (z - g[2]) ** 2) + off
+            for g, off in goals
+        )
+
+    return heuristic
+
+
+def _unidirectional(graph, sources: dict, targets: dict, heuristic, stats):
+    """
+    단방향 Dijkstra / A*. 방문한 노드만 dict에 기록한다.
+    """
+    offsets, tgts, weights = graph.as_lists()
+    edge_ids = graph.edge_id_list()
+    dist = {}
+    prev = {}
+    settled = set()
+    queue = []
+    for s, off in sources.items():
+        if off < dist.get(s, math.inf):
+            dist[s] = off
+            key = off + heuristic(s) if heuristic else off
+            heapq.heappush(queue, (key, off, s))
+            stats.pushes += 1
+    best, best_node = math.inf, None
+    while queue:
+        key, d, u = heapq.heappop(queue)
+        if key >= best:
+            break  # 남은 후보는 현재 최선 경로보다 짧아질 수 없음
+        if u in settled or d > dist[u]:
+            continue
+        settled.add(u)
+        stats.settled += 1
+        if u in targets and d + targets[u] < best:
+            best, best_node = d + targets[u], u
+        for k in range(offsets[u], offsets[u + 1]):
+            v = tgts[k]
+            alt = d + weights[k]
+            if alt < dist.get(v, math.inf):
+                dist[v] = alt
+                prev[v] = (u, edge_ids[k])
+                key = alt + heuristic(v) if heuristic else alt
+                heapq.heappush(queue, (key, alt, v))
+                stats.pushes += 1
+    if best_node is None:
+        return math.inf, None, None
+    nodes, edges = [best_node], []
+    _trace(prev, best_node, nodes, edges)
+    nodes.reverse()
+    edges.reverse()
+    return best, nodes, edges
+
+
+def _bidirectional(graph, sources: dict, targets: dict, stats):
+    """
+    양방향 Dijkstra. 출발 쪽과 도착 쪽에서 번갈아 확장하고,
+    두 탐색의 큐 최솟값 합이 현재 최선 경로 이상이 되면 종료한다.
+    (도로 그래프는 무방향이므로 역방향 탐색도 같은 인접 배열을 사용)
+    """
+    offsets, tgts, weights = graph.as_lists()
+    edge_ids = graph.edge_id_list()
+    dists = ({}, {})
+    prevs = ({}, {})
+    settled = (set(), set())
+    queues = ([], [])
+    for side, terminals in enumerate((sources, targets)):
+        for node, off in terminals.items():
+            if off < dists[side].get(node, math.inf):
+                dists[side][node] = off
+                heapq.heappush(queues[side], (off, node))
+                stats.pushes += 1
+    best, meet = math.inf, None
+    for node, off in sources.items():
+        if node in targets and off + targets[node] < best:
+            best, meet = off + targets[node], node
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        dist, other = dists[side], dists[1 - side]
+        d, u = heapq.heappop(queues[side])
+        if u in settled[side] or d > dist[u]:
+            continue
+        settled[side].add(u)
+        stats.settled += 1
+        for k in range(offsets[u], offsets[u + 1]):
+            v = tgts[k]
+            alt = d + weights[k]
+            if alt < dist.get(v, math.inf):
+                dist[v] = alt
+                prevs[side][v] = (u, edge_ids[k])
+                heapq.heappush(queues[side], (alt, v))
+                stats.pushes += 1
+                if v in other and alt + other[v] < best:
+                    best, meet = alt + other[v], v
+    if meet is None:
+        return math.inf, None, None
+    nodes, edges = [meet], []
+    _trace(prevs[0], meet, nodes, edges)
+    nodes.reverse()
+    edges.reverse()
+    _trace(prevs[1], meet, nodes, edges)
+    return best, nodes, edges
+
+
+def shortest_path_tree(graph, sources, stats=None):
+    """
+    이정현 작성
+    sources에서 모든 노드까지의 최단 경로 트리 (one-to-all Dijkstra)
+    sources : 노드 인덱스 또는 {노드: 출발 추가 비용} dict
+    반환 : (dist [n], parent [n], parent_edge [n]) numpy 배열
+           도달할 수 없는 노드는 dist = inf, parent = parent_edge = -1
+    """
+    if stats is None:
+        stats = SearchStats("tree")
+    start_time = time.perf_counter()
+    offsets, tgts, weights = graph.as_lists()
+    edge_ids = graph.edge_id_list()
+    n = graph.node_count
+    dist = [math.inf] * n
+    parent = [-1] * n
+    parent_edge = [-1] * n
+    queue = []
+    for s, off in _as_terminals(sources).items():
+        if off < dist[s]:
+            dist[s] = off
+            heapq.heappush(queue, (off, s))
+            stats.pushes += 1
+    while queue:
+        d, u = heapq.heappop(queue)
+        if d > dist[u]:
+            continue
+        stats.settled += 1
+        for k in range(offsets[u], offsets[u + 1]):
+            v = tgts[k]
+            alt = d + weights[k]
+            if alt < dist[v]:
+                dist[v] = alt
+                parent[v] = u
+                parent_edge[v] = edge_ids[k]
+                heapq.heappush(queue, (alt, v))
+                stats.pushes += 1
+    stats.wall_time = time.perf_counter() - start_time
+    return (
+        np.array(dist),
+        np.array(parent, dtype=np.int64),
+        np.array(parent_edge, dtype=np.int64),
+    )
+
+
+def bounded_search(graph, sources, max_cost: float, stats=None) -> dict:
+    """
+    이정현 작성
+    sources에서 비용 max_cost 이내로 도달 가능한 노드만 확정하는 multi-source Dijkstra.
+    max_cost를 넘는 노드는 꺼내는 순간 탐색을 멈추므로 그래프 전체를 방문하지 않는다.
+    sources : 노드 인덱스 또는 {노드: 출발 추가 비용} dict
+    반환 : {노드: 최소 비용}
+    """
+    if stats is None:
+        stats = SearchStats("bounded")
+    start_time = time.perf_counter()
+    offsets, tgts, weights = graph.as_lists()
+    dist = {}
+    queue = []
+    for s, off in _as_terminals(sources).items():
+        if off <= max_cost and off < dist.get(s, math.inf):
+            dist[s] = off
+            heapq.heappush(queue, (off, s))
+            stats.pushes += 1
+    settled = {}
+    while queue:
+        d, u = heapq.heappop(queue)
+        if u in settled:
+            continue
+        settled[u] = d
+        stats.settled += 1
+        for k in range(offsets[u], offsets[u + 1]):
+            v = tgts[k]
+            alt = d + weights[k]
+            if alt <= max_cost and alt < dist.get(v, math.inf):
+                dist[v] = alt
+                heapq.heappush(queue, (alt, v))
+                stats.pushes += 1
+    stats.wall_time = time.perf_counter() - start_time
+    return settled
+
+
+def _time_dependent(graph, sources: dict, targets: dict, depart, rows, speed, stats):
+    """
+    시간 의존 Dijkstra. 라벨은 출발 후 경과 시간(초)이고,
+    엣지 비용은 그 엣지에 들어서는 시각의 배율(정시 값 선형 보간) × 기본 비용 / speed.
+    rows : 엣지별 24시간 배율 리스트 (factors.T.tolist())
+    """
+    offsets, tgts, weights = graph.as_lists()
+    edge_ids = graph.edge_id_list()
+    dist = {}
+    prev = {}
+    settled = set()
+    queue = []
+    for s, off in sources.items():
+        if off / speed < dist.get(s, math.inf):
+            dist[s] = off / speed
+            heapq.heappush(queue, (off / speed, s))
+            stats.pushes += 1
+    best, best_node = math.inf, None
+    while queue:
+        d, u = heapq.heappop(queue)
+        if d >= best:
+            break
+        if u in settled:
+            continue
+        settled.add(u)
+        stats.settled += 1
+        if u in targets and d + targets[u] / speed < best:
+            best, best_node = d + targets[u] / speed, u
+        hour = (depart + d / 3600.0) % 24
+        lo = int(hour)
+        frac = hour - lo
+        hi = (lo + 1) % 24
+        for k in range(offsets[u], offsets[u + 1]):
+            row = rows[edge_ids[k]]
+            factor = row[lo] + (row[hi] - row[lo]) * frac
+            alt = d + weights[k] * factor / speed
+            if alt < dist.get(tgts[k], math.inf):
+                v = tgts[k]
+                dist[v] = alt
+                prev[v] = (u, edge_ids[k])
+                heapq.heappush(queue, (alt, v))
+                stats.pushes += 1
+    if best_node is None:
+        return math.inf, None, None
+    nodes, edges = [best_node], []
+    _trace(prev, best_node, nodes, edges)
+    nodes.reverse()
+    edges.reverse()
+    return best, nodes, edges
+
+
+def time_dependent_path(
+    graph, sources, targets, depart: float, factors, speed: float = 1.0, stats=None
+):
+    """
+    이정현 작성
+    출발 시각 depart(시, 소수 가능)에 sources를 떠나 targets에 가장 빨리 도착하는 경로
+    factors [24, m] : 엣지별 시간대 비용 배율 (CongestionProfile.edge_factors)
+    speed : 초당 이동하는 기본 비용 (비용이 길이(m)이면 보행 속도 m/s)
+    sources, targets의 추가 비용은 배율 없이 시간으로 환산한다.
+    반환 : (소요 시간(초), 노드 인덱스 리스트, 엣지 인덱스 리스트), 경로가 없으면 (inf, None, None)
+    """
+    return departure_sweep(graph, sources, targets, [depart], factors, speed, stats)[0]
+
+
+def departure_sweep(
+    graph, sources, targets, departs, factors, speed: float = 1.0, stats=None
+) -> list:
+    """
+    이정현 작성
+    여러 출발 시각에 대한 time_dependent_path() 결과 목록.
+    배율 표를 한 번만 리스트로 바꿔 모든 출발 시각에 재사용한다.
+    """
+    if stats is None:
+        stats = SearchStats("time")
+    start_time = time.perf_counter()
+    factors = np.asarray(factors).reshape(24, graph.edge_count)
+    rows = factors.T.tolist()
+    sources = _as_terminals(sources)
+    targets = _as_terminals(targets)
+    results = [
+        _time_dependent(graph, sources, targets, float(t), rows, speed, stats)
+        for t in departs
+    ]
+    stats.wall_time = time.perf_counter() - start_time
+    return results
+
+
+_pool_graph = None
+
+
+def _init_pool(graph) -> None:
+    global _pool_graph
+    _pool_graph = graph
+
+
+def _matrix_rows(args) -> np.ndarray:
+    """
+    프로세스 풀 작업 단위: 출발 노드 묶음에 대한 거리 행렬 행들
+    """
+    source_nodes, target_nodes = args
+    rows = np.empty((len(source_nodes), len(target_nodes)))
+    for i, s in enumerate(source_nodes):
+        rows[i] = shortest_path_tree(_pool_graph, int(s))[0][target_nodes]
+    return rows
+
+
+def distance_matrix(graph, source_nodes, target_nodes, processes: int = None):
+    """
+    이정현 작성
+    출발 노드 × 도착 노드 최단 거리 행렬 (도달 불가는 inf)
+    서로 다른 출발 노드마다 one-to-all 트리를 한 번만 계산해서 모든 도착 노드에 재사용한다.
+    processes : 2 이상이면 출발 노드를 나누어 프로세스 풀에서 병렬 계산
+    """
+    source_nodes = np.asarray(source_nodes, dtype=np.int64).reshape(-1)
+    target_nodes = np.asarray(target_nodes, dtype=np.int64).reshape(-1)
+    unique_sources, inverse = np.unique(source_nodes, return_inverse=True)
+    if processes and processes > 1 and len(unique_sources) > 1:
+        chunks = np.array_split(unique_sources, min(processes * 4, len(unique_sources)))
+        with ProcessPoolExecutor(
+            processes, initializer=_init_pool, initargs=(graph,)
+        ) as pool:
+            rows = np.vstack(
+                list(pool.map(_matrix_rows, [(c, target_nodes) for c in chunks]))
+            )
+    else:
+        _init_pool(graph)
+        rows = _matrix_rows((unique_sources, target_nodes))
+    return rows[inverse.reshape(-1)]
+
+
+class ShortestPathTree:
+    """
+    이정현 작성
+    하나의 출발 조건(sources)에 대한 one-to-all 최단 경로 트리.
+    경로는 parent 포인터를 따라가기만 하면 되고,
+    엣지 비용이 바뀌면 repair()로 영향받는 부분만 다시 계산한다.
+    """
+
+    def __init__(self, graph, sources, stats=None):
+        self.sources = _as_terminals(sources)
+        self.dist, self.parent, self.parent_edge = shortest_path_tree(
+            graph, self.sources, stats
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.dist.nbytes + self.parent.nbytes + self.parent_edge.nbytes
+
+    def path_to(self, node: int):
+        """
+        이정현 작성
+        출발 조건에서 node까지의 (비용, 노드 리스트, 엣지 리스트), 도달 불가면 (inf, None, None)
+        """
+        cost = float(self.dist[node])
+        if not math.isfinite(cost):
+            return math.inf, None, None
+        nodes, edges = [node], []
+        while self.parent[node] >= 0:
+            edges.append(int(self.parent_edge[node]))
+            node = int(self.parent[node])
+            nodes.append(node)
+        nodes.reverse()
+        edges.reverse()
+        return cost, nodes, edges
+
+    def repair(self, graph, edges, stats=None) -> int:
+        """
+        이정현 작성
+        graph의 edges 비용이 이미 바뀐 상태에서 트리를 부분적으로 다시 계산.
+        1) 비용이 늘어난 트리 엣지 아래의 서브트리만 초기화하고
+        2) 서브트리 경계와 비용이 줄어든 엣지에서 Dijkstra를 다시 시작한다.
+        반환 : 거리가 다시 계산된 노드 수
+        """
+        if stats is None:
+            stats = SearchStats("repair")
+        start_time = time.perf_counter()
+        offsets, tgts, weights = graph.as_lists()
+        edge_ids = graph.edge_id_list()
+        dist, parent, parent_edge = self.dist, self.parent, self.parent_edge
+        costs = graph.edge_costs()
+
+        # 1. 바뀐 엣지가 트리 엣지이고 비용이 늘어났다면 그 아래 서브트리 전체를 무효화
+        roots = []
+        for e in set(int(e) for e in np.atleast_1d(edges)):
+            for child in graph.edges[e].tolist():
+                if parent_edge[child] == e and (
+                    dist[parent[child]] + costs[e] > dist[child]
+                ):
+                    roots.append(child)
+        affected = set(roots)
+        stack = list(roots)
+        while stack:  # 그래프 인접 배열에서 parent가 u인 노드만 따라 내려감
+            u = stack.pop()
+            for k in range(offsets[u], offsets[u + 1]):
+                v = tgts[k]
+                if (
+                    v not in affected
+                    and parent[v] == u
+                    and parent_edge[v] == edge_ids[k]
+                ):
+                    affected.add(v)
+                    stack.append(v)
+        for v in affected:
+            dist[v] = self.sources.get(v, math.inf)
+            parent[v] = -1
+            parent_edge[v] = -1
+
+        # 2. 다시 계산을 시작할 후보: 무효화된 노드의 바깥 이웃, 비용이 줄어든 엣지
+        queue = [(dist[v], v) for v in affected if math.isfinite(dist[v])]
+        for v in affected:
+            for k in range(offsets[v], offsets[v + 1]):
+                w = tgts[k]
+                alt = dist[w] + weights[k]
+                if w not in affected and alt < dist[v]:
+                    dist[v] = alt
+                    parent[v] = w
+                    parent_edge[v] = edge_ids[k]
+                    queue.append((alt, v))
+        for e in set(int(e) for e in np.atleast_1d(edges)):
+            a, b = graph.edges[e].tolist()
+            for x, y in ((a, b), (b, a)):
+                alt = dist[x] + costs[e]
+                if alt < dist[y]:
+                    dist[y] = alt
+                    parent[y] = x
+                    parent_edge[y] = e
+                    queue.append((alt, y))
+        heapq.heapify(queue)
+        stats.pushes += len(queue)
+
+        # 3. 후보에서 시작하는 Dijkstra (거리가 실제로 줄어드는 노드만 방문)
+        touched = set(affected)
+        while queue:
+            d, u = heapq.heappop(queue)
+            if d > dist[u]:
+                continue
+            stats.settled += 1
+            touched.add(u)
+            for k in range(offsets[u], offsets[u + 1]):
+                v = tgts[k]
+                alt = d + weights[k]
+                if alt < dist[v]:
+                    dist[v] = alt
+                    parent[v] = u
+                    parent_edge[v] = edge_ids[k]
+                    heapq.heappush(queue, (alt, v))
+                    stats.pushes += 1
+        stats.wall_time = time.perf_counter() - start_time
+        return len(touched)
+
+
+class TreeCache:
+    """
+    이정현 작성
+    출발 노드별 ShortestPathTree를 보관하는 LRU 캐시.
+    트리 배열의 총 메모리(nbytes)가 max_bytes를 넘으면 가장 오래 쓰지 않은 트리부터 버린다.
+    hits / misses / evictions : 캐시 적중, 미적중, 제거 횟수
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._trees = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def __contains__(self, source: int) -> bool:
+        return int(source) in self._trees
+
+    def __repr__(self) -> str:
+        return (
+            f"TreeCache(trees={len(self)}, nbytes={self.nbytes}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+    def values(self):
+        return self._trees.values()
+
+    def get(self, graph, source: int, stats=None) -> ShortestPathTree:
+        """
+        이정현 작성
+        source 노드의 트리 반환 (없으면 graph에서 계산해 넣고, 넘치면 오래된 트리 제거)
+        """
+        source = int(source)
+        tree = self._trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(source)
+            return tree
+        self.misses += 1
+        tree = ShortestPathTree(graph, source, stats)
+        self._trees[source] = tree
+        self.nbytes += tree.nbytes
+        # 방금 만든 트리는 max_bytes보다 크더라도 이번 질의에는 쓰이도록 남겨 둔다.
+        while self.nbytes > self.max_bytes and len(self._trees) > 1:
+            _, old = self._trees.popitem(last=False)
+            self.nbytes -= old.nbytes
+            self.evictions += 1
+        return tree
+
+    def clear(self) -> None:
+        self._trees.clear()
+        self.nbytes = 0
+
+
+def _spur_search(
+    graph, spur, tree_lists, blocked_nodes, blocked_edges, max_cost, stats
+):
+    """
+    Yen 알고리즘의 spur 탐색: 도착 노드를 루트로 한 최단 경로 트리 거리를 휴리스틱으로 쓰는 A*.
+    트리 거리는 막힌 노드/엣지가 없을 때의 정확한 남은 거리이므로,
+    꺼낸 노드의 트리 경로(parent 포인터)가 막힌 곳을 지나지 않으면 그 경로가 곧 최단 경로다.
+    반환 : (spur → 도착 비용, 노드 리스트, 엣지 리스트), max_cost 이하 경로가 없으면 (inf, None, None)
+    """
+    offsets, tgts, weights = graph.as_lists()
+    edge_ids = graph.edge_id_list()
+    h, parent, parent_edge = tree_lists
+    if h[spur] == math.inf:
+        return math.inf, None, None
+    dist = {spur: 0.0}
+    prev = {}
+    settled = set()
+    queue = [(h[spur], 0.0, spur)]
+    stats.pushes += 1
+    while queue:
+        key, d, u = heapq.heappop(queue)
+        if key > max_cost:
+            break
+        if u in settled or d > dist[u]:
+            continue
+        settled.add(u)
+        stats.settled += 1
+        # 트리 경로가 막힌 노드/엣지를 피해 가는지 확인
+        node, clear = u, True
+        while parent[node] >= 0:
+            if parent_edge[node] in blocked_edges or parent[node] in blocked_nodes:
+                clear = False
+                break
+            node = parent[node]
+        if clear:
+            nodes, edges = [u], []
+            _trace(prev, u, nodes, edges)
+            nodes.reverse()
+            edges.reverse()
+            node = u
+            while parent[node] >= 0:
+                edges.append(parent_edge[node])
+                node = parent[node]
+                nodes.append(node)
+            return key, nodes, edges
+        for k in range(offsets[u], offsets[u + 1]):
+            v = tgts[k]
+            if v in blocked_nodes or (u == spur and edge_ids[k] in blocked_edges):
+                continue
+            alt = d + weights[k]
+            if alt < dist.get(v, math.inf) and h[v] < math.inf:
+                dist[v] = alt
+                prev[v] = (u, edge_ids[k])
+                heapq.heappush(queue, (alt + h[v], alt, v))
+                stats.pushes += 1
+    return math.inf, None, None
+
+
+def k_shortest_paths(graph, source: int, target: int, k: int, tree=None, stats=None):
+    """
+    이정현 작성
+    source → target 사이 서로 다른 단순(loopless) 경로를 비용 순서로 최대 k개 (Yen 알고리즘)
+    tree : target을 루트로 한 ShortestPathTree (없으면 계산), 모든 spur 탐색이 이 트리를 공유한다.
+           도로 그래프는 무방향이라 트리 거리가 곧 각 노드에서 target까지의 남은 거리이므로
+           spur 탐색은 이를 정확한 휴리스틱으로 쓰는 A*가 되고, 트리 경로가 막히지 않은 노드에서 바로 끝난다.
+           또 후보가 충분히 모이면 (루트 비용 + 남은 거리)가 k번째 후보보다 큰 spur는 탐색하지 않는다.
+    반환 : [(비용, 노드 리스트, 엣지 리스트)], 경로가 없으면 빈 리스트
+    """
+    if stats is None:
+        stats = SearchStats("yen")
+    start_time = time.perf_counter()
+    source, target = int(source), int(target)
+    if tree is None:
+        tree = ShortestPathTree(graph, target, stats)
+    tree_lists = (tree.dist.tolist(), tree.parent.tolist(), tree.parent_edge.tolist())
+    cost, nodes, edges = tree.path_to(source)
+    if nodes is None:
+        stats.wall_time = time.perf_counter() - start_time
+        return []
+    # target에서 source로 가는 트리 경로를 뒤집어 source → target 방향으로
+    paths = [(cost, nodes[::-1], edges[::-1])]
+    edge_costs = graph.edge_costs().tolist()
+    candidates = []
+    seen = {tuple(paths[0][2])}
+    while len(paths) < k:
+        _, last_nodes, last_edges = paths[-1]
+        root_cost = 0.0
+        for i, spur in enumerate(last_nodes[:-1]):
+            root_nodes = last_nodes[: i + 1]
+            needed = k - len(paths)
+            if len(candidates) >= needed:
+                bound = heapq.nsmallest(needed, candidates)[-1][0]
+            else:
+                bound = math.inf
+            if root_cost + tree_lists[0][spur] <= bound:
+                blocked_edges = {
+                    p_edges[i]
+                    for _, p_nodes, p_edges in paths
+                    if len(p_edges) > i and p_nodes[: i + 1] == root_nodes
+                }
+                spur_cost, spur_nodes, spur_edges = _spur_search(
+                    graph,
+                    spur,
+                    tree_lists,
+                    set(root_nodes[:-1]),
+                    blocked_edges,
+                    bound - root_cost,
+                    stats,
+                )
+                if spur_nodes is not None:
+                    total_edges = last_edges[:i] + spur_edges
+                    if tuple(total_edges) not in seen:
+                        seen.add(tuple(total_edges))
+                        heapq.heappush(
+                            candidates,
+                            (
+                                root_cost + spur_cost,
+                                root_nodes[:-1] + spur_nodes,
+                                total_edges,
+                            ),
+                        )
+            root_cost += edge_costs[last_edges[i]]
+        if not candidates:
+            break
+        paths.append(heapq.heappop(candidates))
+    stats.wall_time = time.perf_counter() - start_time
+    return paths
@@ -1,6 +1,70 @@
 import Rhino.Geometry as geo
-import heapq
+import numpy as np
+import os
+import ewha_utils.congestion as congestion
+import ewha_utils.contraction as contraction
+import ewha_utils.flow as flow
+import ewha_utils.graph_search as graph_search
 import ewha_utils.raw_utils as raw_utils
+import ewha_utils.road_graph as road_graph
+import ewha_utils.safety as safety
+import ewha_utils.spatial_index as spatial_index
+import ewha_utils.viewshed as viewshed
+
+# PathFinder가 지원하는 탐색 방식 (graph_search의 방식 + CH / 캐시 트리 / 시간 의존)
+ROUTE_MODES = graph_search.SEARCH_MODES + ("ch", "tree", "time")
+
+
+def _as_xyz(points) -> np.ndarray:
+    """
+    이정현 작성
+    Point3d 리스트(또는 좌표 튜플 리스트)를 (n, 3) numpy 배열로 변환
+    """
+    rows = []
+    for pt in points:
+        if hasattr(pt, "X"):
+            rows.append((pt.X, pt.Y, pt.Z))
+        else:
+            rows.append((pt[0], pt[1], pt[2] if len(pt) > 2 else 0.0))
+    return np.array(rows, dtype=float).reshape(-1, 3)
+
+
+def _capsule(start, end, radius: float, count: int = 8) -> np.ndarray:
+    """
+    이정현 작성
+    선분 start-end를 radius만큼 두껍게 한 캡슐 모양 닫힌 폴리라인 점 배열 (xy 평면)
+    count : 반원 하나를 나누는 개수
+    """
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    angle = np.arctan2(dy, dx) if dx or dy else 0.0
+    half = np.linspace(-np.pi / 2, np.pi / 2, count + 1)
+    arcs = []
+    for center, base in ((end, angle), (start, angle + np.pi)):
+        arcs.append(
+            np.column_stack(
+                [
+                    center[0] + radius * np.cos(base + half),
+                    center[1] + radius * np.sin(base + half),
+                    np.full(count + 1, center[2]),
+                ]
+            )
+        )
+    ring = np.vstack(arcs)
+    return np.vstack([ring, ring[:1]])
+
+
+def _polyline_curve(points) -> geo.PolylineCurve:
+    """
+    이정현 작성
+    연속으로 겹치는 점을 제거한 뒤 PolylineCurve 생성
+    """
+    cleaned = [points[0]]
+    for pt in points[1:]:
+        if pt.DistanceTo(cleaned[-1]) > 1e-9:
+            cleaned.append(pt)
+    if len(cleaned) == 1:
+        cleaned.append(cleaned[0])
+    return geo.PolylineCurve(geo.Polyline(cleaned))
 
 
 class PathFinder:
@@ -11,22 +75,445 @@ class PathFinder:
     설정한 시작점과 끝점 간의 최단 경로를 Dijkstra 알고리즘으로 탐색하는 클래스.
     """
 
-    def __init__(self, road_crvs):
+    def __init__(
+        self,
+        road_crvs=None,
+        graph: "road_graph.RoadGraph" = None,
+        planarize: bool = False,
+        simplify: bool = False,
+        tree_cache_bytes: int = 64 * 2**20,
+    ):
         """
         이정현 작성
         클래스 초기화 함수
+        road_crvs [geo.PolylineCurve] : 도로 중심선
+        graph : 미리 만들어 두었거나 파일에서 불러온 RoadGraph (주어지면 road_crvs 무시)
+        planarize : 꼭짓점을 공유하지 않고 교차하는 중심선도 교차점에서 연결
+        simplify : 이웃이 2개인 꼭짓점 사슬을 하나의 엣지로 합쳐 그래프를 줄임
+                   (경로는 원래 꼭짓점을 모두 포함해서 반환, 노드 스냅은 교차점에만 되므로
+                    process(..., snap="edge")와 함께 쓰는 것을 권장)
+        tree_cache_bytes : 출발 노드별 최단 경로 트리 캐시의 최대 메모리 (바이트)
+        """
+        if graph is None:
+            if road_crvs is None:
+                raise ValueError("road_crvs 또는 graph 중 하나는 입력해야 합니다.")
+            all_lines = []
+            for crv in road_crvs:
+                all_lines += raw_utils.polylinecurve_to_lines(crv)
+            graph = road_graph.RoadGraph.from_segments(
+                _as_xyz([line.From for line in all_lines]),
+                _as_xyz([line.To for line in all_lines]),
+                planarize=planarize,
+            )
+        if simplify:
+            graph = graph.simplify()
+        self.graph = graph
+        self.hierarchy = None  # prepare_hierarchy()로 생성하는 Contraction Hierarchy
+        # 출발 노드별 최단 경로 트리 LRU 캐시 (mode="tree", 캐시된 출발점의 반복 질의)
+        self.trees = graph_search.TreeCache(tree_cache_bytes)
+        # True면 mode="dijkstra"도 출발 노드 트리가 모두 캐시에 있을 때 트리로 답함
+        self.reuse_trees = False
+        self.last_stats = None  # 마지막 탐색의 SearchStats
+        # set_congestion()으로 만드는 시간대별 엣지 비용 배율 [24, m] (mode="time")
+        self.congestion_factors = None
+        self.speed = 1.0
+        self._unique_points = None
+        self._segment_index = None
+        # 시작점/끝점 스냅용 공간 인덱스는 한 번만 생성해 둔다.
+        self.point_index = spatial_index.PointIndex(self.graph.coords)
+        # 연결 요소를 미리 계산해서 서로 닿지 않는 출발/도착 쌍은 탐색 없이 걸러낸다.
+        self.graph.components()
+
+    @classmethod
+    def from_geojson(
+        cls,
+        data,
+        precision: int = 4,
+        planarize: bool = False,
+        simplify: bool = False,
+    ) -> "PathFinder":
+        """
+        이정현 작성
+        GeoJSON(dict 또는 파일 경로)의 도로 중심선으로 바로 PathFinder 생성
+        (geojson_to_rhino_geometry로 커브를 만들지 않고 좌표 배열로 그래프를 구성)
         """
-        all_lines = []
-        for crv in road_crvs:
-            all_lines += raw_utils.polylinecurve_to_lines(crv)
-        all_points = []
-        for crv in road_crvs:
-            all_points += raw_utils.get_vertices(crv)
-        self.unique_points, self.adjacency = self.analyze_road_data(
-            all_points, all_lines
+        return cls(
+            graph=road_graph.RoadGraph.from_geojson(data, precision, planarize),
+            simplify=simplify,
         )
 
-    def process(self, start_pt, end_pt):
+    @property
+    def unique_points(self):
+        """
+        이정현 작성
+        그래프 노드 좌표의 Point3d 리스트 (필요할 때 한 번만 생성)
+        """
+        if self._unique_points is None:
+            self._unique_points = [
+                geo.Point3d(x, y, z) for x, y, z in self.graph.coords.tolist()
+            ]
+        return self._unique_points
+
+    @property
+    def adjacency(self):
+        """
+        이정현 작성
+        기존 형식의 인접 리스트 {노드: [(인접 노드, 길이)]} (호환용)
+        """
+        return self.graph.to_adjacency()
+
+    @staticmethod
+    def _hierarchy_path(path: str) -> str:
+        """
+        이정현 작성
+        그래프 저장 경로 옆에 둘 CH 파일 경로
+        """
+        if path.endswith(".npz"):
+            return path[: -len(".npz")] + ".ch.npz"
+        return os.path.join(path, "hierarchy.npz")
+
+    def save(self, path: str) -> None:
+        """
+        이정현 작성
+        도로 그래프를 파일(.npz) 또는 폴더(.npy 모음)로 저장
+        CH가 준비되어 있으면 같은 위치에 함께 저장한다.
+        """
+        self.graph.save(path)
+        if self.hierarchy is not None:
+            self.hierarchy.save(self._hierarchy_path(path))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "PathFinder":
+        """
+        이정현 작성
+        save()로 저장한 도로 그래프로 PathFinder 생성 (Grasshopper 재계산 시 재사용)
+        """
+        finder = cls(graph=road_graph.RoadGraph.load(path, mmap=mmap))
+        hierarchy_path = cls._hierarchy_path(path)
+        if os.path.exists(hierarchy_path):
+            finder.hierarchy = contraction.ContractionHierarchy.load(hierarchy_path)
+        return finder
+
+    def prepare_hierarchy(
+        self, settle_limit: int = 200
+    ) -> "contraction.ContractionHierarchy":
+        """
+        이정현 작성
+        같은 도로망에 반복 질의할 때 사용하는 Contraction Hierarchy 전처리
+        이후 get_path / process에서 mode="ch"로 사용
+        """
+        self.hierarchy = contraction.ContractionHierarchy.build(
+            self.graph, settle_limit
+        )
+        return self.hierarchy
+
+    def snap(self, points) -> np.ndarray:
+        """
+        이정현 작성
+        여러 점을 한 번에 가장 가까운 노드(unique_points)의 인덱스 배열로 변환
+        points [geo.Point3d] : 스냅할 점들 (좌표 튜플도 가능)
+        """
+        _, indices = self.point_index.query(_as_xyz(points))
+        return indices
+
+    @property
+    def segment_index(self) -> "spatial_index.SegmentTree":
+        """
+        이정현 작성
+        도로 엣지 선분에 대한 R-tree (엣지 스냅을 처음 사용할 때 한 번 생성)
+        """
+        if self._segment_index is None:
+            starts, ends, seg_edge, seg_offset = self.graph.edge_segments()
+            self._segment_index = spatial_index.SegmentTree(starts, ends)
+            self._segment_edge = seg_edge
+            self._segment_offset = seg_offset
+        return self._segment_index
+
+    def snap_to_edge(self, points) -> list:
+        """
+        이정현 작성
+        여러 점을 가장 가까운 도로 엣지 위로 수직 투영
+        points [geo.Point3d] : 스냅할 점들 (좌표 튜플도 가능)
+        반환 : [(엣지 인덱스, 엣지 시작 노드로부터의 거리, 투영점 geo.Point3d)]
+        """
+        tree = self.segment_index
+        result = []
+        for xyz in _as_xyz(points):
+            seg, t, projected, _ = tree.nearest(xyz)
+            seg_length = np.linalg.norm(tree.ends[seg] - tree.starts[seg])
+            along = float(self._segment_offset[seg] + t * seg_length)
+            result.append(
+                (int(self._segment_edge[seg]), along, geo.Point3d(*projected))
+            )
+        return result
+
+    def _edge_terminal(self, edge: int, along: float) -> dict:
+        """
+        이정현 작성
+        엣지 위의 임시(virtual) 노드를 {양 끝 노드: 그 노드까지의 비용}으로 표현
+        그래프 자체는 수정하지 않고 탐색의 출발/도착 조건으로만 사용한다.
+        """
+        u, v = self.graph.edges[edge].tolist()
+        length = self.graph.lengths[edge]
+        cost = self.graph.edge_costs()[edge]
+        if not np.isfinite(cost):
+            cost = (
+                length  # 차단된 엣지 위의 점은 가까운 끝 노드까지 걸어 나간다고 본다.
+            )
+        ratio = along / length if length > 0 else 0.0
+        return {u: ratio * cost, v: (1.0 - ratio) * cost}
+
+    def _route(self, sources, targets, mode: str, depart: float = None):
+        """
+        이정현 작성
+        mode에 맞는 탐색기로 최단 경로 계산 후 self.last_stats에 통계 저장
+        depart : mode="time"일 때 출발 시각 (시)
+        반환 : (비용, 노드 인덱스 리스트, 엣지 인덱스 리스트)
+        """
+        if mode not in ROUTE_MODES:
+            raise ValueError(f"지원하지 않는 탐색 방식입니다: {mode} {ROUTE_MODES}")
+        self.last_stats = graph_search.SearchStats(mode)
+        if not self.graph.connected(
+            graph_search._as_terminals(sources), graph_search._as_terminals(targets)
+        ):
+            return np.inf, None, None  # 서로 다른 연결 요소
+        if mode == "ch":
+            if self.hierarchy is None:
+                self.prepare_hierarchy()
+            return self.hierarchy.query(sources, targets, self.last_stats)
+        if mode == "time":
+            return graph_search.time_dependent_path(
+                self.graph,
+                sources,
+                targets,
+                self._depart(depart),
+                self._congestion_factors(),
+                self.speed,
+                self.last_stats,
+            )
+        if mode == "tree" or (
+            mode == "dijkstra"
+            and self.reuse_trees
+            and all(s in self.trees for s in graph_search._as_terminals(sources))
+        ):
+            # 출발 노드의 트리가 이미 캐시에 있으면 탐색 없이 parent 포인터만 따라간다.
+            return self._route_on_trees(sources, targets)
+        return graph_search.shortest_path(
+            self.graph, sources, targets, mode, self.last_stats
+        )
+
+    def compute_safety(
+        self,
+        cctvs=(),
+        obstacles=(),
+        sidewalks=(),
+        cvs_list=(),
+        police_list=(),
+        spacing: float = 10.0,
+        tol: float = 0.01,
+        obstacle_index=None,
+    ) -> np.ndarray:
+        """
+        이정현 작성
+        raw_utils.check_point_safety와 같은 기준의 안전 점수를 도로 엣지마다 한 번 계산해서
+        graph.edge_data["safety"]에 저장 (엣지를 spacing 간격으로 표본 추출해 길이 가중 평균)
+        cctvs, cvs_list, police_list [geo.Point3d] / obstacles [geo.Curve] / sidewalks [닫힌 geo.Curve]
+        저장한 점수는 save()로 그래프와 함께 저장되고 set_safety_weight()에서 재사용한다.
+        obstacle_index : raw_utils.obstacle_index(obstacles)로 이미 만든 선분 인덱스
+        """
+        scores = safety.edge_safety(
+            self.graph,
+            spacing,
+            cctvs=_as_xyz(cctvs),
+            obstacles=[raw_utils.get_vertex_array(crv, tol) for crv in obstacles],
+            sidewalks=[
+                raw_utils.get_vertex_array(crv, tol)
+                for crv in sidewalks
+                if isinstance(crv, geo.Curve) and crv.IsClosed
+            ],
+            cvs=_as_xyz(cvs_list),
+            police=_as_xyz(police_list),
+            obstacle_index=obstacle_index,
+        )
+        self.graph.set_edge_data("safety", scores)
+        return scores
+
+    def set_safety_weight(self, weight: float, full_score: float = None) -> None:
+        """
+        이정현 작성
+        탐색 비용을 길이와 안전 점수의 혼합으로 설정 (점수는 다시 계산하지 않음)
+        비용 = 길이 × (1 + weight × 위험도), 위험도 = 1 - min(안전 점수 / full_score, 1)
+        weight : 0이면 최단 거리, 클수록 안전한 길로 돌아감 (1이면 위험한 길을 최대 2배 길게 봄)
+        full_score : 위험도 0으로 보는 점수 (기본값은 엣지 안전 점수 최댓값)
+        차단한 엣지는 차단 상태를 유지하고, reweight_edges()로 바꾼 비용은 덮어쓴다.
+        """
+        if "safety" not in self.graph.edge_data:
+            raise ValueError("compute_safety()로 안전 점수를 먼저 계산해야 합니다.")
+        scores = np.asarray(self.graph.edge_data["safety"], dtype=float)
+        if full_score is None:
+            full_score = float(scores.max()) if len(scores) else 0.0
+        if full_score > 0:
+            risk = 1 - np.clip(scores / full_score, 0, 1)
+        else:
+            risk = np.ones_like(scores)
+        costs = self.graph.lengths * (1 + weight * risk)
+        disabled = self.graph.disabled
+        for e in disabled:
+            disabled[e] = float(costs[e])  # 복구할 때 새 비용으로 돌아오도록
+        active = np.array(
+            [e for e in range(self.graph.edge_count) if e not in disabled],
+            dtype=np.int64,
+        )
+        self.graph.set_edge_costs(active, costs[active])
+        # 모든 비용이 바뀌었으므로 캐시된 트리와 CH는 복구하지 않고 버린다.
+        self.trees.clear()
+        self.hierarchy = None
+
+    def set_congestion(
+        self, profile, radius: float = 300.0, alpha: float = 1.0, speed: float = 1.2
+    ) -> None:
+        """
+        이정현 작성
+        역별 시간대 혼잡도로 시간 의존 탐색(mode="time")용 엣지 비용 배율 표 생성
+        profile : congestion.CongestionProfile 또는 그 JSON (dict / 파일 경로)
+        radius : 역 혼잡도가 영향을 주는 거리, alpha : 최대 혼잡일 때 추가되는 비용 비율
+        speed : 초당 이동 거리 (기본 보행 속도 1.2 m/s), mode="time"의 비용은 초 단위
+        """
+        if not isinstance(profile, congestion.CongestionProfile):
+            profile = congestion.CongestionProfile.from_json(profile)
+        self.congestion = profile
+        self.congestion_factors = profile.edge_factors(self.graph, radius, alpha)
+        self.speed = speed
+
+    def _congestion_factors(self) -> np.ndarray:
+        """
+        이정현 작성
+        set_congestion()으로 만든 엣지별 시간대 혼잡 계수 (없으면 ValueError)
+        """
+        if self.congestion_factors is None:
+            raise ValueError("mode='time'은 set_congestion()을 먼저 호출해야 합니다.")
+        return self.congestion_factors
+
+    @staticmethod
+    def _depart(depart) -> float:
+        """
+        이정현 작성
+        mode='time' 탐색의 출발 시각(시) 확인 (없으면 ValueError)
+        """
+        if depart is None:
+            raise ValueError("mode='time'은 출발 시각 depart(시)가 필요합니다.")
+        return float(depart)
+
+    def departure_sweep(self, start_pt, end_pt, hours=range(24), snap="node"):
+        """
+        이정현 작성
+        여러 출발 시각(시)에 대한 start_pt → end_pt 시간 의존 최단 경로를 한 번에 계산
+        (스냅과 배율 표는 한 번만 준비하고 그래프는 다시 만들지 않음)
+        반환 : (소요 시간(초) 배열 [len(hours)], 경로 PolylineCurve 리스트 (없으면 None))
+        """
+        if snap == "edge":
+            start, end = self.snap_to_edge([start_pt, end_pt])
+            sources = self._edge_terminal(start[0], start[1])
+            targets = self._edge_terminal(end[0], end[1])
+        else:
+            sources, targets = (int(i) for i in self.snap([start_pt, end_pt]))
+        self.last_stats = graph_search.SearchStats("time")
+        results = graph_search.departure_sweep(
+            self.graph,
+            sources,
+            targets,
+            list(hours),
+            self._congestion_factors(),
+            self.speed,
+            self.last_stats,
+        )
+        curves = []
+        for _, path_indices, path_edges in results:
+            if path_indices is None:
+                curves.append(None)
+            elif snap == "edge":
+                curves.append(
+                    self._edge_path_curve(start, end, path_indices, path_edges)
+                )
+            else:
+                curves.append(
+                    _polyline_curve(self._path_points(path_indices, path_edges))
+                )
+        return np.array([r[0] for r in results]), curves
+
+    def shortest_path_tree(self, source_idx: int) -> "graph_search.ShortestPathTree":
+        """
+        이정현 작성
+        source_idx 노드에서 시작하는 최단 경로 트리 (캐시에 없으면 계산 후 저장)
+        """
+        return self.trees.get(self.graph, source_idx, self.last_stats)
+
+    def _route_on_trees(self, sources, targets):
+        """
+        이정현 작성
+        출발 노드별 캐시된 최단 경로 트리에서 parent 포인터만 따라가 경로 계산
+        """
+        sources = graph_search._as_terminals(sources)
+        targets = graph_search._as_terminals(targets)
+        best = (np.inf, None, None)
+        for s, s_off in sources.items():
+            tree = self.shortest_path_tree(s)
+            for t, t_off in targets.items():
+                cost = s_off + tree.dist[t] + t_off
+                if cost < best[0]:
+                    best = (cost, tree, t)
+        cost, tree, t = best
+        if tree is None:
+            return np.inf, None, None
+        _, nodes, edges = tree.path_to(t)
+        return float(cost), nodes, edges
+
+    def component_sizes(self) -> np.ndarray:
+        """
+        이정현 작성
+        도로 그래프 연결 요소별 노드 수 (큰 순서)
+        요소가 여러 개로 잘게 나뉘어 있으면 GeoJSON 중심선이 끊겨 있다는 뜻이므로
+        planarize=True나 데이터 보정을 검토한다.
+        """
+        return np.sort(self.graph.component_sizes())[::-1]
+
+    def disable_edges(self, edges) -> None:
+        """
+        이정현 작성
+        도로 엣지 통행 차단 (공사, 통제 시나리오)
+        edges : 엣지 인덱스 또는 목록 (snap_to_edge로 점에서 찾을 수 있음)
+        """
+        self.graph.disable_edges(edges)
+        self._edges_changed(edges)
+
+    def enable_edges(self, edges) -> None:
+        """
+        이정현 작성
+        disable_edges()로 차단한 엣지 복구
+        """
+        self.graph.enable_edges(edges)
+        self._edges_changed(edges)
+
+    def reweight_edges(self, edges, costs) -> None:
+        """
+        이정현 작성
+        엣지 비용을 제자리에서 변경 (그래프를 다시 만들지 않음)
+        차단한 엣지에 유한한 비용을 주면 차단이 풀리고 그 비용으로 열린다.
+        """
+        self.graph.set_edge_costs(edges, costs)
+        self._edges_changed(edges)
+
+    def _edges_changed(self, edges) -> None:
+        """
+        이정현 작성
+        엣지 비용 변경 후 캐시된 최단 경로 트리는 영향받는 부분만 복구하고,
+        비용 전체에 의존하는 CH는 버린다. (필요하면 prepare_hierarchy()로 다시 생성)
+        """
+        for tree in self.trees.values():
+            tree.repair(self.graph, edges)
+        self.hierarchy = None
+
+    def process(self, start_pt, end_pt, mode="dijkstra", snap="node", depart=None):
         """
         이정현 작성
         data는 ngii.co.kr(국토정보부)에서 다운받은 shp의 geojson의 도로 중심선 데이터
@@ -36,92 +523,316 @@ class PathFinder:
         road_lines [geo.Line] : 중심선 데이터의 연결선들(Edge)
         start_pt : 시작점 : 꼭 road_points 일 필요는 없음
         end_pt : 끝점 : 꼭 road_points 일 필요는 없음
+        mode : 탐색 방식 ("dijkstra" | "astar" | "bidirectional" | "ch" | "tree" | "time")
+        snap : "node"는 가장 가까운 노드로, "edge"는 가장 가까운 도로 위 점으로 스냅
+        depart : mode="time"일 때 출발 시각 (시, 예: 8.5 = 오전 8시 30분)
         """
-
-        def closest_point_index(pt):
-            """
-            이정현 작성
-            pt에서 unique_points 리스트 내 가장 가까운 점의 인덱스를 반환
-            """
-            dists = [pt.DistanceTo(up) for up in self.unique_points]
-            return dists.index(min(dists))
-
+        if snap == "edge":
+            return self._process_on_edges(start_pt, end_pt, mode, depart)
         # 시작점과 도착점에 대한 가장 가까운 도로 상의 점을 분석
-        start_idx = closest_point_index(start_pt)
-        end_idx = closest_point_index(end_pt)
+        start_idx, end_idx = (int(i) for i in self.snap([start_pt, end_pt]))
         # 시작 인덱스와 끝 인덱스를 기반으로 최단 경로를 계산
-        return self.get_path(start_idx, end_idx)
+        return self.get_path(start_idx, end_idx, mode, depart)
+
+    def alternative_paths(self, start_pt, end_pt, k: int = 3) -> list:
+        """
+        이정현 작성
+        시작점 → 끝점 사이 서로 다른 경로를 짧은 순서로 최대 k개 (경로 선택 분석용)
+        끝 노드의 최단 경로 트리를 self.trees 캐시에서 가져와 모든 대안 경로 탐색에 재사용한다.
+        반환 : [(비용, 경로 PolylineCurve)] (첫 번째가 get_path()의 최단 경로)
+        """
+        start_idx, end_idx = (int(i) for i in self.snap([start_pt, end_pt]))
+        self.last_stats = graph_search.SearchStats("yen")
+        if not self.graph.connected({start_idx: 0.0}, {end_idx: 0.0}):
+            return []
+        tree = self.trees.get(self.graph, end_idx, self.last_stats)
+        paths = graph_search.k_shortest_paths(
+            self.graph, start_idx, end_idx, k, tree, self.last_stats
+        )
+        return [
+            (cost, _polyline_curve(self._path_points(nodes, edges)))
+            for cost, nodes, edges in paths
+        ]
+
+    def _process_on_edges(self, start_pt, end_pt, mode, depart=None):
+        """
+        이정현 작성
+        시작점/끝점을 가장 가까운 엣지 위로 투영한 뒤 임시 노드 사이의 최단 경로 반환
+        """
+        start, end = self.snap_to_edge([start_pt, end_pt])
+        start_edge, start_along, start_proj = start
+        end_edge, end_along, end_proj = end
+        cost, path_indices, path_edges = self._route(
+            self._edge_terminal(start_edge, start_along),
+            self._edge_terminal(end_edge, end_along),
+            mode,
+            depart,
+        )
+        if start_edge == end_edge:
+            # 같은 엣지 위라면 엣지를 따라 바로 가는 경로와 비교
+            length = self.graph.lengths[start_edge]
+            ratio = abs(start_along - end_along) / length if length > 0 else 0.0
+            direct = ratio * self.graph.edge_costs()[start_edge]
+            if mode == "time":
+                direct /= self.speed  # 터미널 추가 비용과 같이 배율 없이 환산
+            if direct <= cost:
+                between = self._edge_points_between(start_edge, start_along, end_along)
+                return _polyline_curve([start_proj] + between + [end_proj])
+        if path_indices is None:
+            return None, None  # 경로 없음
+        return self._edge_path_curve(start, end, path_indices, path_edges)
+
+    def _edge_path_curve(self, start, end, path_indices, path_edges):
+        """
+        이정현 작성
+        엣지 스냅 (엣지, 거리, 투영점) 두 개와 탐색 결과로 경로 PolylineCurve 생성
+        투영점 → 첫 노드, 마지막 노드 → 투영점 구간의 엣지 형상도 포함한다.
+        """
+        start_edge, start_along, start_proj = start
+        end_edge, end_along, end_proj = end
+        first, last = path_indices[0], path_indices[-1]
+        head = self._edge_points_between(
+            start_edge, start_along, self._along_at_node(start_edge, first)
+        )
+        tail = self._edge_points_between(
+            end_edge, self._along_at_node(end_edge, last), end_along
+        )
+        return _polyline_curve(
+            [start_proj]
+            + head
+            + self._path_points(path_indices, path_edges)
+            + tail
+            + [end_proj]
+        )
+
+    def _path_points(self, path_indices, path_edges) -> list:
+        """
+        이정현 작성
+        탐색 결과를 엣지 중간 형상 점까지 포함한 Point3d 리스트로 변환
+        """
+        coords = self.graph.path_coords(path_indices, path_edges)
+        return [geo.Point3d(x, y, z) for x, y, z in coords.tolist()]
 
-    def analyze_road_data(self, road_points, road_lines):
+    def _along_at_node(self, edge: int, node: int) -> float:
         """
         이정현 작성
-        도로데이터 그래프로 생성
+        엣지 시작 노드(edges[e, 0])에서 node까지의 엣지 형상 길이 (0 또는 엣지 길이)
         """
+        return 0.0 if self.graph.edges[edge, 0] == node else self._edge_length(edge)
 
-        def rounded_key(pt, precision=4):
-            """
-            이정현 작성
-            중복 점 제거를 위한 허용오차 설정
-            """
-            return (
-                round(pt.X, precision),
-                round(pt.Y, precision),
-                round(pt.Z, precision),
+    def _edge_length(self, edge: int) -> float:
+        """
+        이정현 작성
+        엣지 형상 폴리라인의 전체 길이
+        """
+        polyline = self.graph.edge_polyline(edge)
+        return float(np.linalg.norm(np.diff(polyline, axis=0), axis=1).sum())
+
+    def _edge_points_between(self, edge: int, from_along: float, to_along: float):
+        """
+        이정현 작성
+        엣지 형상 위 거리 from_along과 to_along 사이의 중간 형상 점 (from → to 순서)
+        """
+        polyline = self.graph.edge_polyline(edge)
+        along = np.concatenate(
+            [[0.0], np.cumsum(np.linalg.norm(np.diff(polyline, axis=0), axis=1))]
+        )[1:-1]
+        lo, hi = min(from_along, to_along), max(from_along, to_along)
+        inside = polyline[1:-1][(along > lo) & (along < hi)]
+        if from_along > to_along:
+            inside = inside[::-1]
+        return [geo.Point3d(x, y, z) for x, y, z in inside.tolist()]
+
+    def distance_matrix(self, origins, destinations, processes: int = None):
+        """
+        이정현 작성
+        출발점들 × 도착점들의 도로 최단 거리 행렬 (numpy, 도달 불가는 inf)
+        origins, destinations [geo.Point3d] : 도로 위 점일 필요는 없음 (가장 가까운 노드로 스냅)
+        processes : 2 이상이면 출발점을 나누어 프로세스 풀에서 병렬 계산
+        """
+        return graph_search.distance_matrix(
+            self.graph, self.snap(origins), self.snap(destinations), processes
+        )
+
+    def allocate_flow(self, producers, consumers, supply, demand, capacities=None):
+        """
+        이정현 작성
+        여러 생산지 → 여러 소비지 배분을 최소 비용 유량 한 번으로 계산 (에너지 재사용 경로 배분)
+        한 쌍씩 최단 경로를 반복하는 탐욕 배분과 달리, 엣지 용량을 지키면서 총 비용(유량 × 경로 비용)이
+        최소가 되도록 나중 증강이 앞선 배분을 되돌릴 수도 있다.
+        producers / consumers [geo.Point3d] : 가장 가까운 노드로 스냅
+        supply / demand : 생산량 / 소비량 (스칼라 또는 점마다 하나)
+        capacities : 엣지 용량 (스칼라 또는 [m] 배열, None이면 무제한)
+        반환 : (flow.min_cost_flow() 결과 dict,
+                [(생산지 번호, 소비지 번호, 유량, 경로 PolylineCurve)])
+        """
+        self.last_stats = graph_search.SearchStats("flow")
+        result = flow.min_cost_flow(
+            self.graph,
+            self.snap(producers),
+            supply,
+            self.snap(consumers),
+            demand,
+            capacities,
+            self.last_stats,
+        )
+        allocations = []
+        for i, j, amount, nodes, edges in result["routes"]:
+            curve = _polyline_curve(self._path_points(nodes, edges))
+            allocations.append((i, j, amount, curve))
+        return result, allocations
+
+    def isochrone(
+        self,
+        points,
+        max_cost: float,
+        snap: str = "node",
+        polygon: str = None,
+        buffer_radius: float = None,
+        tolerance: float = 0.01,
+    ):
+        """
+        이정현 작성
+        여러 출발점(시설 등) 중 가장 가까운 곳에서 비용 max_cost 이내로 갈 수 있는 도로 범위
+        points [geo.Point3d] : 출발점들 (좌표 튜플도 가능)
+        max_cost : 비용 한계 (기본 비용은 길이이므로 보행 10분이면 보행 속도 × 10분)
+        snap : "node" | "edge" (process()와 같은 스냅 방식)
+        polygon : None | "hull" (도달 범위의 볼록 껍질) | "buffer" (도달 구간을 buffer_radius만큼 두껍게 한 영역)
+        tolerance : buffer 다각형 합집합 계산 허용 오차
+        반환 : (도달 노드 {노드 인덱스: 비용}, 엣지 중간의 도달 한계점 [geo.Point3d], 다각형)
+               다각형은 hull이면 닫힌 PolylineCurve, buffer이면 커브 리스트 (영역이 여러 개일 수 있음)
+        """
+        sources, on_edges = {}, []
+        if snap == "edge":
+            for edge, along, _ in self.snap_to_edge(points):
+                for node, off in self._edge_terminal(edge, along).items():
+                    sources[node] = min(off, sources.get(node, np.inf))
+                on_edges.append((edge, along))
+        else:
+            sources = {node: 0.0 for node in self.snap(points).tolist()}
+        self.last_stats = graph_search.SearchStats("isochrone")
+        reached = graph_search.bounded_search(
+            self.graph, sources, max_cost, self.last_stats
+        )
+        pieces, cut_points = self._reached_pieces(reached, max_cost, on_edges)
+        cut_points = [geo.Point3d(x, y, z) for x, y, z in cut_points.tolist()]
+
+        if polygon is None:
+            return reached, cut_points, None
+        if polygon == "hull":
+            pts = np.vstack(pieces + [self.graph.coords[list(reached)].reshape(-1, 3)])
+            hull = pts[spatial_index.convex_hull(pts)]
+            ring = np.vstack([hull, hull[:1]]).tolist()
+            return reached, cut_points, _polyline_curve([geo.Point3d(*p) for p in ring])
+        if polygon == "buffer":
+            if buffer_radius is None or buffer_radius <= 0:
+                raise ValueError("buffer 다각형에는 양수 buffer_radius가 필요합니다.")
+            capsules = [
+                _polyline_curve(
+                    [geo.Point3d(*p) for p in _capsule(a, b, buffer_radius).tolist()]
+                )
+                for piece in pieces
+                for a, b in zip(piece[:-1], piece[1:])
+            ]
+            union = geo.Curve.CreateBooleanUnion(capsules, tolerance)
+            return reached, cut_points, list(union) if union else capsules
+        raise ValueError(f"지원하지 않는 다각형 방식입니다: {polygon}")
+
+    def _reached_pieces(self, reached: dict, max_cost: float, on_edges: list):
+        """
+        이정현 작성
+        도달 노드 비용으로 각 엣지에서 도달 가능한 구간을 계산
+        on_edges : 엣지 위에 스냅한 출발점 [(엣지, 시작 노드로부터의 거리)]
+        반환 : (도달 구간 점 배열 리스트, 엣지 중간 도달 한계점 배열 [k, 3])
+        """
+        graph = self.graph
+        dist = np.full(graph.node_count, np.inf)
+        dist[list(reached)] = list(reached.values())
+        lengths = graph.lengths
+        costs = graph.edge_costs()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_length = np.where(lengths > 0, costs / lengths, 0.0)
+            d_u, d_v = dist[graph.edges[:, 0]], dist[graph.edges[:, 1]]
+            # 양 끝 노드에서 남은 비용으로 엣지를 따라 더 갈 수 있는 거리
+            reach_u = np.clip((max_cost - d_u) / per_length, 0, lengths)
+            reach_v = np.clip((max_cost - d_v) / per_length, 0, lengths)
+        intervals = {}
+        for e in np.flatnonzero(np.isfinite(d_u) | np.isfinite(d_v)).tolist():
+            spans = intervals.setdefault(e, [])
+            if np.isfinite(d_u[e]):
+                spans.append((0.0, reach_u[e]))
+            if np.isfinite(d_v[e]):
+                spans.append((lengths[e] - reach_v[e], lengths[e]))
+        for e, along in on_edges:
+            # 차단된 엣지 위의 출발점은 _edge_terminal과 같이 길이를 비용으로 본다.
+            rate = per_length[e] if np.isfinite(costs[e]) else 1.0
+            reach = max_cost / rate if rate > 0 else lengths[e]
+            intervals.setdefault(e, []).append(
+                (max(along - reach, 0.0), min(along + reach, lengths[e]))
             )
 
-        unique_points = []  # 중복 제거된 좌표 리스트 형성
-        point_idx_map = {}  # 좌표 키 → 인덱스 매핑
-        # 1. 중복 점 제거
-        for pt in road_points:
-            key = rounded_key(pt)
-            if key not in point_idx_map:
-                point_idx_map[key] = len(unique_points)
-                unique_points.append(pt)
-        # 2. 인접 리스트 초기화
-        adjacency = {i: [] for i in range(len(unique_points))}
-        # 3. 도로(Line)를 기반으로 노드 간 연결 정보 생성
-        for line in road_lines:
-            key_from = rounded_key(line.From)
-            key_to = rounded_key(line.To)
-            i1 = point_idx_map.get(key_from, -1)
-            i2 = point_idx_map.get(key_to, -1)
-            if i1 != -1 and i2 != -1:
-                length = line.Length
-                adjacency[i1].append((i2, length))  # 점끼리 양방향으로 연결
-                adjacency[i2].append((i1, length))
-        return unique_points, adjacency
-
-    def get_path(self, start_idx, end_idx):
+        pieces, cut_points = [], []
+        for e, spans in intervals.items():
+            spans.sort()
+            merged = [list(spans[0])]
+            for a, b in spans[1:]:
+                if a <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], b)
+                else:
+                    merged.append([a, b])
+            for a, b in merged:
+                if b <= a:
+                    continue
+                piece = graph.edge_subpolyline(e, a, b)
+                pieces.append(piece)
+                if a > 0:
+                    cut_points.append(piece[0])
+                if b < lengths[e]:
+                    cut_points.append(piece[-1])
+        return pieces, np.array(cut_points).reshape(-1, 3)
+
+    def route_viewshed(
+        self,
+        route_crv,
+        footprint_crvs,
+        spacing: float = 10.0,
+        max_dist: float = 100.0,
+        ray_count: int = 360,
+        tol: float = 0.01,
+    ):
+        """
+        이정현 작성
+        get_path() / process()로 구한 경로를 spacing 간격으로 걸으며 건물에 가려지지 않는 가시 영역 평가
+        (보행 경관 분석: 표본마다 isovist 면적과 개방도)
+        route_crv : 경로 커브
+        footprint_crvs [geo.Curve] : 건물 외곽선 (모든 표본이 하나의 선분 인덱스를 공유)
+        max_dist : 시선 최대 거리, ray_count : 표본마다 쏘는 시선 수
+        반환 : (표본 점 [geo.Point3d], viewshed.route_viewshed() 결과 dict)
+        """
+        result = viewshed.route_viewshed(
+            raw_utils.get_vertex_array(route_crv, tol),
+            [raw_utils.get_vertex_array(crv, tol) for crv in footprint_crvs],
+            spacing,
+            max_dist,
+            ray_count,
+        )
+        points = [geo.Point3d(x, y, z) for x, y, z in result["points"].tolist()]
+        return points, result
+
+    def get_path(self, start_idx, end_idx, mode="dijkstra", depart=None):
         """
         이정현 작성
         start_idx에서 end_idx까지의 최단 경로 기반 PolylineCurve 반환
+        mode : "dijkstra" | "astar" | "bidirectional" | "ch" | "tree" | "time"
+               ("ch"는 CH가 없으면 prepare_hierarchy()를 먼저 수행,
+                "tree"는 출발 노드의 최단 경로 트리를 캐시해 두고 재사용,
+                reuse_trees가 True면 "dijkstra"도 캐시된 트리가 있을 때 재사용,
+                "time"은 set_congestion()의 시간대 혼잡도로 depart 시각 출발 경로 계산)
+        탐색 통계(방문 노드 수, 큐 삽입 수, 소요 시간)는 self.last_stats에 저장
         """
-        dist = {
-            i: float("inf") for i in self.adjacency
-        }  # 모든 노드까지의 거리 초기화 (무한대)
-        prev = {i: None for i in self.adjacency}  # 경로 추적을 위한 이전 노드 저장
-        dist[start_idx] = 0
-        queue = [(0, start_idx)]  # 시작 노드 지정 (우선순위 큐)
-        while queue:
-            current_dist, u = heapq.heappop(queue)
-            if current_dist > dist[u]:
-                continue  # 더 짧은 거리로 이미 방문한 경우 생략
-            if u == end_idx:
-                break  # 도착점에 도달
-            for v, weight in self.adjacency[u]:  # 인접 노드 탐색
-                alt = dist[u] + weight
-                if alt < dist[v]:  # 더 짧은 경로 발견 시 업데이트
-                    dist[v] = alt
-                    prev[v] = u
-                    heapq.heappush(queue, (alt, v))
-        path_indices = []
-        u = end_idx
-        if prev[u] is not None or u == start_idx:
-            while u is not None:
-                path_indices.insert(0, u)
-                u = prev[u]
-        else:
+        _, path_indices, path_edges = self._route(start_idx, end_idx, mode, depart)
+        if path_indices is None:
             return None, None  # 경로 없음
-        path_points = [self.unique_points[i] for i in path_indices]
+        path_points = self._path_points(path_indices, path_edges)
         polyline = geo.Polyline(path_points)
         return geo.PolylineCurve(polyline)
@@ -220,3 +220,47 @@ class Corridor:
         r = int(min(255, max(0, 255 * (100 - score) / 50)))
         g = int(min(255, max(0, 255 * score / 50)))
         return Color.FromArgb(r, g, 0)
+
+
+# ---------- 복도망 공간구문 분석 ----------
+
+
+def analyze_space_syntax(
+    centerline_crvs: List[geo.Curve],
+    boundary_crvs: Optional[List[geo.Curve]] = None,
+    kind: str = "segment",
+    tol: float = 100.0,
+    radius: Optional[int] = None,
+    angular: bool = True,
+    processes: Optional[int] = None,
+    curve_tol: float = 0.01,
+) -> Tuple[List[geo.LineCurve], dict]:
+    """
+    권유진 작성
+    복도 중심선(과 복도 경계) 커브로 axial / segment 맵을 만들고
+    연결도, 평균 깊이, 통합도, 각도 통합도, 선택도를 한 번에 계산
+    tol : 선끼리 연결로 보는 간격 (mm)
+    curve_tol : 곡선 커브를 폴리라인으로 근사할 때의 허용오차
+    반환 : (맵의 선 [geo.LineCurve], {지표 이름: 선별 값 배열})
+    """
+    smap = ewha_utils.space_syntax.SpatialMap.from_centerlines(
+        [
+            ewha_utils.raw_utils.get_vertex_array(crv, curve_tol)
+            for crv in centerline_crvs
+        ],
+        (
+            [
+                ewha_utils.raw_utils.get_vertex_array(crv, curve_tol)
+                for crv in boundary_crvs
+            ]
+            if boundary_crvs
+            else None
+        ),
+        kind=kind,
+        tol=tol,
+    )
+    lines = [
+        geo.LineCurve(geo.Point3d(*a), geo.Point3d(*b))
+        for a, b in zip(smap.starts.tolist(), smap.ends.tolist())
+    ]
+    return lines, smap.analyze(radius=radius, angular=angular, processes=processes)
@@ -6,6 +6,9 @@ import os
 import json
 from System.Drawing import Color
 from collections import defaultdict
+import numpy as np
+from ewha_utils.safety import polygons_to_segments
+from ewha_utils.spatial_index import SegmentTree
 
 
 ## 권유진
@@ -231,12 +234,18 @@ def get_cctv_color(count: int) -> Color:
 
 ## 서은미
 def is_visible(
-    point: geo.Point3d, cctv: geo.Point3d, obstacles: List[geo.Curve]
+    point: geo.Point3d,
+    cctv: geo.Point3d,
+    obstacles: List[geo.Curve],
+    index=None,
 ) -> bool:
     """
     서은미 작성
     CCTV 시야 체크 (장애물에 가리는지 여부 확인)
+    index : obstacle_index(obstacles)로 만든 선분 인덱스 (주어지면 커브 교차 계산 없이 검사)
     """
+    if index is not None:
+        return bool(visible_mask([point], [cctv], index)[0])
     line = geo.LineCurve(point, cctv)
     for obs in obstacles:
         if geo.Intersect.Intersection.CurveCurve(line, obs, 0.01, 0.01).Count > 0:
@@ -244,6 +253,32 @@ def is_visible(
     return True
 
 
+## 서은미
+def obstacle_index(obstacles: List[geo.Curve], tol: float = 0.01):
+    """
+    서은미 작성
+    장애물 커브들을 선분으로 나눈 SegmentTree (바운딩 박스 계층)
+    장면마다 한 번 만들어 CCTV 가시성(is_visible, visible_mask)과
+    에이전트 경로 계획(agents.site_planner)이 함께 쓴다.
+    """
+    return SegmentTree(
+        *polygons_to_segments([get_vertex_array(crv, tol) for crv in obstacles])
+    )
+
+
+## 서은미
+def visible_mask(points: List[geo.Point3d], targets: List[geo.Point3d], index):
+    """
+    서은미 작성
+    points[i] → targets[i] 시선들이 장애물에 가리지 않는지 한 번에 검사
+    index : obstacle_index()로 만든 선분 인덱스
+    반환 : [k] bool numpy 배열
+    """
+    starts = np.array([[pt.X, pt.Y, pt.Z] for pt in points]).reshape(-1, 3)
+    ends = np.array([[pt.X, pt.Y, pt.Z] for pt in targets]).reshape(-1, 3)
+    return ~index.blocked(starts, ends)
+
+
 ## 서은미
 def is_on_sidewalk(point: geo.Point3d, sidewalks: List[geo.Curve]) -> bool:
     """
@@ -286,17 +321,21 @@ def check_point_safety(
     sidewalks: List[geo.Curve],
     cvs_list: List[geo.Point3d],
     police_list: List[geo.Point3d],
+    index=None,
 ) -> float:
     """
     서은미 작성
     각 포인트에 대한 안전 점수 계산
+    index : obstacle_index(obstacles)로 만든 선분 인덱스 (여러 점을 검사할 때 재사용)
     """
     score = 0
 
     # cctv의 반경과 가림 여부
     for cctv in cctvs:
         if isinstance(cctv, geo.Point3d):
-            if point.DistanceTo(cctv) <= 20 and is_visible(point, cctv, obstacles):
+            if point.DistanceTo(cctv) <= 20 and is_visible(
+                point, cctv, obstacles, index
+            ):
                 score += 40
 
     # 인도 포함 여부
@@ -506,6 +545,19 @@ def get_vertices(crv: geo.Curve) -> List[geo.Point3d]:
     return points
 
 
+## 이정현
+def get_vertex_array(crv: geo.Curve, tol: float = 0.01):
+    """
+    이정현 작성
+    커브 꼭짓점 좌표를 [k, 3] numpy 배열로 반환 (폴리라인이 아니면 tol 오차로 폴리라인 근사)
+    배열 기반 모듈(space_syntax, safety 등)에 Rhino 커브를 넘길 때 사용
+    """
+    ok, polyline = crv.TryGetPolyline()
+    if not ok:
+        polyline = crv.ToPolyline(tol, 0.1, 0, 0).ToPolyline()
+    return np.array([[pt.X, pt.Y, pt.Z] for pt in polyline]).reshape(-1, 3)
+
+
 ## 이정현
 def polylinecurve_to_lines(polyline_crv: geo.PolylineCurve) -> List[geo.Line]:
     """
@@ -0,0 +1,734 @@
+import json
+import os
+import numpy as np
+
+EDGE_DATA_PREFIX = "edge_data_"  # 저장 파일에서 엣지 속성 배열 이름 앞에 붙이는 접두어
+
+
+class RoadGraph:
+    """
+    이정현 작성
+    도로 네트워크의 배열 기반(CSR) 그래프 표현.
+    dict-of-list 인접 리스트 대신 연속된 numpy 배열만 사용하므로
+    메모리를 적게 쓰고, 파일로 저장한 뒤 즉시 다시 불러올 수 있다.
+
+    coords [n, 3] : 노드 좌표
+    edges [m, 2] : 무방향 엣지의 양 끝 노드 인덱스
+    lengths [m] : 엣지 길이
+    offsets [n + 1] : 노드 u의 인접 엣지는 offsets[u] ~ offsets[u + 1] 구간
+    targets [2m] : 인접 노드 인덱스 (양방향)
+    weights [2m] : 인접 엣지의 탐색 비용
+    edge_ids [2m] : 각 방향 엣지가 속한 무방향 엣지 인덱스
+    shape_offsets [m + 1] / shape_coords [k, 3] : 엣지 양 끝 사이의 중간 형상 점
+        (edges[e, 0] → edges[e, 1] 순서, simplify()로 합친 엣지의 원래 꼭짓점)
+    edge_data {이름: [m]} : 엣지별 속성 배열 (예: 안전 점수), save()/load()에 함께 저장
+    """
+
+    ARRAY_NAMES = (
+        "coords",
+        "edges",
+        "lengths",
+        "offsets",
+        "targets",
+        "weights",
+        "edge_ids",
+        "shape_offsets",
+        "shape_coords",
+    )
+
+    def __init__(
+        self, coords, edges, lengths, csr=None, shape_offsets=None, shape_coords=None
+    ):
+        self.coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.lengths = np.asarray(lengths, dtype=float)
+        if shape_offsets is None:  # 중간 형상 점이 없는 직선 엣지
+            shape_offsets = np.zeros(len(self.edges) + 1, dtype=np.int64)
+            shape_coords = np.zeros((0, 3))
+        self.shape_offsets = np.asarray(shape_offsets, dtype=np.int64)
+        self.shape_coords = np.asarray(shape_coords, dtype=float).reshape(-1, 3)
+        if csr is None:
+            self._build_csr()
+        else:
+            self.offsets, self.targets, self.weights, self.edge_ids = csr
+        self.disabled = {}  # 비활성화된 엣지 {엣지: 비활성화 전 비용}
+        self.edge_data = {}
+        self._cache = {}
+
+    def __getstate__(self) -> dict:
+        # 프로세스 풀로 넘길 때 파생 캐시(파이썬 리스트)는 보내지 않는다.
+        state = self.__dict__.copy()
+        state["_cache"] = {}
+        return state
+
+    @classmethod
+    def from_segments(
+        cls, starts, ends, precision: int = 4, planarize: bool = False
+    ) -> "RoadGraph":
+        """
+        이정현 작성
+        선분 시작점/끝점 배열 (m, 3)로부터 그래프 생성.
+        좌표를 precision 자리로 반올림한 값이 같은 점은 하나의 노드로 합친다.
+        planarize : True이면 꼭짓점을 공유하지 않고 교차하는 선분들을 교차점에서
+                    분할하여 연결한다. (planarize_segments 참고)
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        if planarize:
+            starts, ends = planarize_segments(starts, ends)
+        points = np.vstack([starts, ends])
+        keys = np.round(points, precision) + 0.0  # -0.0 → 0.0
+        _, first, inverse = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        edges = np.column_stack([inverse[: len(starts)], inverse[len(starts) :]])
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        keep = edges[:, 0] != edges[:, 1]  # 길이 0인 자기 자신 연결 제거
+        return cls(points[first], edges[keep], lengths[keep])
+
+    @classmethod
+    def from_geojson(
+        cls, data, precision: int = 4, planarize: bool = False
+    ) -> "RoadGraph":
+        """
+        이정현 작성
+        GeoJSON(dict 또는 파일 경로)의 LineString / MultiLineString 좌표로 바로 그래프 생성.
+        Rhino 객체를 거치지 않으므로 CPython 단독 환경에서도 동작한다.
+        """
+        starts, ends = geojson_segments(data)
+        return cls.from_segments(starts, ends, precision, planarize)
+
+    def _build_csr(self) -> None:
+        """
+        무방향 엣지 목록으로부터 CSR 인접 배열 생성
+        """
+        n = len(self.coords)
+        m = len(self.edges)
+        src = np.concatenate([self.edges[:, 0], self.edges[:, 1]])
+        dst = np.concatenate([self.edges[:, 1], self.edges[:, 0]])
+        eid = np.concatenate([np.arange(m), np.arange(m)])
+        order = np.argsort(src, kind="stable")
+        self.targets = dst[order]
+        self.edge_ids = eid[order]
+        self.weights = self.lengths[self.edge_ids]
+        self.offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.offsets[1:])
+
+    @property
+    def node_count(self) -> int:
+        return len(self.coords)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edges)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        그래프 배열이 차지하는 메모리 (byte)
+        """
+        return sum(getattr(self, name).nbytes for name in self.ARRAY_NAMES)
+
+    def edge_costs(self) -> np.ndarray:
+        """
+        이정현 작성
+        무방향 엣지별 현재 탐색 비용 (CSR weights 기준)
+        """
+        if "edge_costs" not in self._cache:
+            costs = np.full(self.edge_count, np.inf)
+            np.minimum.at(costs, self.edge_ids, self.weights)
+            self._cache["edge_costs"] = costs
+        return self._cache["edge_costs"]
+
+    def half_edges(self) -> np.ndarray:
+        """
+        이정현 작성
+        무방향 엣지별 CSR 위치 2개 [m, 2] (weights[half_edges[e]]가 엣지 e의 양방향 비용)
+        """
+        if "half_edges" not in self._cache:
+            order = np.argsort(self.edge_ids, kind="stable")
+            self._cache["half_edges"] = order.reshape(-1, 2)
+        return self._cache["half_edges"]
+
+    def set_edge_costs(self, edges, costs) -> np.ndarray:
+        """
+        이정현 작성
+        엣지 비용을 제자리에서 변경 (그래프를 다시 만들지 않음)
+        edges : 엣지 인덱스 목록, costs : 새 비용 (하나 또는 엣지별 목록, inf는 통행 불가)
+        disable_edges()로 차단한 엣지에 유한한 비용을 주면 차단이 풀린 것으로 보고
+        self.disabled에서 뺀다. (enable_edges()가 새 비용을 옛 비용으로 덮어쓰지 않도록)
+        반환 : 변경 전 비용 배열
+        """
+        edges = np.atleast_1d(np.asarray(edges, dtype=np.int64))
+        costs = np.broadcast_to(np.asarray(costs, dtype=float), edges.shape)
+        old = self.edge_costs()[edges].copy()
+        if not self.weights.flags.writeable:  # 메모리 매핑으로 불러온 경우
+            self.weights = self.weights.copy()
+        positions = self.half_edges()[edges]
+        self.weights[positions] = costs[:, None]
+        if "lists" in self._cache:  # 탐색용 리스트도 제자리에서 갱신
+            weights = self._cache["lists"][2]
+            for (k1, k2), cost in zip(positions.tolist(), costs.tolist()):
+                weights[k1] = weights[k2] = cost
+        if np.any(np.isinf(old) != np.isinf(costs)):
+            self._cache.pop("components", None)  # 차단/복구로 연결 관계가 바뀜
+        self._cache["edge_costs"][edges] = costs
+        self._cache.pop("scale", None)
+        if self.disabled:
+            for e, cost in zip(edges.tolist(), costs.tolist()):
+                if e in self.disabled and cost != np.inf:
+                    del self.disabled[e]
+        return old
+
+    def disable_edges(self, edges) -> None:
+        """
+        이정현 작성
+        엣지 통행 차단 (비용을 inf로 두고 원래 비용은 self.disabled에 보관)
+        """
+        edges = [e for e in np.atleast_1d(edges).tolist() if e not in self.disabled]
+        old = self.set_edge_costs(edges, np.inf)
+        self.disabled.update(zip(edges, old.tolist()))
+
+    def enable_edges(self, edges) -> None:
+        """
+        이정현 작성
+        disable_edges()로 차단한 엣지를 원래 비용으로 복구
+        """
+        edges = [e for e in np.atleast_1d(edges).tolist() if e in self.disabled]
+        self.set_edge_costs(edges, [self.disabled.pop(e) for e in edges])
+
+    def components(self) -> np.ndarray:
+        """
+        이정현 작성
+        노드별 연결 요소 번호 [n] (통행 가능한 엣지 기준, 번호는 0부터)
+        union-find의 parent 배열을 numpy로 한꺼번에 합치고(hooking) 경로를 압축하는
+        과정을 반복하므로 반복 횟수는 O(log n) 정도다.
+        """
+        if "components" not in self._cache:
+            parent = np.arange(self.node_count)
+            u, v = self.edges[np.isfinite(self.edge_costs())].T
+            while True:
+                pu, pv = parent[u], parent[v]
+                differ = pu != pv
+                if not differ.any():
+                    break
+                low = np.minimum(pu[differ], pv[differ])
+                np.minimum.at(parent, pu[differ], low)
+                np.minimum.at(parent, pv[differ], low)
+                while True:  # 경로 압축
+                    grand = parent[parent]
+                    if np.array_equal(grand, parent):
+                        break
+                    parent = grand
+            _, labels = np.unique(parent, return_inverse=True)
+            self._cache["components"] = labels.reshape(-1)
+        return self._cache["components"]
+
+    def component_sizes(self) -> np.ndarray:
+        """
+        이정현 작성
+        연결 요소별 노드 수 (components()의 번호 순서)
+        """
+        return np.bincount(self.components())
+
+    def connected(self, sources, targets) -> bool:
+        """
+        이정현 작성
+        출발 노드들과 도착 노드들 중 같은 연결 요소에 있는 쌍이 있는지 O(1)로 확인
+        sources, targets : 노드 인덱스 또는 {노드: 추가 비용} dict
+        """
+        labels = self.components()
+        source_labels = {labels[s] for s in np.atleast_1d(list(sources)).tolist()}
+        return any(
+            labels[t] in source_labels for t in np.atleast_1d(list(targets)).tolist()
+        )
+
+    def edge_shape(self, edge: int, reverse: bool = False) -> np.ndarray:
+        """
+        이정현 작성
+        엣지 중간 형상 점 배열 (reverse이면 edges[e, 1] 쪽부터)
+        """
+        shape = self.shape_coords[
+            self.shape_offsets[edge] : self.shape_offsets[edge + 1]
+        ]
+        return shape[::-1] if reverse else shape
+
+    def edge_polyline(self, edge: int) -> np.ndarray:
+        """
+        이정현 작성
+        엣지 형상 점 배열 (edges[e, 0] 노드 → 중간 형상 점 → edges[e, 1] 노드)
+        """
+        u, v = self.edges[edge]
+        return np.vstack([self.coords[u], self.edge_shape(edge), self.coords[v]])
+
+    def edge_subpolyline(self, edge: int, start: float, end: float) -> np.ndarray:
+        """
+        이정현 작성
+        엣지 형상에서 시작 노드(edges[e, 0])로부터 거리 start ~ end 구간의 점 배열
+        (start <= end, 양 끝은 형상 위에 보간한 점)
+        """
+        polyline = self.edge_polyline(edge)
+        along = np.concatenate(
+            [[0.0], np.cumsum(np.linalg.norm(np.diff(polyline, axis=0), axis=1))]
+        )
+        cut = np.column_stack(
+            [np.interp([start, end], along, polyline[:, i]) for i in range(3)]
+        )
+        inside = polyline[(along > start) & (along < end)]
+        return np.vstack([cut[:1], inside, cut[1:]])
+
+    def edge_segments(self):
+        """
+        이정현 작성
+        엣지 형상을 이루는 선분 목록 (최근접 엣지 스냅용)
+        반환 : (시작점 [k, 3], 끝점 [k, 3], 선분이 속한 엣지 [k],
+                엣지 시작 노드(edges[:, 0])부터 선분 시작점까지의 길이 [k])
+        """
+        # 엣지마다 [시작 노드, 중간 형상 점..., 끝 노드]를 이어 붙인 점 배열
+        counts = np.diff(self.shape_offsets) + 2
+        last = np.cumsum(counts) - 1
+        first = last - counts + 1
+        points = np.empty((int(counts.sum()), 3))
+        interior = np.ones(len(points), dtype=bool)
+        interior[first] = interior[last] = False
+        points[first] = self.coords[self.edges[:, 0]]
+        points[last] = self.coords[self.edges[:, 1]]
+        points[interior] = self.shape_coords
+        # 각 엣지의 마지막 점을 뺀 모든 점이 선분의 시작점
+        seg_first = np.delete(np.arange(len(points)), last)
+        seg_counts = counts - 1
+        starts, ends = points[seg_first], points[seg_first + 1]
+        seg_length = np.linalg.norm(ends - starts, axis=1)
+        offset = np.cumsum(seg_length) - seg_length
+        edge_first_seg = np.cumsum(seg_counts) - seg_counts
+        seg_offset = offset - np.repeat(offset[edge_first_seg], seg_counts)
+        return (
+            starts,
+            ends,
+            np.repeat(np.arange(self.edge_count), seg_counts),
+            seg_offset,
+        )
+
+    def sample_edges(self, spacing: float):
+        """
+        이정현 작성
+        엣지 형상을 따라 약 spacing 간격으로 표본 점 추출 (엣지마다 최소 1개)
+        각 선분을 같은 길이 구간으로 나눈 뒤 구간 중앙점을 쓴다.
+        반환 : (표본 점 [k, 3], 표본이 속한 엣지 [k], 표본이 대표하는 길이 [k])
+        """
+        starts, ends, seg_edge, _ = self.edge_segments()
+        seg_length = np.linalg.norm(ends - starts, axis=1)
+        counts = np.maximum(np.ceil(seg_length / spacing), 1).astype(np.int64)
+        seg = np.repeat(np.arange(len(starts)), counts)
+        local = np.arange(len(seg)) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = (local + 0.5) / counts[seg]
+        points = starts[seg] + t[:, None] * (ends[seg] - starts[seg])
+        return points, seg_edge[seg], (seg_length / counts)[seg]
+
+    def set_edge_data(self, name: str, values) -> None:
+        """
+        이정현 작성
+        엣지별 속성 배열 저장 (길이는 엣지 수와 같아야 함)
+        """
+        values = np.asarray(values)
+        if values.shape[:1] != (self.edge_count,):
+            raise ValueError(
+                f"엣지 속성 길이가 엣지 수와 다릅니다: {values.shape} != {self.edge_count}"
+            )
+        self.edge_data[name] = values
+
+    def path_coords(self, nodes, edges) -> np.ndarray:
+        """
+        이정현 작성
+        탐색 결과(노드 리스트, 엣지 리스트)를 중간 형상 점까지 포함한 좌표 배열로 변환
+        """
+        parts = [self.coords[nodes[0]][None]]
+        for u, v, e in zip(nodes, nodes[1:], edges):
+            parts.append(self.edge_shape(e, reverse=self.edges[e, 0] != u))
+            parts.append(self.coords[v][None])
+        return np.vstack(parts)
+
+    def simplify(self) -> "RoadGraph":
+        """
+        이정현 작성
+        이웃이 정확히 2개인 노드(곡률 표현용 꼭짓점)를 없애고, 그런 노드로 이어진
+        사슬을 하나의 엣지로 합친 새 그래프 반환.
+        합친 엣지의 길이/비용은 사슬의 합이고, 없앤 노드 좌표는 shape_coords에 남겨
+        path_coords()로 원래 해상도의 경로를 복원할 수 있다.
+        사슬에 차단된 엣지가 있으면 합친 엣지도 차단되고(복구하면 사슬 비용의 합),
+        edge_data는 사슬 엣지 값의 길이 가중 평균으로 옮긴다 (숫자 배열만 가능).
+        """
+        for name, values in self.edge_data.items():
+            if not np.issubdtype(np.asarray(values).dtype, np.number):
+                raise ValueError(f"숫자가 아닌 엣지 속성은 합칠 수 없습니다: {name}")
+        offsets, targets, _ = self.as_lists()
+        edge_ids = self.edge_id_list()
+        edges = self.edges.tolist()
+        lengths = self.lengths.tolist()
+        costs = self.edge_costs().tolist()
+        for e, cost in self.disabled.items():  # 차단 전 비용으로 합산
+            costs[e] = cost
+        keep = np.diff(self.offsets) != 2
+        loops = self.edges[:, 0] == self.edges[:, 1]
+        keep[self.edges[loops, 0]] = True
+        used = np.zeros(self.edge_count, dtype=bool)
+        new_edges, new_lengths, new_costs, shapes, chains = [], [], [], [], []
+
+        def walk(start: int, k: int) -> None:
+            # start 노드에서 방향 엣지 k로 출발해 다음 유지 노드까지 사슬을 따라감
+            length = cost = 0.0
+            shape, chain = [], []
+            u = start
+            while True:
+                e = edge_ids[k]
+                used[e] = True
+                chain.append(e)
+                length += lengths[e]
+                cost += costs[e]
+                shape.extend(self.edge_shape(e, reverse=edges[e][0] != u))
+                v = targets[k]
+                if keep[v]:
+                    break
+                shape.append(self.coords[v])
+                k = next(
+                    j for j in range(offsets[v], offsets[v + 1]) if edge_ids[j] != e
+                )
+                u = v
+            new_edges.append((start, v))
+            new_lengths.append(length)
+            new_costs.append(cost)
+            shapes.append(shape)
+            chains.append(chain)
+
+        for start in np.flatnonzero(keep).tolist():
+            for k in range(offsets[start], offsets[start + 1]):
+                if not used[edge_ids[k]]:
+                    walk(start, k)
+        # 모든 노드의 이웃이 2개인 고리는 한 노드를 남겨 고리 엣지로 만든다.
+        for e in range(self.edge_count):
+            if not used[e]:
+                start = edges[e][0]
+                keep[start] = True
+                walk(
+                    start,
+                    next(
+                        k
+                        for k in range(offsets[start], offsets[start + 1])
+                        if edge_ids[k] == e
+                    ),
+                )
+
+        # 남긴 노드만 새 번호를 붙여 새 그래프 구성
+        node_map = np.full(self.node_count, -1, dtype=np.int64)
+        node_map[keep] = np.arange(int(keep.sum()))
+        shape_offsets = np.zeros(len(shapes) + 1, dtype=np.int64)
+        np.cumsum([len(shape) for shape in shapes], out=shape_offsets[1:])
+        graph = RoadGraph(
+            self.coords[keep],
+            node_map[np.array(new_edges, dtype=np.int64).reshape(-1, 2)],
+            new_lengths,
+            shape_offsets=shape_offsets,
+            shape_coords=np.array([p for shape in shapes for p in shape]),
+        )
+        new_costs = np.array(new_costs)
+        if not np.array_equal(new_costs, graph.lengths):  # 길이와 다른 비용 유지
+            graph.set_edge_costs(np.arange(graph.edge_count), new_costs)
+        if self.disabled:
+            graph.disable_edges(
+                [i for i, chain in enumerate(chains) if self.disabled.keys() & chain]
+            )
+        if self.edge_data:
+            chain_edges = np.array([e for chain in chains for e in chain], np.int64)
+            chain_index = np.repeat(np.arange(len(chains)), [len(c) for c in chains])
+            weights = self.lengths[chain_edges]
+            totals = np.bincount(chain_index, weights, minlength=len(chains))
+            # 길이가 0인 사슬은 단순 평균
+            weights = np.where(totals[chain_index] > 0, weights, 1.0)
+            totals = np.bincount(chain_index, weights, minlength=len(chains))
+            for name, values in self.edge_data.items():
+                values = np.asarray(values, dtype=float)[chain_edges]
+                column = (-1,) + (1,) * (values.ndim - 1)  # 다차원 속성도 엣지 축으로
+                sums = np.zeros((len(chains),) + values.shape[1:])
+                np.add.at(sums, chain_index, values * weights.reshape(column))
+                graph.set_edge_data(name, sums / totals.reshape(column))
+        return graph
+
+    def neighbors(self, u: int):
+        """
+        이정현 작성
+        노드 u의 (인접 노드 배열, 비용 배열) 반환
+        """
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return self.targets[lo:hi], self.weights[lo:hi]
+
+    def invalidate(self) -> None:
+        """
+        이정현 작성
+        weights 등을 직접 수정한 뒤 호출하여 캐시된 파생 데이터를 비움
+        """
+        self._cache.clear()
+
+    def as_lists(self):
+        """
+        이정현 작성
+        탐색 루프용 파이썬 리스트 (offsets, targets, weights).
+        numpy 원소 접근보다 빠르기 때문에 한 번 변환해서 재사용한다.
+        """
+        if "lists" not in self._cache:
+            self._cache["lists"] = (
+                self.offsets.tolist(),
+                self.targets.tolist(),
+                self.weights.tolist(),
+            )
+        return self._cache["lists"]
+
+    def edge_id_list(self) -> list:
+        """
+        이정현 작성
+        탐색 루프용 edge_ids 파이썬 리스트
+        """
+        if "edge_ids" not in self._cache:
+            self._cache["edge_ids"] = self.edge_ids.tolist()
+        return self._cache["edge_ids"]
+
+    def coord_list(self) -> list:
+        """
+        이정현 작성
+        탐색 루프용 노드 좌표 파이썬 리스트 [(x, y, z)]
+        """
+        if "coords" not in self._cache:
+            self._cache["coords"] = [tuple(c) for c in self.coords.tolist()]
+        return self._cache["coords"]
+
+    def heuristic_scale(self) -> float:
+        """
+        이정현 작성
+        모든 방향 엣지에 대한 (비용 / 양 끝 직선거리)의 최솟값.
+        A* 휴리스틱에 곱해 주면 비용을 길이 외의 값으로 바꿔도 휴리스틱이 과대평가되지 않는다.
+        """
+        if "scale" not in self._cache:
+            sources = np.repeat(np.arange(self.node_count), np.diff(self.offsets))
+            chord = np.linalg.norm(
+                self.coords[self.targets] - self.coords[sources], axis=1
+            )
+            valid = chord > 0
+            ratio = self.weights[valid] / chord[valid]
+            self._cache["scale"] = float(ratio.min()) if len(ratio) else 0.0
+        return self._cache["scale"]
+
+    def to_adjacency(self) -> dict:
+        """
+        이정현 작성
+        기존 PathFinder.adjacency 형식 {노드: [(인접 노드, 길이)]}으로 변환
+        """
+        offsets, targets, weights = self.as_lists()
+        return {
+            u: list(
+                zip(
+                    targets[offsets[u] : offsets[u + 1]],
+                    weights[offsets[u] : offsets[u + 1]],
+                )
+            )
+            for u in range(self.node_count)
+        }
+
+    def save(self, path: str) -> None:
+        """
+        이정현 작성
+        그래프 저장.
+        path가 .npz로 끝나면 하나의 npz 파일로, 아니면 폴더에 배열별 .npy로 저장한다.
+        (.npy 폴더는 load(mmap=True)로 메모리 매핑하여 불러올 수 있다.)
+        """
+        arrays = {name: getattr(self, name) for name in self.ARRAY_NAMES}
+        arrays.update(
+            {EDGE_DATA_PREFIX + name: values for name, values in self.edge_data.items()}
+        )
+        if path.endswith(".npz"):
+            np.savez(path, **arrays)
+            return
+        os.makedirs(path, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(path, name + ".npy"), array)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "RoadGraph":
+        """
+        이정현 작성
+        save()로 저장한 그래프 불러오기 (CSR 배열을 다시 만들지 않음)
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {path}")
+        if os.path.isdir(path):
+            mode = "r" if mmap else None
+            arrays = {
+                name[:-4]: np.load(os.path.join(path, name), mmap_mode=mode)
+                for name in os.listdir(path)
+                if name.endswith(".npy")
+            }
+        else:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        csr = (
+            arrays["offsets"],
+            arrays["targets"],
+            arrays["weights"],
+            arrays["edge_ids"],
+        )
+        graph = cls(
+            arrays["coords"],
+            arrays["edges"],
+            arrays["lengths"],
+            csr=csr,
+            shape_offsets=arrays.get("shape_offsets"),
+            shape_coords=arrays.get("shape_coords"),
+        )
+        for name, values in arrays.items():
+            if name.startswith(EDGE_DATA_PREFIX):
+                graph.edge_data[name[len(EDGE_DATA_PREFIX) :]] = values
+        return graph
+
+
+def geojson_segments(data):
+    """
+    이정현 작성
+    GeoJSON(dict 또는 파일 경로)의 LineString / MultiLineString을 선분 배열로 변환
+    geojson_to_rhino_geometry와 같이 z 좌표는 0으로 둔다.
+    LineString / MultiLineString 피처가 하나도 없으면 ValueError
+    반환 : (시작점 배열 [m, 3], 끝점 배열 [m, 3])
+    """
+    if isinstance(data, str):
+        if not os.path.exists(data):
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {data}")
+        with open(data, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    lines = []
+    found = set()
+    for feature in data["features"]:
+        geometry = feature.get("geometry")
+        if not geometry:
+            continue
+        found.add(geometry["type"])
+        if geometry["type"] == "LineString":
+            lines.append(geometry["coordinates"])
+        elif geometry["type"] == "MultiLineString":
+            lines.extend(geometry["coordinates"])
+    if not found & {"LineString", "MultiLineString"}:
+        # Polygon 등만 있는 파일을 도로망으로 읽으면 노드 0개 그래프가 조용히 만들어지므로 막음
+        raise ValueError(
+            "LineString / MultiLineString 피처가 없습니다 "
+            f"(포함된 지오메트리: {', '.join(sorted(found)) or '없음'})"
+        )
+    lines = [line for line in lines if len(line) >= 2]
+    if not lines:
+        return np.zeros((0, 3)), np.zeros((0, 3))
+
+    # 모든 좌표를 한 배열로 이어 붙인 뒤, 라인 경계를 넘는 선분만 제외
+    points = np.zeros((sum(len(line) for line in lines), 3))
+    points[:, :2] = [xy[:2] for line in lines for xy in line]
+    counts = np.array([len(line) for line in lines])
+    is_last = np.zeros(len(points), dtype=bool)
+    is_last[np.cumsum(counts) - 1] = True
+    first = np.flatnonzero(~is_last)
+    return points[first], points[first + 1]
+
+
+def planarize_segments(starts, ends, cell_size: float = None, tol: float = 1e-9):
+    """
+    이정현 작성
+    선분들을 서로의 교차점(및 T자 접점)에서 분할한 선분 배열을 반환 (XY 평면 기준).
+    모든 쌍을 비교하지 않고, 격자 칸(cell_size)마다 같은 칸에 걸친 선분끼리만
+    벡터 연산으로 교차 검사하므로 선분 수에 거의 비례하는 시간에 끝난다.
+    cell_size : 격자 칸 크기 (기본값은 선분 바운딩 박스 크기의 중앙값)
+    tol : 선분 매개변수(0~1) 기준 허용오차
+    ※ 육교/지하차도처럼 실제로 만나지 않는 교차도 연결되므로 필요한 경우에만 사용한다.
+       평행하게 겹치는 선분은 분할하지 않는다.
+    """
+    starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+    m = len(starts)
+    if m < 2:
+        return starts, ends
+    lo = np.minimum(starts[:, :2], ends[:, :2])
+    hi = np.maximum(starts[:, :2], ends[:, :2])
+    if cell_size is None:
+        cell_size = float(np.median((hi - lo).max(axis=1)))
+    cell_size = max(cell_size, 1e-6)
+
+    # 1. 각 선분이 지나는 격자 칸 목록 (선분 번호, 칸 번호)
+    # 선분을 칸 크기 이하의 조각으로 나눠 조각의 바운딩 박스(최대 2 × 2칸)만 등록하므로
+    # 긴 대각선 선분도 길이에 비례하는 칸 수만 차지한다.
+    origin = lo.min(axis=0)
+    pieces = np.ceil((hi - lo).max(axis=1) / cell_size).astype(np.int64)
+    pieces = np.maximum(pieces, 1)
+    seg = np.repeat(np.arange(m), pieces)
+    k = np.arange(len(seg)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    d = ends[seg, :2] - starts[seg, :2]
+    a0 = starts[seg, :2] + (k / pieces[seg])[:, None] * d
+    a1 = starts[seg, :2] + ((k + 1) / pieces[seg])[:, None] * d
+    c0 = np.floor((np.minimum(a0, a1) - origin) / cell_size).astype(np.int64)
+    c1 = np.floor((np.maximum(a0, a1) - origin) / cell_size).astype(np.int64)
+    c0 = np.maximum(c0, 0)
+    nx = (c1 - c0 + 1)[:, 0]
+    ny = (c1 - c0 + 1)[:, 1]
+    counts = nx * ny
+    piece = np.repeat(np.arange(len(seg)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = c0[piece, 0] + local % nx[piece]
+    cy = c0[piece, 1] + local // nx[piece]
+    seg = seg[piece]
+    cell = cx * (int(cy.max()) + 1) + cy
+
+    # 2. 같은 칸에 들어 있는 선분 쌍 (중복 제거)
+    order = np.lexsort((seg, cell))
+    cell, seg = cell[order], seg[order]
+    distinct = np.ones(len(cell), dtype=bool)
+    distinct[1:] = (cell[1:] != cell[:-1]) | (seg[1:] != seg[:-1])
+    cell, seg = cell[distinct], seg[distinct]
+    group_end = np.searchsorted(cell, cell, side="right")
+    n_pairs = group_end - np.arange(len(cell)) - 1
+    first = np.repeat(np.arange(len(cell)), n_pairs)
+    second = (
+        first
+        + 1
+        + np.arange(n_pairs.sum())
+        - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+    )
+    a, b = seg[first], seg[second]
+    pairs = np.unique(np.minimum(a, b) * m + np.maximum(a, b))
+    a, b = pairs // m, pairs % m
+    overlap = np.all(lo[a] <= hi[b], axis=1) & np.all(lo[b] <= hi[a], axis=1)
+    a, b = a[overlap], b[overlap]
+
+    # 3. 선분 교차 매개변수 계산 (p + t r = q + u s)
+    p, r = starts[a, :2], ends[a, :2] - starts[a, :2]
+    q, s = starts[b, :2], ends[b, :2] - starts[b, :2]
+    denom = r[:, 0] * s[:, 1] - r[:, 1] * s[:, 0]
+    qp = q - p
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (qp[:, 0] * s[:, 1] - qp[:, 1] * s[:, 0]) / denom
+        u = (qp[:, 0] * r[:, 1] - qp[:, 1] * r[:, 0]) / denom
+    hit = (
+        (np.abs(denom) > 1e-12)
+        & (t >= -tol)
+        & (t <= 1 + tol)
+        & (u >= -tol)
+        & (u <= 1 + tol)
+    )
+    a, b, t, u = a[hit], b[hit], np.clip(t[hit], 0, 1), np.clip(u[hit], 0, 1)
+    # 두 선분 모두 같은 교차점 좌표를 쓰도록 a 선분 위의 점으로 통일
+    points = starts[a] + t[:, None] * (ends[a] - starts[a])
+
+    # 4. 선분 내부(양 끝 제외)에 있는 분할점만 모아 선분별로 정렬 후 잘라냄
+    split_seg = np.concatenate([a, b])
+    split_t = np.concatenate([t, u])
+    split_pt = np.vstack([points, points])
+    interior = (split_t > tol) & (split_t < 1 - tol)
+    split_seg = np.concatenate([split_seg[interior], np.arange(m), np.arange(m)])
+    split_t = np.concatenate([split_t[interior], np.zeros(m), np.ones(m)])
+    split_pt = np.vstack([split_pt[interior], starts, ends])
+    order = np.lexsort((split_t, split_seg))
+    split_seg, split_pt = split_seg[order], split_pt[order]
+    same = split_seg[:-1] == split_seg[1:]
+    return split_pt[:-1][same], split_pt[1:][same]
@@ -0,0 +1,174 @@
+import numpy as np
+
+from ewha_utils.spatial_index import SegmentTree, cKDTree
+
+
+def _as_points(points) -> np.ndarray:
+    return np.asarray(points, dtype=float).reshape(-1, 3)
+
+
+def polygons_to_segments(polygons):
+    """
+    서은미 작성
+    꼭짓점 배열 목록(폴리라인/폐곡선)을 선분 (시작점 [k, 3], 끝점 [k, 3]) 배열로 변환
+    """
+    starts, ends = [], []
+    for pts in polygons:
+        pts = _as_points(pts)
+        starts.append(pts[:-1])
+        ends.append(pts[1:])
+    if not starts:
+        return np.empty((0, 3)), np.empty((0, 3))
+    return np.vstack(starts), np.vstack(ends)
+
+
+def points_in_polygons(points, polygons, block_size: int = 4096) -> np.ndarray:
+    """
+    서은미 작성
+    xy 평면에서 점이 폐곡선 중 하나라도 안에 있는지 (짝수-홀수 규칙 반직선 교차)
+    polygons : 닫힌 꼭짓점 배열 목록
+    반환 : [k] bool
+    """
+    points = _as_points(points)
+    inside = np.zeros(len(points), dtype=bool)
+    for polygon in polygons:
+        polygon = _as_points(polygon)
+        a, b = polygons_to_segments([polygon])
+        if not len(a):
+            continue
+        lo, hi = polygon.min(axis=0)[:2], polygon.max(axis=0)[:2]
+        candidates = np.flatnonzero(
+            ~inside & np.all((points[:, :2] >= lo) & (points[:, :2] <= hi), axis=1)
+        )
+        for start in range(0, len(candidates), block_size):
+            idx = candidates[start : start + block_size]
+            x, y = points[idx, 0, None], points[idx, 1, None]
+            ay, by = a[None, :, 1], b[None, :, 1]
+            straddle = (ay > y) != (by > y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cross_x = a[None, :, 0] + (y - ay) * (b[None, :, 0] - a[None, :, 0]) / (
+                    by - ay
+                )
+            crossings = (straddle & (x < cross_x)).sum(axis=1)
+            inside[idx] |= crossings % 2 == 1
+    return inside
+
+
+def segments_blocked(starts, ends, wall_starts, wall_ends, index=None) -> np.ndarray:
+    """
+    서은미 작성
+    선분(시선) starts → ends가 장애물 선분 중 하나와 교차하는지 (xy 평면)
+    index : 장애물 선분의 SegmentTree (장면마다 한 번 만들어 두고 공유, 없으면 생성)
+    반환 : [k] bool
+    """
+    if index is None:
+        index = SegmentTree(wall_starts, wall_ends)
+    return index.blocked(starts, ends)
+
+
+def _pairs_within(points, targets, max_dist: float, max_block: int = 2**22):
+    """
+    max_dist 이내인 (점, 대상) 쌍과 거리 (scipy가 있으면 KD-tree 반경 질의)
+    반환 : (점 인덱스 [p], 대상 인덱스 [p], 거리 [p])
+    """
+    if cKDTree is not None:
+        neighbors = cKDTree(targets).query_ball_point(points, max_dist)
+        counts = np.array([len(n) for n in neighbors], dtype=np.int64)
+        rows = np.repeat(np.arange(len(points)), counts)
+        cols = np.fromiter(
+            (j for n in neighbors for j in n), dtype=np.int64, count=int(counts.sum())
+        )
+        return rows, cols, np.linalg.norm(points[rows] - targets[cols], axis=1)
+    rows, cols, dists = [], [], []
+    block_size = max(1, max_block // len(targets))
+    for lo in range(0, len(points), block_size):
+        block = points[lo : lo + block_size, None, :]
+        d = np.linalg.norm(block - targets[None, :, :], axis=2)
+        r, c = np.nonzero(d <= max_dist)
+        rows.append(r + lo)
+        cols.append(c)
+        dists.append(d[r, c])
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(dists)
+
+
+def distance_scores(points, targets, max_dist: float, max_score: float) -> np.ndarray:
+    """
+    서은미 작성
+    raw_utils.score_by_distance의 배열 버전: 대상마다 max_score × (1 - 거리 / max_dist) 합
+    """
+    points, targets = _as_points(points), _as_points(targets)
+    scores = np.zeros(len(points))
+    if len(points) and len(targets):
+        rows, _, dists = _pairs_within(points, targets, max_dist)
+        np.add.at(scores, rows, max_score * (1 - dists / max_dist))
+    return scores
+
+
+def visible_counts(
+    points, viewers, max_dist: float, wall_starts, wall_ends, index=None
+):
+    """
+    서은미 작성
+    각 점을 max_dist 이내에서 장애물에 가리지 않고 볼 수 있는 viewer(CCTV) 수
+    index : 장애물 선분의 SegmentTree (없으면 wall_starts, wall_ends로 생성)
+    """
+    points, viewers = _as_points(points), _as_points(viewers)
+    counts = np.zeros(len(points), dtype=np.int64)
+    if len(points) and len(viewers):
+        rows, cols, _ = _pairs_within(points, viewers, max_dist)
+        visible = ~segments_blocked(
+            points[rows], viewers[cols], wall_starts, wall_ends, index
+        )
+        np.add.at(counts, rows[visible], 1)
+    return counts
+
+
+def safety_scores(
+    points,
+    cctvs=(),
+    obstacles=(),
+    sidewalks=(),
+    cvs=(),
+    police=(),
+    cctv_range: float = 20,
+    cctv_score: float = 40,
+    sidewalk_score: float = 60,
+    cvs_range: float = 30,
+    cvs_score: float = 50,
+    police_range: float = 50,
+    police_score: float = 100,
+    obstacle_index=None,
+) -> np.ndarray:
+    """
+    서은미 작성
+    raw_utils.check_point_safety와 같은 기준의 안전 점수를 여러 점에 대해 한 번에 계산
+    cctvs / cvs(편의점) / police(지구대) : 좌표 배열
+    obstacles : 시야를 가리는 장애물 꼭짓점 배열 목록
+    sidewalks : 인도 폐곡선 꼭짓점 배열 목록
+    obstacle_index : 장애물 선분의 SegmentTree (주어지면 obstacles 대신 사용)
+    """
+    points = _as_points(points)
+    wall_starts, wall_ends = polygons_to_segments(obstacles)
+    if obstacle_index is None:
+        obstacle_index = SegmentTree(wall_starts, wall_ends)
+    scores = cctv_score * visible_counts(
+        points, cctvs, cctv_range, wall_starts, wall_ends, obstacle_index
+    ).astype(float)
+    scores += sidewalk_score * points_in_polygons(points, sidewalks)
+    scores += distance_scores(points, cvs, cvs_range, cvs_score)
+    scores += distance_scores(points, police, police_range, police_score)
+    return scores
+
+
+def edge_safety(graph, spacing: float = 10.0, **layers) -> np.ndarray:
+    """
+    서은미 작성
+    graph(RoadGraph) 엣지를 따라 spacing 간격 표본 점의 안전 점수를 길이 가중 평균한 엣지별 점수
+    layers : safety_scores()의 인자 (cctvs, obstacles, sidewalks, cvs, police, ...)
+    """
+    points, edge_index, weight = graph.sample_edges(spacing)
+    scores = safety_scores(points, **layers)
+    total = np.bincount(edge_index, weights=scores * weight, minlength=graph.edge_count)
+    length = np.bincount(edge_index, weights=weight, minlength=graph.edge_count)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(length > 0, total / length, 0.0)
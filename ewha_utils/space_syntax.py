@@ -0,0 +1,316 @@
+import numpy as np
+
+import ewha_utils.centrality as centrality
+import ewha_utils.road_graph as road_graph
+from ewha_utils.safety import polygons_to_segments
+
+try:
+    from scipy import sparse
+except ImportError:  # scipy가 없는 환경에서는 dense 인접 행렬로 BFS
+    sparse = None
+
+# 각도 비용 정수 단위 (90도 = ANGLE_UNITS), 단계마다 2^-12을 더해 비용 0인 직진 연결을 없앤다.
+# 정수 + 2^-12의 배수는 부동소수점으로 정확히 더해지므로 같은 비용 경로가 정확히 동률이 된다.
+ANGLE_UNITS = 1000
+STEP_COST = 2.0**-12
+
+
+def _cross(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _segment_contacts(starts, ends, tol: float, block_size: int = 256):
+    """
+    xy 평면에서 서로 닿는(교차하거나 tol 이내로 끝이 닿는) 선분 쌍
+    반환 : (쌍 [p, 2] (i < j), 접점의 선분 i 매개변수 t [p], 선분 j 매개변수 u [p])
+    """
+    p = starts[:, :2]
+    r = ends[:, :2] - p
+    length = np.linalg.norm(r, axis=1)
+    with np.errstate(divide="ignore"):
+        slack = np.where(length > 0, tol / length, np.inf)
+    pairs, ts, us = [], [], []
+    for lo in range(0, len(p), block_size):
+        i = np.arange(lo, min(lo + block_size, len(p)))
+        qp = p[None, :, :] - p[i, None, :]
+        rs = _cross(r[i, None, :], r[None, :, :])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = _cross(qp, r[None, :, :]) / rs
+            u = _cross(qp, r[i, None, :]) / rs
+        # 평행하지 않은 두 선분: 양쪽으로 tol만큼 늘여서 교차하면 연결
+        crossing = (
+            (np.abs(rs) > 1e-12)
+            & (t >= -slack[i, None])
+            & (t <= 1 + slack[i, None])
+            & (u >= -slack[None, :])
+            & (u <= 1 + slack[None, :])
+        )
+        # 끝에서 tol 이내의 접점은 끝점에서 만난 것으로 본다.
+        t = np.clip(np.nan_to_num(t), 0, 1)
+        u = np.clip(np.nan_to_num(u), 0, 1)
+        t = np.where(t <= slack[i, None], 0, np.where(t >= 1 - slack[i, None], 1, t))
+        u = np.where(u <= slack[None, :], 0, np.where(u >= 1 - slack[None, :], 1, u))
+        # 평행(같은 직선 위 포함)한 선분: 끝점끼리 tol 이내이면 연결
+        for a in (0, 1):
+            end_i = (starts, ends)[a][i, None, :2]
+            for b in (0, 1):
+                end_j = (starts, ends)[b][None, :, :2]
+                touch = ~crossing & (np.linalg.norm(end_i - end_j, axis=2) <= tol)
+                t = np.where(touch, a, t)
+                u = np.where(touch, b, u)
+                crossing |= touch
+        crossing &= i[:, None] < np.arange(len(p))[None, :]
+        rows, cols = np.nonzero(crossing)
+        pairs.append(np.column_stack([i[rows], cols]))
+        ts.append(t[rows, cols])
+        us.append(u[rows, cols])
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64), np.empty(0), np.empty(0)
+    return np.vstack(pairs).astype(np.int64), np.concatenate(ts), np.concatenate(us)
+
+
+def _merge_collinear(points, angle_tol: float) -> list:
+    """
+    폴리라인 꼭짓점 배열에서 방향이 angle_tol(도) 이하로 바뀌는 구간을 하나의 직선으로 합침
+    반환 : [(시작점, 끝점)]
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    keep = [0]
+    for k in range(1, len(points) - 1):
+        a = points[k] - points[keep[-1]]
+        b = points[k + 1] - points[k]
+        norm = np.linalg.norm(a[:2]) * np.linalg.norm(b[:2])
+        if norm == 0:
+            continue
+        cos = np.clip(np.dot(a[:2], b[:2]) / norm, -1, 1)
+        if np.degrees(np.arccos(cos)) > angle_tol:
+            keep.append(k)
+    keep.append(len(points) - 1)
+    return [(points[a], points[b]) for a, b in zip(keep, keep[1:])]
+
+
+def _ray_distance(origins, directions, seg_starts, seg_ends) -> np.ndarray:
+    """
+    xy 평면 반직선(원점, 단위 방향)이 처음 만나는 선분까지의 거리 (만나지 않으면 inf)
+    """
+    p = origins[:, None, :2]
+    r = directions[:, None, :2]
+    q = seg_starts[None, :, :2]
+    s = (seg_ends - seg_starts)[None, :, :2]
+    rs = _cross(r, s)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = _cross(q - p, s) / rs
+        u = _cross(q - p, r) / rs
+    hit = (np.abs(rs) > 1e-12) & (t > 1e-9) & (u >= 0) & (u <= 1)
+    return (
+        np.where(hit, t, np.inf).min(axis=1)
+        if seg_starts.size
+        else np.full(len(origins), np.inf)
+    )
+
+
+class SpatialMap:
+    """
+    권유진 작성
+    공간구문(space syntax) 분석용 선 지도 (axial map 또는 segment map).
+    선 하나가 그래프의 노드이고, 서로 닿는 선 쌍이 엣지이다.
+
+    starts, ends [k, 3] : 선의 양 끝점
+    pairs [p, 2] : 서로 연결된 선 쌍
+    angles [p] : 연결된 두 선 사이의 회전각 (도, 0 = 직진)
+    """
+
+    def __init__(self, starts, ends, tol: float = 1e-6):
+        self.starts = np.ascontiguousarray(starts, dtype=float).reshape(-1, 3)
+        self.ends = np.ascontiguousarray(ends, dtype=float).reshape(-1, 3)
+        self.tol = tol
+        self.pairs, t, u = _segment_contacts(self.starts, self.ends, tol)
+        self.angles = self._turn_angles(t, u)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.linalg.norm(self.ends - self.starts, axis=1)
+
+    @property
+    def connectivity(self) -> np.ndarray:
+        """
+        각 선에 직접 연결된 선의 수
+        """
+        return np.bincount(self.pairs.ravel(), minlength=len(self))
+
+    def _turn_angles(self, t, u) -> np.ndarray:
+        """
+        접점에서 한 선에서 다른 선으로 갈 때 꺾이는 각도
+        두 선이 모두 끝점에서 만나면 진행 방향을 고려하고 (0 ~ 180도),
+        선 중간에서 교차하면 어느 방향으로든 돌 수 있으므로 예각을 쓴다 (0 ~ 90도).
+        """
+        i, j = self.pairs[:, 0], self.pairs[:, 1]
+        d = (self.ends - self.starts)[:, :2]
+        d = d / np.maximum(np.linalg.norm(d, axis=1), 1e-12)[:, None]
+        cos = np.clip((d[i] * d[j]).sum(axis=1), -1, 1)
+        acute = np.degrees(np.arccos(np.abs(cos)))
+        at_end_i = (t == 0) | (t == 1)
+        at_end_j = (u == 0) | (u == 1)
+        # 접점에서 각 선의 반대쪽 끝을 향하는 방향 a, b 사이 각의 보각이 회전각
+        sign_i = np.where(t == 0, 1.0, -1.0)
+        sign_j = np.where(u == 0, 1.0, -1.0)
+        turn = 180.0 - np.degrees(np.arccos(np.clip(sign_i * sign_j * cos, -1, 1)))
+        return np.where(at_end_i & at_end_j, turn, acute)
+
+    @classmethod
+    def from_centerlines(
+        cls,
+        centerlines,
+        boundaries=None,
+        kind: str = "axial",
+        tol: float = 10.0,
+        angle_tol: float = 1.0,
+        min_length: float = 0.0,
+    ) -> "SpatialMap":
+        """
+        권유진 작성
+        복도 중심선(꼭짓점 배열 목록)으로 axial / segment 맵 생성
+        1) 중심선에서 거의 직선인 구간을 합쳐 하나의 직선으로 만들고
+        2) boundaries(경계 꼭짓점 배열 목록)가 있으면 양 끝을 경계에 닿을 때까지 늘여
+           가장 긴 시선(line of sight)으로 만든 것이 axial 맵,
+        3) axial 선을 서로 교차하는 점에서 나눈 것이 segment 맵이다.
+        tol : 선끼리 연결로 보는 끝점 간격
+        angle_tol : 같은 직선으로 합치는 꺾임 각도 (도)
+        min_length : segment 맵에서 이보다 짧은 자투리 선분 제거
+        """
+        if kind not in ("axial", "segment"):
+            raise ValueError(f"지원하지 않는 맵 종류입니다: {kind}")
+        lines = [
+            line for crv in centerlines for line in _merge_collinear(crv, angle_tol)
+        ]
+        starts = np.array([a for a, _ in lines]).reshape(-1, 3)
+        ends = np.array([b for _, b in lines]).reshape(-1, 3)
+        if boundaries is not None and len(starts):
+            wall_starts, wall_ends = polygons_to_segments(boundaries)
+            direction = ends - starts
+            direction[:, 2] = 0
+            direction /= np.maximum(np.linalg.norm(direction, axis=1), 1e-12)[:, None]
+            ahead = _ray_distance(ends, direction, wall_starts, wall_ends)
+            behind = _ray_distance(starts, -direction, wall_starts, wall_ends)
+            ends = ends + direction * np.where(np.isfinite(ahead), ahead, 0)[:, None]
+            starts = (
+                starts - direction * np.where(np.isfinite(behind), behind, 0)[:, None]
+            )
+        if kind == "axial":
+            return cls(starts, ends, tol)
+
+        # 교차점에서 axial 선을 나눔 (접점 매개변수를 선마다 모아서 정렬)
+        pairs, t, u = _segment_contacts(starts, ends, tol)
+        cuts = [[0.0, 1.0] for _ in range(len(starts))]
+        for (i, j), ti, uj in zip(pairs.tolist(), t.tolist(), u.tolist()):
+            cuts[i].append(ti)
+            cuts[j].append(uj)
+        seg_starts, seg_ends = [], []
+        for k, params in enumerate(cuts):
+            params = np.unique(params)
+            pts = starts[k] + params[:, None] * (ends[k] - starts[k])
+            seg_starts.append(pts[:-1])
+            seg_ends.append(pts[1:])
+        seg_starts, seg_ends = np.vstack(seg_starts), np.vstack(seg_ends)
+        length = np.linalg.norm(seg_ends - seg_starts, axis=1)
+        keep = length > max(min_length, 1e-9)
+        return cls(seg_starts[keep], seg_ends[keep], tol)
+
+    def adjacency(self):
+        """
+        권유진 작성
+        선 연결 인접 행렬 [k, k] (scipy가 있으면 sparse CSR, 없으면 dense)
+        """
+        k = len(self)
+        rows = np.concatenate([self.pairs[:, 0], self.pairs[:, 1]])
+        cols = np.concatenate([self.pairs[:, 1], self.pairs[:, 0]])
+        if sparse is not None:
+            return sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(k, k)
+            )
+        matrix = np.zeros((k, k), dtype=np.float32)
+        matrix[rows, cols] = 1
+        return matrix
+
+    def topological_depth(self, radius: int = None, block_size: int = 256):
+        """
+        권유진 작성
+        모든 선에서 시작하는 BFS를 인접 행렬 곱으로 한꺼번에 계산 (출발 선 block_size개씩)
+        radius : 이 단계 수까지만 탐색 (None이면 전체)
+        반환 : (도달한 선의 수 [k] (자기 자신 제외), 깊이 합 [k])
+        """
+        k = len(self)
+        adj = self.adjacency()
+        count = np.zeros(k)
+        total = np.zeros(k)
+        for lo in range(0, k, block_size):
+            rows = np.arange(lo, min(lo + block_size, k))
+            frontier = np.zeros((len(rows), k), dtype=np.float32)
+            frontier[np.arange(len(rows)), rows] = 1
+            visited = frontier > 0
+            depth = 0
+            while frontier.any() and (radius is None or depth < radius):
+                depth += 1
+                reached = (np.asarray(frontier @ adj) > 0) & ~visited
+                visited |= reached
+                hits = reached.sum(axis=1)
+                count[rows] += hits
+                total[rows] += depth * hits
+                frontier = reached.astype(np.float32)
+        return count, total
+
+    def dual_graph(self) -> "road_graph.RoadGraph":
+        """
+        권유진 작성
+        선 중점을 노드, 연결을 엣지로 하는 RoadGraph
+        엣지 비용 = 회전각 / 90도 × ANGLE_UNITS (정수로 반올림) + STEP_COST
+        각도 가중 최단 경로(angular analysis)에 graph_search / centrality를 그대로 쓰며,
+        회전각 합이 같은 경로 중에서는 선분 수가 적은 경로를 고른다.
+        """
+        mids = (self.starts + self.ends) / 2
+        lengths = np.linalg.norm(
+            mids[self.pairs[:, 0]] - mids[self.pairs[:, 1]], axis=1
+        )
+        graph = road_graph.RoadGraph(mids, self.pairs, lengths)
+        costs = np.round(self.angles / 90.0 * ANGLE_UNITS) + STEP_COST
+        graph.set_edge_costs(np.arange(graph.edge_count), costs)
+        return graph
+
+    def analyze(
+        self,
+        radius: int = None,
+        angular_radius: float = None,
+        angular: bool = True,
+        processes: int = None,
+    ) -> dict:
+        """
+        권유진 작성
+        공간구문 지표를 한 번에 계산
+        radius : 위상(topological) 분석 반경 (단계 수)
+        angular_radius : 각도 분석 반경 (회전각 / 90도의 합, 2이면 직각 두 번)
+        angular : False이면 각도 분석(Brandes 기반, 상대적으로 느림)을 생략
+        processes : 각도 분석을 나누어 계산할 프로세스 수
+        반환 : {"connectivity", "mean_depth", "integration",
+                ("angular_mean_depth", "angular_integration", "choice")} 각 [k] 배열
+        """
+        count, total = self.topological_depth(radius)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_depth = np.where(count > 0, total / count, np.nan)
+        result = {
+            "connectivity": self.connectivity,
+            "mean_depth": mean_depth,
+            "integration": centrality.integration_from_depth(mean_depth, count + 1),
+        }
+        if angular and len(self):
+            values = centrality.network_centrality(
+                self.dual_graph(),
+                radius=None if angular_radius is None else angular_radius * ANGLE_UNITS,
+                processes=processes,
+            )
+            result["angular_mean_depth"] = values["mean_depth"] / ANGLE_UNITS
+            result["angular_integration"] = values["closeness"] * ANGLE_UNITS
+            result["choice"] = values["betweenness"]
+        return result
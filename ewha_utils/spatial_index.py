@@ -0,0 +1,392 @@
+import heapq
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy가 없는 환경에서는 numpy 블록 연산으로 대체
+    cKDTree = None
+
+# scipy가 없을 때 PointIndex가 한 번에 만드는 거리 행렬의 원소 수 상한
+FALLBACK_BLOCK_ELEMENTS = 1 << 20
+
+
+class PointIndex:
+    """
+    이정현 작성
+    점 집합(예: 도로 노드)에 대한 최근접점 탐색 인덱스.
+    scipy가 설치되어 있으면 KD-tree를 사용하여 질의당 O(log n),
+    없으면 질의점을 블록 단위로 묶어 numpy 벡터 연산으로 계산한다.
+    (이 경우 질의 비용은 질의점 수 × 점 수에 비례하고, 메모리는 블록 크기로 제한된다.)
+    """
+
+    def __init__(self, coords, block_size: int = 256):
+        self.coords = np.ascontiguousarray(coords, dtype=float).reshape(-1, 3)
+        self.block_size = block_size
+        self.tree = cKDTree(self.coords) if cKDTree is not None else None
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def query(self, points):
+        """
+        이정현 작성
+        (k, 3) 질의점 배열에 대해 (거리 배열, 인덱스 배열)을 반환
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if len(self.coords) == 0:
+            raise ValueError("인덱스에 점이 없습니다.")
+        if self.tree is not None:
+            dists, indices = self.tree.query(points)
+            return dists, indices.astype(np.int64)
+        dists = np.empty(len(points))
+        indices = np.empty(len(points), dtype=np.int64)
+        # 블록의 거리 행렬(블록 × n)이 FALLBACK_BLOCK_ELEMENTS개를 넘지 않도록 블록을 줄임
+        rows = max(1, min(self.block_size, FALLBACK_BLOCK_ELEMENTS // len(self.coords)))
+        for i in range(0, len(points), rows):
+            block = points[i : i + rows]
+            sq = np.zeros((len(block), len(self.coords)))
+            for axis in range(3):  # 축별로 누적해서 (블록, n, 3) 배열을 만들지 않음
+                sq += np.subtract.outer(block[:, axis], self.coords[:, axis]) ** 2
+            idx = sq.argmin(axis=1)
+            indices[i : i + len(block)] = idx
+            dists[i : i + len(block)] = np.sqrt(sq[np.arange(len(block)), idx])
+        return dists, indices
+
+    def nearest(self, point) -> int:
+        """
+        이정현 작성
+        단일 점에 대해 가장 가까운 점의 인덱스 반환
+        """
+        return int(self.query([point])[1][0])
+
+
+def project_to_segments(point, starts, ends):
+    """
+    이정현 작성
+    한 점을 여러 선분 위에 투영
+    반환 : (선분 매개변수 t [k], 투영점 [k, 3], 거리 [k])
+    """
+    point = np.asarray(point, dtype=float).reshape(3)
+    d = ends - starts
+    length_sq = (d * d).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(length_sq > 0, ((point - starts) * d).sum(axis=1) / length_sq, 0)
+    t = np.clip(t, 0.0, 1.0)
+    projected = starts + t[:, None] * d
+    return t, projected, np.linalg.norm(projected - point, axis=1)
+
+
+def convex_hull(points) -> np.ndarray:
+    """
+    이정현 작성
+    점들의 xy 평면 볼록 껍질 (Andrew monotone chain)
+    반환 : 껍질 꼭짓점의 인덱스 배열 (반시계 방향)
+    """
+    xy = np.asarray(points, dtype=float).reshape(-1, 3)[:, :2]
+    order = np.lexsort((xy[:, 1], xy[:, 0])).tolist()
+    if len(order) < 3:
+        return np.array(order, dtype=np.int64)
+    pts = xy.tolist()
+
+    def half(indices):
+        chain = []
+        for i in indices:
+            while len(chain) >= 2:
+                (ax, ay), (bx, by) = pts[chain[-2]], pts[chain[-1]]
+                if (bx - ax) * (pts[i][1] - ay) - (by - ay) * (pts[i][0] - ax) > 0:
+                    break
+                chain.pop()
+            chain.append(i)
+        return chain[:-1]
+
+    return np.array(half(order) + half(order[::-1]), dtype=np.int64)
+
+
+def _segments_cross(p, r, q, s) -> np.ndarray:
+    """
+    선분 p + t r 과 q + u s (0 <= t, u <= 1)가 교차하는지 (xy)
+    평행한 쌍은 같은 직선 위에서 구간이 겹칠 때(벽을 따라가는 시선 등)만 교차로 본다.
+    """
+    rs = r[:, 0] * s[:, 1] - r[:, 1] * s[:, 0]
+    w = q - p
+    wr = w[:, 0] * r[:, 1] - w[:, 1] * r[:, 0]
+    rr = (r * r).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (w[:, 0] * s[:, 1] - w[:, 1] * s[:, 0]) / rs
+        u = wr / rs
+        # 같은 직선 위일 때 q 선분의 양 끝을 p 선분의 매개변수로 나타낸 값
+        t0 = (w * r).sum(axis=1) / rr
+        t1 = t0 + (s * r).sum(axis=1) / rr
+    parallel = np.abs(rs) <= 1e-12
+    crossing = ~parallel & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    overlapping = (
+        parallel
+        & (np.abs(wr) <= 1e-9 * rr)
+        & (np.minimum(t0, t1) <= 1)
+        & (np.maximum(t0, t1) >= 0)
+    )
+    return crossing | overlapping
+
+
+def _segment_hits_box(px, py, inv_x, inv_y, box) -> np.ndarray:
+    """
+    선분 p + t d (0 <= t <= 1)가 바운딩 박스를 지나는지 (xy slab 검사)
+    inv_x, inv_y : 1 / d (d가 0인 축은 아주 큰 값이라 그 축 범위 밖이면 자동으로 제외됨)
+    box : (lo_x, lo_y, hi_x, hi_y) 1차원 배열, 선분과 같은 길이
+    """
+    lo_x, lo_y, hi_x, hi_y = box
+    t1, t2 = (lo_x - px) * inv_x, (hi_x - px) * inv_x
+    t3, t4 = (lo_y - py) * inv_y, (hi_y - py) * inv_y
+    near = np.maximum(np.maximum(np.minimum(t1, t2), np.minimum(t3, t4)), 0.0)
+    far = np.minimum(np.minimum(np.maximum(t1, t2), np.maximum(t3, t4)), 1.0)
+    return near <= far
+
+
+class SegmentTree:
+    """
+    이정현 작성
+    선분 집합에 대한 R-tree (STR 방식으로 한 번에 채워 넣는 정적 트리).
+    각 노드의 바운딩 박스를 레벨별 배열로 저장하고,
+    최근접 선분은 바운딩 박스 거리 기준 best-first 탐색으로 찾는다.
+    """
+
+    def __init__(self, starts, ends, node_size: int = 16):
+        self.starts = np.ascontiguousarray(starts, dtype=float).reshape(-1, 3)
+        self.ends = np.ascontiguousarray(ends, dtype=float).reshape(-1, 3)
+        self.node_size = node_size
+        self._slabs = None
+        m = len(self.starts)
+        # STR 정렬: x 중심으로 세로 띠를 나눈 뒤 띠 안에서 y 중심으로 정렬
+        centers = (self.starts + self.ends) / 2
+        leaf_count = max(1, -(-m // node_size))
+        slice_count = max(1, int(np.ceil(np.sqrt(leaf_count))))
+        slice_size = slice_count * node_size
+        by_x = np.argsort(centers[:, 0], kind="stable")
+        slice_id = np.empty(m, dtype=np.int64)
+        slice_id[by_x] = np.arange(m) // slice_size
+        self.order = np.lexsort((centers[:, 1], slice_id))
+        lo = np.minimum(self.starts, self.ends)[self.order]
+        hi = np.maximum(self.starts, self.ends)[self.order]
+        # levels[0]은 선분 자체, levels[k]는 아래 레벨 node_size개씩 묶은 바운딩 박스
+        self.levels = [(lo, hi)]
+        while m and (len(self.levels) == 1 or len(self.levels[-1][0]) > 1):
+            lo, hi = self.levels[-1]
+            groups = np.arange(0, len(lo), node_size)
+            self.levels.append(
+                (np.minimum.reduceat(lo, groups), np.maximum.reduceat(hi, groups))
+            )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _children(self, level: int, index: int) -> range:
+        count = len(self.levels[level - 1][0])
+        return range(index * self.node_size, min((index + 1) * self.node_size, count))
+
+    def query_box(self, lo, hi) -> np.ndarray:
+        """
+        이정현 작성
+        바운딩 박스가 [lo, hi] 영역(xy)과 겹치는 선분의 인덱스 배열
+        레벨마다 겹치는 노드의 자식만 한꺼번에 골라 내려간다.
+        """
+        lo = np.asarray(lo, dtype=float).reshape(-1)[:2]
+        hi = np.asarray(hi, dtype=float).reshape(-1)[:2]
+
+        def overlaps(level, indices):
+            box_lo, box_hi = self.levels[level]
+            return indices[
+                np.all(
+                    (box_lo[indices, :2] <= hi) & (box_hi[indices, :2] >= lo), axis=1
+                )
+            ]
+
+        if len(self.starts) == 0:
+            return np.empty(0, dtype=np.int64)
+        top = len(self.levels) - 1
+        active = overlaps(top, np.arange(len(self.levels[top][0])))
+        for level in range(top, 0, -1):
+            count = len(self.levels[level - 1][0])
+            children = (
+                active[:, None] * self.node_size + np.arange(self.node_size)
+            ).reshape(-1)
+            active = overlaps(level - 1, children[children < count])
+        return self.order[active]
+
+    def _slab_boxes(self, pad: float = 1e-9) -> list:
+        """
+        레벨별 바운딩 박스를 (lo_x, lo_y, hi_x, hi_y) 연속 배열로 (blocked()용, 한 번만 생성)
+        """
+        if self._slabs is None:
+            self._slabs = [
+                tuple(
+                    np.ascontiguousarray(a)
+                    for a in (
+                        lo[:, 0] - pad,
+                        lo[:, 1] - pad,
+                        hi[:, 0] + pad,
+                        hi[:, 1] + pad,
+                    )
+                )
+                for lo, hi in self.levels
+            ]
+        return self._slabs
+
+    def blocked(self, starts, ends, block_size: int = 256) -> np.ndarray:
+        """
+        이정현 작성
+        여러 선분(시선) starts → ends가 트리의 선분 중 하나와 교차하는지 (xy 평면)
+        시선 묶음마다 (시선, 노드) 쌍을 레벨별로 내려가면서 시선이 바운딩 박스를
+        지나가는 노드의 자식만 남기고, 마지막에 남은 선분 쌍만 정확히 교차 검사한다.
+        반환 : [k] bool (닿기만 해도 가린 것으로 봄)
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        result = np.zeros(len(starts), dtype=bool)
+        if len(self.starts) == 0:
+            return result
+        slabs = self._slab_boxes()
+        top = len(self.levels) - 1
+        top_count = len(self.levels[top][0])
+        for lo in range(0, len(starts), block_size):
+            p = starts[lo : lo + block_size, :2]
+            d = ends[lo : lo + block_size, :2] - p
+            with np.errstate(divide="ignore"):
+                inv = 1.0 / np.where(d == 0, 1e-300, d)
+            px, py = p[:, 0].copy(), p[:, 1].copy()
+            inv_x, inv_y = inv[:, 0].copy(), inv[:, 1].copy()
+            rays = np.repeat(np.arange(len(p)), top_count)
+            nodes = np.tile(np.arange(top_count), len(p))
+            for level in range(top, -1, -1):
+                if level < top:
+                    # 통과한 노드의 자식으로 내려감
+                    count = len(self.levels[level][0])
+                    children = nodes[:, None] * self.node_size + np.arange(
+                        self.node_size
+                    )
+                    rays = np.repeat(rays, self.node_size)
+                    nodes = children.reshape(-1)
+                    valid = nodes < count
+                    rays, nodes = rays[valid], nodes[valid]
+                box = tuple(a[nodes] for a in slabs[level])
+                keep = _segment_hits_box(
+                    px[rays], py[rays], inv_x[rays], inv_y[rays], box
+                )
+                rays, nodes = rays[keep], nodes[keep]
+            segments = self.order[nodes]
+            q = self.starts[segments, :2]
+            s = self.ends[segments, :2] - q
+            hit = _segments_cross(p[rays], d[rays], q, s)
+            result[lo + np.unique(rays[hit])] = True
+        return result
+
+    def nearest(self, point):
+        """
+        이정현 작성
+        점에서 가장 가까운 선분
+        반환 : (선분 인덱스, 선분 매개변수 t, 투영점 [3], 거리)
+        """
+        point = np.asarray(point, dtype=float).reshape(3)
+        if len(self.starts) == 0:
+            raise ValueError("인덱스에 선분이 없습니다.")
+        top = len(self.levels) - 1
+        queue = [(0.0, top, 0)]
+        best = (np.inf, None)
+        while queue:
+            box_dist, level, index = heapq.heappop(queue)
+            if box_dist >= best[0]:
+                break
+            children = self._children(level, index) if level > 0 else None
+            if level == 1:
+                segments = self.order[children.start : children.stop]
+                t, projected, dists = project_to_segments(
+                    point, self.starts[segments], self.ends[segments]
+                )
+                k = int(dists.argmin())
+                if dists[k] < best[0]:
+                    best = (dists[k], (int(segments[k]), t[k], projected[k]))
+                continue
+            lo, hi = self.levels[level - 1]
+            lo, hi = (
+                lo[children.start : children.stop],
+                hi[children.start : children.stop],
+            )
+            gap = np.maximum(np.maximum(lo - point, point - hi), 0)
+            for child, d in zip(children, np.sqrt((gap * gap).sum(axis=1)).tolist()):
+                if d < best[0]:
+                    heapq.heappush(queue, (d, level - 1, child))
+        dist, (segment, t, projected) = best
+        return segment, float(t), projected, float(dist)
+
+    def nearest_many(self, points):
+        """
+        이정현 작성
+        여러 점에 대한 nearest() 결과 배열 (선분 인덱스, t, 투영점, 거리)
+        """
+        results = [self.nearest(pt) for pt in np.asarray(points, float).reshape(-1, 3)]
+        return (
+            np.array([r[0] for r in results], dtype=np.int64),
+            np.array([r[1] for r in results]),
+            np.array([r[2] for r in results]).reshape(-1, 3),
+            np.array([r[3] for r in results]),
+        )
+
+
+class SpatialHash:
+    """
+    맹진하 작성
+    점 집합에 대한 균일 격자(uniform grid) 해시.
+    점을 xy 격자 칸 번호로 정렬해 두고, 질의점 주변 칸의 점만 이진 탐색으로 꺼내므로
+    만들기 O(n log n), 반경 질의는 주변 점 수에 비례한다.
+    움직이는 에이전트처럼 매 스텝 좌표가 바뀌는 경우 스텝마다 한 번 새로 만들어 쓴다.
+    """
+
+    def __init__(self, coords, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("cell_size는 양수여야 합니다.")
+        self.coords = np.ascontiguousarray(coords, dtype=float).reshape(-1, 3)
+        self.cell_size = float(cell_size)
+        keys = self._keys(self._cells(self.coords))
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def _cells(self, coords) -> np.ndarray:
+        return np.floor(coords[:, :2] / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _keys(cells) -> np.ndarray:
+        return (cells[:, 0] << 32) + (cells[:, 1] + 2**31)
+
+    def query_pairs(self, points, radius: float):
+        """
+        맹진하 작성
+        각 질의점에서 radius 이내(3차원 거리)인 점의 쌍
+        반환 : (질의점 인덱스 [p], 점 인덱스 [p], 거리 [p])
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        rows, cols = [], []
+        if len(points) and len(self.coords):
+            cells = self._cells(points)
+            reach = int(np.ceil(radius / self.cell_size))
+            for dx in range(-reach, reach + 1):
+                for dy in range(-reach, reach + 1):
+                    keys = self._keys(cells + (dx, dy))
+                    lo = np.searchsorted(self.sorted_keys, keys, side="left")
+                    hi = np.searchsorted(self.sorted_keys, keys, side="right")
+                    counts = hi - lo
+                    total = int(counts.sum())
+                    if not total:
+                        continue
+                    # 질의점마다 [lo, hi) 구간을 한 배열로 펼침
+                    starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+                    rows.append(np.repeat(np.arange(len(points)), counts))
+                    cols.append(self.order[starts + np.arange(total)])
+        if not rows:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        dists = np.linalg.norm(points[rows] - self.coords[cols], axis=1)
+        keep = dists <= radius
+        return rows[keep], cols[keep], dists[keep]
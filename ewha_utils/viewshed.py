@@ -0,0 +1,111 @@
+import numpy as np
+
+from ewha_utils.safety import polygons_to_segments
+from ewha_utils.spatial_index import SegmentTree
+
+
+def resample_polyline(points, spacing: float):
+    """
+    이정현 작성
+    폴리라인 꼭짓점 배열을 길이 spacing 간격으로 다시 표본 추출 (양 끝점 포함)
+    누적 길이 표에서 searchsorted로 표본이 속한 선분을 찾아 선형 보간한다.
+    반환 : (표본 좌표 [k, 3], 시작점으로부터의 거리 [k], 진행 방향 단위 벡터 [k, 3])
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    seg = np.diff(points, axis=0)
+    seg_length = np.linalg.norm(seg, axis=1)
+    keep = seg_length > 1e-12
+    points = np.vstack([points[:1], points[1:][keep]])
+    seg, seg_length = seg[keep], seg_length[keep]
+    along = np.concatenate([[0.0], np.cumsum(seg_length)])
+    total = along[-1]
+    if total == 0:
+        return points[:1].copy(), np.zeros(1), np.zeros((1, 3))
+    count = max(1, int(np.ceil(total / spacing)))
+    samples = np.linspace(0.0, total, count + 1)
+    k = np.clip(np.searchsorted(along, samples, side="right") - 1, 0, len(seg) - 1)
+    t = (samples - along[k]) / seg_length[k]
+    tangents = seg[k] / seg_length[k, None]
+    return points[k] + t[:, None] * seg[k], samples, tangents
+
+
+def _cross(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def isovist_distances(
+    origins, seg_starts, seg_ends, max_dist: float, ray_count: int = 360, index=None
+) -> np.ndarray:
+    """
+    이정현 작성
+    각 원점에서 ray_count개 방향(0°부터 등간격)으로 쏜 시선이 처음 가려지는 거리 (xy 평면)
+    index : seg_starts/seg_ends의 SegmentTree (없으면 생성)
+            원점마다 max_dist 범위와 겹치는 선분만 골라 모든 시선과 한꺼번에 교차 계산한다.
+    반환 : [k, ray_count] 거리 배열 (가려지지 않으면 max_dist)
+    """
+    origins = np.asarray(origins, dtype=float).reshape(-1, 3)
+    seg_starts = np.asarray(seg_starts, dtype=float).reshape(-1, 3)
+    seg_ends = np.asarray(seg_ends, dtype=float).reshape(-1, 3)
+    if index is None:
+        index = SegmentTree(seg_starts, seg_ends)
+    theta = np.arange(ray_count) * (2 * np.pi / ray_count)
+    r = np.column_stack([np.cos(theta), np.sin(theta)])[:, None, :]
+    result = np.full((len(origins), ray_count), float(max_dist))
+    for i, origin in enumerate(origins):
+        near = index.query_box(origin[:2] - max_dist, origin[:2] + max_dist)
+        if not len(near):
+            continue
+        q = seg_starts[None, near, :2] - origin[:2]
+        s = (seg_ends - seg_starts)[None, near, :2]
+        rs = _cross(r, s)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = _cross(q, s) / rs
+            u = _cross(q, r) / rs
+        hit = (np.abs(rs) > 1e-12) & (t >= 0) & (u >= 0) & (u <= 1)
+        first = np.where(hit, t, np.inf).min(axis=1)
+        result[i] = np.minimum(first, max_dist)
+    return result
+
+
+def isovist_metrics(distances, max_dist: float) -> dict:
+    """
+    이정현 작성
+    isovist_distances() 결과로 계산한 지표
+    area : 시선 끝점을 이은 다각형 면적 (가시 영역 넓이)
+    openness : 가려지지 않고 max_dist까지 열린 시선의 비율 (0 ~ 1)
+    mean_distance : 평균 가시 거리
+    """
+    distances = np.asarray(distances, dtype=float)
+    ray_count = distances.shape[1]
+    wedge = 0.5 * np.sin(2 * np.pi / ray_count)
+    area = wedge * (distances * np.roll(distances, -1, axis=1)).sum(axis=1)
+    return {
+        "area": area,
+        "openness": (distances >= max_dist).mean(axis=1),
+        "mean_distance": distances.mean(axis=1),
+    }
+
+
+def route_viewshed(
+    route,
+    footprints,
+    spacing: float = 10.0,
+    max_dist: float = 100.0,
+    ray_count: int = 360,
+) -> dict:
+    """
+    이정현 작성
+    경로를 spacing 간격으로 걸으면서 건물 외곽선에 가려지지 않는 가시 영역을 평가
+    route : 경로 꼭짓점 배열 [k, 3]
+    footprints : 건물 외곽선 꼭짓점 배열 목록 (닫힌 폴리라인)
+    반환 : {"points" [s, 3], "along" [s], "distances" [s, ray_count],
+            "area" [s], "openness" [s], "mean_distance" [s]}
+    """
+    starts, ends = polygons_to_segments(footprints)
+    points, along, _ = resample_polyline(route, spacing)
+    distances = isovist_distances(
+        points, starts, ends, max_dist, ray_count, SegmentTree(starts, ends)
+    )
+    result = {"points": points, "along": along, "distances": distances}
+    result.update(isovist_metrics(distances, max_dist))
+    return result
@@ -0,0 +1,234 @@
+import heapq
+import math
+import numpy as np
+
+from ewha_utils.safety import polygons_to_segments
+from ewha_utils.spatial_index import SegmentTree
+
+# 꼭짓점 쌍 시선 검사를 한 번에 만드는 후보 쌍 수 (메모리 상한)
+PAIR_BLOCK_SIZE = 1 << 18
+
+
+def _simplify_polyline(pts, tol: float) -> np.ndarray:
+    """
+    Douglas-Peucker로 폴리라인 꼭짓점을 tol(xy 거리) 이내에서 줄임 (양 끝점은 유지)
+    곡선 벽을 촘촘하게 나눈 꼭짓점이 모두 경로 노드가 되지 않도록 계획용 해상도로 맞춘다.
+    """
+    pts = np.asarray(pts, dtype=float).reshape(-1, 3)
+    if len(pts) < 3:
+        return pts
+    keep = np.zeros(len(pts), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(pts) - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b <= a + 1:
+            continue
+        chord = pts[b, :2] - pts[a, :2]
+        rel = pts[a + 1 : b, :2] - pts[a, :2]
+        length = np.hypot(*chord)
+        if length > 0:
+            dist = np.abs(chord[0] * rel[:, 1] - chord[1] * rel[:, 0]) / length
+        else:  # 닫힌 폴리라인의 시작 = 끝
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        k = int(dist.argmax())
+        if dist[k] > tol:
+            keep[a + 1 + k] = True
+            stack += [(a, a + 1 + k), (a + 1 + k, b)]
+    return pts[keep]
+
+
+def _corner_nodes(polyline, clearance: float):
+    """
+    장애물 폴리라인 하나를 돌아가는 경로가 지날 수 있는 점들
+    열린 폴리라인의 양 끝은 선 방향으로 clearance만큼 연장한 점,
+    꺾이는 꼭짓점은 바깥쪽(둔각 쪽) 이등분선 방향으로 clearance만큼 띄운 점.
+    닫힌 다각형은 볼록한 꼭짓점만 쓴다 (오목한 꼭짓점의 바깥쪽은 다각형 안).
+    반환 : (노드 [k, 3], 노드를 띄운 원래 꼭짓점 [k, 3],
+            꼭짓점에서 이전/다음 꼭짓점으로 향하는 단위 벡터 [k, 2] 2개)
+           양 끝 연장점은 방향 벡터를 0으로 둔다 (접선 검사에서 항상 통과).
+    """
+    pts = np.asarray(polyline, dtype=float).reshape(-1, 3)
+    step = np.linalg.norm(np.diff(pts, axis=0), axis=1)
+    pts = pts[np.concatenate([[True], step > 1e-9])[: len(pts)]]
+    if len(pts) < 2:
+        flat = np.zeros((len(pts), 2))
+        return pts.copy(), pts.copy(), flat, flat
+    closed = len(pts) > 3 and np.linalg.norm(pts[0] - pts[-1]) <= 1e-9
+    if closed:
+        ring = pts[:-1]
+        prev_pts, next_pts, corners = (
+            np.roll(ring, 1, axis=0),
+            np.roll(ring, -1, axis=0),
+            ring,
+        )
+    else:
+        prev_pts, next_pts, corners = pts[:-2], pts[2:], pts[1:-1]
+    to_prev = prev_pts - corners
+    to_next = next_pts - corners
+    to_prev /= np.linalg.norm(to_prev, axis=1)[:, None]
+    to_next /= np.linalg.norm(to_next, axis=1)[:, None]
+    outward = -(to_prev + to_next)
+    length = np.linalg.norm(outward, axis=1)
+    bent = length > 1e-6  # 일직선인 꼭짓점은 돌아갈 필요가 없음
+    if closed:
+        x, y = ring[:, 0], ring[:, 1]
+        area = np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+        turn = -to_prev[:, 0] * to_next[:, 1] + to_prev[:, 1] * to_next[:, 0]
+        bent &= turn * area > 0  # 다각형 방향과 같은 쪽으로 꺾이는(볼록한) 꼭짓점
+    nodes = [corners[bent] + outward[bent] / length[bent, None] * clearance]
+    bases = [corners[bent]]
+    prevs, nexts = [to_prev[bent, :2]], [to_next[bent, :2]]
+    if not closed:
+        for end, inner in ((pts[0], pts[1]), (pts[-1], pts[-2])):
+            direction = (end - inner) / np.linalg.norm(end - inner)
+            nodes.append((end + direction * clearance)[None])
+            bases.append(end[None])
+            prevs.append(np.zeros((1, 2)))
+            nexts.append(np.zeros((1, 2)))
+    return np.vstack(nodes), np.vstack(bases), np.vstack(prevs), np.vstack(nexts)
+
+
+class VisibilityGraph:
+    """
+    맹진하 작성
+    장애물(벽, 제관 경로 등) 폴리라인 주변 꼭짓점 사이의 가시 그래프 (xy 평면).
+    꼭짓점 쌍의 시선 검사를 만들 때 한 번에 모두 끝내 두고,
+    질의 때는 출발/도착점에서 보이는 꼭짓점만 추가로 검사한 뒤 A*로 최단 경로를 찾는다.
+    최단 경로는 꼭짓점에서 장애물에 접하는 방향으로만 꺾이므로, 양 끝 꼭짓점에서
+    접선이 아닌 쌍은 시선 검사 없이 버리고, 후보 쌍은 PAIR_BLOCK_SIZE개씩 나눠 검사한다.
+
+    nodes [n, 3] : 장애물에서 clearance만큼 띄운 꼭짓점
+    neighbors : 노드별 [(보이는 노드, 거리)]
+    """
+
+    def __init__(
+        self, obstacles, clearance: float = 100.0, index=None, tolerance: float = None
+    ):
+        """
+        obstacles : 장애물 꼭짓점 배열 목록 (열린 폴리라인 또는 닫힌 다각형)
+        clearance : 경로가 장애물 꼭짓점에서 떨어지는 거리
+        index : 같은 장애물 선분으로 이미 만든 SegmentTree (CCTV 가시성 등과 공유, 없으면 생성)
+        tolerance : 노드를 만들 때 장애물 폴리라인을 줄이는 허용오차 (기본값 clearance / 4)
+                    시선 검사는 줄이기 전 선분(index)으로 한다.
+        """
+        self.clearance = clearance
+        if tolerance is None:
+            tolerance = clearance / 4
+        if index is None:
+            index = SegmentTree(*polygons_to_segments(obstacles))
+        self.index = index
+        parts = [
+            _corner_nodes(_simplify_polyline(pts, tolerance), clearance)
+            for pts in obstacles
+        ]
+        if parts:
+            self.nodes, self._corners, self._to_prev, self._to_next = (
+                np.vstack(a) for a in zip(*parts)
+            )
+        else:
+            self.nodes = self._corners = np.empty((0, 3))
+            self._to_prev = self._to_next = np.empty((0, 2))
+        n = len(self.nodes)
+        self.neighbors = [[] for _ in range(n)]
+        rows = max(1, PAIR_BLOCK_SIZE // max(n, 1))
+        for lo in range(0, n, rows):
+            first = np.arange(lo, min(lo + rows, n))
+            counts = n - 1 - first
+            i = np.repeat(first, counts)
+            j = (
+                np.arange(len(i))
+                - np.repeat(np.cumsum(counts) - counts, counts)
+                + np.repeat(first + 1, counts)
+            )
+            d = self._corners[j, :2] - self._corners[i, :2]
+            tangent = self._tangent(i, d) & self._tangent(j, d)
+            i, j = i[tangent], j[tangent]
+            visible = ~self.blocked(self.nodes[i], self.nodes[j])
+            i, j = i[visible], j[visible]
+            dist = np.linalg.norm(self.nodes[i, :2] - self.nodes[j, :2], axis=1)
+            for a, b, d in zip(i.tolist(), j.tolist(), dist.tolist()):
+                self.neighbors[a].append((b, d))
+                self.neighbors[b].append((a, d))
+
+    def _tangent(self, k, d) -> np.ndarray:
+        """
+        노드 k의 원래 꼭짓점을 d 방향으로 지나는 선이 장애물에 접하는지
+        (꼭짓점의 이전/다음 꼭짓점이 모두 선의 같은 쪽에 있으면 접선)
+        """
+        tol = -1e-9 * (d * d).sum(axis=1)
+        a = d[:, 0] * self._to_prev[k, 1] - d[:, 1] * self._to_prev[k, 0]
+        b = d[:, 0] * self._to_next[k, 1] - d[:, 1] * self._to_next[k, 0]
+        return a * b >= tol
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def blocked(self, starts, ends) -> np.ndarray:
+        """
+        맹진하 작성
+        시선 starts → ends가 장애물에 가리는지 [k] bool
+        """
+        return self.index.blocked(starts, ends)
+
+    def _visible_nodes(self, point) -> list:
+        point = np.asarray(point, dtype=float).reshape(3)
+        if not len(self.nodes):
+            return []
+        # 출발/도착점에서 이어지는 선도 꼭짓점에서 접하는 노드만 검사
+        candidates = np.flatnonzero(
+            self._tangent(slice(None), self._corners[:, :2] - point[:2])
+        )
+        origins = np.broadcast_to(point, (len(candidates), 3))
+        visible = candidates[~self.blocked(origins, self.nodes[candidates])]
+        dist = np.linalg.norm(self.nodes[visible, :2] - point[:2], axis=1)
+        return list(zip(visible.tolist(), dist.tolist()))
+
+    def shortest_path(self, start, goal):
+        """
+        맹진하 작성
+        start → goal 장애물을 피하는 최단 경로 (A*, 직선거리 휴리스틱)
+        반환 : 경로 꼭짓점 배열 [k, 3] (start, goal 포함), 갈 수 없으면 None
+        """
+        start = np.asarray(start, dtype=float).reshape(3)
+        goal = np.asarray(goal, dtype=float).reshape(3)
+        if not self.blocked(start[None], goal[None])[0]:
+            return np.vstack([start, goal])
+        goal_links = dict(self._visible_nodes(goal))
+        if not goal_links:
+            return None
+        coords = self.nodes[:, :2].tolist()
+        gx, gy = goal[:2].tolist()
+
+        def heuristic(u: int) -> float:
+            return math.hypot(coords[u][0] - gx, coords[u][1] - gy)
+
+        dist, prev, settled = {}, {}, set()
+        queue = []
+        for v, d in self._visible_nodes(start):
+            dist[v] = d
+            prev[v] = -1
+            heapq.heappush(queue, (d + heuristic(v), d, v))
+        best, best_node = math.inf, None
+        while queue:
+            key, d, u = heapq.heappop(queue)
+            if key >= best:
+                break
+            if u in settled or d > dist[u]:
+                continue
+            settled.add(u)
+            if u in goal_links and d + goal_links[u] < best:
+                best, best_node = d + goal_links[u], u
+            for v, w in self.neighbors[u]:
+                alt = d + w
+                if alt < dist.get(v, math.inf):
+                    dist[v] = alt
+                    prev[v] = u
+                    heapq.heappush(queue, (alt + heuristic(v), alt, v))
+        if best_node is None:
+            return None
+        path = [best_node]
+        while prev[path[-1]] >= 0:
+            path.append(prev[path[-1]])
+        path.reverse()
+        return np.vstack([start, self.nodes[path], goal])